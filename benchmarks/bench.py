@@ -0,0 +1,267 @@
+"""
+Benchmarks for ttrpg-dice.
+
+Run with `just bench`, or directly:
+```
+python benchmarks/bench.py [--quick] [--filter NAME] [--output results.json] [--compare baseline.json]
+```
+
+Each benchmark builds fresh objects on every call, so that results measure the calculations and not the lazy
+caches on an already-calculated `Dice`. Results are written as JSON, including the git commit and python version,
+so that runs from different commits can be compared with `--compare`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+from typing import TYPE_CHECKING
+
+from ttrpg_dice import LazyRollTable, PoolComparison, d, lazyroll, precomputed, statblock
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+BENCHMARKS: dict[str, Callable[[bool], Iterator[tuple[dict, Callable[[], object]]]]] = {}
+"""Benchmark name: function yielding `(params, callable to time)` given `quick`"""
+
+
+def benchmark(func: Callable[[bool], Iterator[tuple[dict, Callable[[], object]]]]) -> Callable:
+    """Register a benchmark."""
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def _calculated(func: Callable[[], object]) -> Callable[[], object]:
+    """`func`, with `ttrpg_dice.precomputed` disabled so that common dice are calculated rather than loaded."""
+
+    def _without_precomputed() -> object:
+        precomputed.disable()
+        try:
+            return func()
+        finally:
+            precomputed.enable()
+
+    return _without_precomputed
+
+
+@benchmark
+def dice_ndx(quick: bool) -> Iterator[tuple[dict, Callable[[], object]]]:  # noqa: FBT001
+    """Calculate the probabilities of `n*d(x)`, without using the precomputed distributions."""
+    numdice = [1, 2, 5] if quick else [1, 2, 5, 10, 20]
+    faces = [6, 20] if quick else [4, 6, 10, 20, 100]
+    for n in numdice:
+        for x in faces:
+            yield {"n": n, "x": x}, _calculated(lambda n=n, x=x: (n * d(x))._core)  # noqa: SLF001
+
+
+@benchmark
+def dice_precomputed(quick: bool) -> Iterator[tuple[dict, Callable[[], object]]]:  # noqa: FBT001
+    """Load the probabilities of `n*d(x)` from the precomputed distributions."""
+    for n, x in [(2, 6), (10, 20)] if quick else [(2, 6), (10, 20), (5, 100)]:
+        yield {"n": n, "x": x}, lambda n=n, x=x: (n * d(x))._core  # noqa: SLF001
+
+
+@benchmark
+def dice_large_pool(quick: bool) -> Iterator[tuple[dict, Callable[[], object]]]:  # noqa: FBT001
+    """Calculate the probabilities of large pools of mixed dice."""
+    numdice = [10, 50] if quick else [10, 50, 200]
+    for n in numdice:
+        yield {"n": n}, lambda n=n: (d(100) + d(1000) + n * d(20))._core  # noqa: SLF001
+
+
+@benchmark
+def dice_opposed(quick: bool) -> Iterator[tuple[dict, Callable[[], object]]]:  # noqa: FBT001
+    """P(one pool beats another) for increasing pool sizes, including calculating both distributions."""
+    for n in [1, 10] if quick else [1, 10, 100]:
+
+        def _opposed(n: int = n) -> float:
+            d._opposedcache.clear()  # noqa: SLF001 # Otherwise only the first call compares anything
+            return (n * d(20) + 1).prob_gt(n * d(20))
+
+        yield {"n": n}, _calculated(_opposed)
+
+
+@benchmark
+def dice_from_str(quick: bool) -> Iterator[tuple[dict, Callable[[], object]]]:  # noqa: FBT001
+    """Parse ndX notation (without calculating probabilities)."""
+    descriptions = ["d6", "2d4 + 3"] if quick else ["d6", "2d4 + 3", "3d6! + d20r1 + 2", "d4 + d6 + d8 + d10 + d12"]
+    for description in descriptions:
+        yield {"description": description}, lambda description=description: d.from_str(description)
+
+
+@benchmark
+def compute_many(quick: bool) -> Iterator[tuple[dict, Callable[[], object]]]:  # noqa: FBT001
+    """
+    Calculate many independent distributions with `d.compute_many()`, serially and with threads.
+
+    Only free-threaded Python builds (e.g. `python3.13t`) are expected to run faster with more threads.
+    """
+    numpools = 8 if quick else 32
+    for threads in [1, 2, 4] if quick else [1, 2, 4, 8]:
+
+        def _compute(threads: int = threads) -> object:
+            return d.compute_many([(20 + i) * d(20) for i in range(numpools)], threads=threads)
+
+        yield {"pools": numpools, "threads": threads, "gil": _gil_enabled()}, _compute
+
+
+def _gil_enabled() -> bool:
+    try:
+        return sys._is_gil_enabled()  # noqa: SLF001
+    except AttributeError:  # Python 3.12 and below
+        return True
+
+
+@benchmark
+def lazyroll_scaling(quick: bool) -> Iterator[tuple[dict, Callable[[], object]]]:  # noqa: FBT001
+    """Single `lazyroll` for increasing numbers of dice."""
+    for numdice in [1, 10, 100] if quick else [1, 10, 100, 1000]:
+        yield {"numdice": numdice}, lambda numdice=numdice: lazyroll(numdice, 100, 33)
+
+
+@benchmark
+def lazyrolltable_scaling(quick: bool) -> Iterator[tuple[dict, Callable[[], object]]]:  # noqa: FBT001
+    """Build (and format) a `LazyRollTable` for increasing numbers of dice."""
+    for maxdice in [5, 20] if quick else [5, 20, 50, 100]:
+        yield {"maxdice": maxdice}, lambda maxdice=maxdice: str(LazyRollTable(maxdice, 100, 33))
+
+
+@benchmark
+def poolcomparison(quick: bool) -> Iterator[tuple[dict, Callable[[], object]]]:  # noqa: FBT001
+    """Compare many pools across many outcomes."""
+    sizes = [(4, 3), (10, 10)] if quick else [(4, 3), (10, 10), (20, 20)]
+    for numpools, numoutcomes in sizes:
+        outcomes = {f"{i}+": slice(i, None) for i in range(1, numoutcomes + 1)}
+
+        def _compare(numpools: int = numpools, outcomes: dict = outcomes) -> str:
+            pools = [n * d(6) for n in range(1, numpools + 1)]
+            return str(PoolComparison(pools, outcomes))
+
+        yield {"pools": numpools, "outcomes": numoutcomes}, _compare
+
+
+@benchmark
+def statblock_arithmetic(quick: bool) -> Iterator[tuple[dict, Callable[[], object]]]:  # noqa: FBT001
+    """Add, subtract and merge many `StatBlock`s."""
+
+    @statblock
+    class Character:
+        WS = d(100)
+        BS = d(100)
+        S = d(100)
+        T = d(100)
+        I = d(100)  # noqa: E741
+        Ag = d(100)
+        Dex = d(100)
+        Int = d(100)
+        WP = d(100)
+        Fel = d(100)
+
+    for numblocks in [100] if quick else [100, 1000]:
+        blocks = [Character(**dict.fromkeys(Character._STATS, i % 40)) for i in range(numblocks)]  # noqa: SLF001
+
+        def _arithmetic(blocks: list = blocks) -> object:
+            total = blocks[0]
+            for block in blocks[1:]:
+                total = ((total + block) - block) | block
+            return total
+
+        yield {"blocks": numblocks}, _arithmetic
+
+
+def run(name: str, params: dict, func: Callable[[], object], repeat: int) -> dict:
+    """Time `func`, returning seconds per call for each of `repeat` runs."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "name": name,
+        "params": params,
+        "number": number,
+        "repeat": repeat,
+        "min": min(times),
+        "median": median(times),
+    }
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _key(result: dict) -> tuple[str, str]:
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(baseline: dict, current: dict) -> str:
+    """Table of median times in `current` relative to `baseline`."""
+    old = {_key(result): result for result in baseline["results"]}
+    lines = [f"{'benchmark':<60} {'baseline':>12} {'current':>12} {'ratio':>8}"]
+    for result in current["results"]:
+        name = f"{result['name']} {json.dumps(result['params'])}"
+        before = old.get(_key(result))
+        if before is None:
+            lines.append(f"{name:<60} {'-':>12} {result['median']:>12.3e} {'new':>8}")
+        else:
+            ratio = result["median"] / before["median"]
+            lines.append(f"{name:<60} {before['median']:>12.3e} {result['median']:>12.3e} {ratio:>8.2f}")
+    return "\n".join(lines)
+
+
+def main() -> None:  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="smaller grid of sizes, for a fast sanity check")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains FILTER")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timing runs per benchmark")
+    parser.add_argument("--output", type=Path, help="write JSON results to OUTPUT (default: stdout)")
+    parser.add_argument("--compare", type=Path, help="print a comparison against an earlier JSON results file")
+    args = parser.parse_args()
+
+    results = []
+    for name, benchmarks in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        for params, func in benchmarks(args.quick):
+            result = run(name, params, func, args.repeat)
+            print(f"{name} {params}: {result['median']:.3e}s", file=sys.stderr)  # noqa: T201
+            results.append(result)
+
+    report = {
+        "meta": {
+            "commit": _commit(),
+            "python": sys.version,
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))  # noqa: T201
+
+    if args.compare:
+        print(compare(json.loads(args.compare.read_text()), report), file=sys.stderr)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
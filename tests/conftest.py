@@ -0,0 +1,15 @@
+from collections.abc import Iterator
+
+import pytest
+
+from ttrpg_dice import instrumentation
+
+
+@pytest.fixture
+def instrumented() -> Iterator[None]:
+    """Record instrumentation for the duration of the test, starting from nothing."""
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
@@ -0,0 +1,63 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ttrpg_dice import PoolComparison, SuccessPool, d, stats
+
+
+def test_aprobabilities():
+    dice = 3 * d(6)
+    assert asyncio.run(dice.aprobabilities()) == list(3 * d(6))
+    assert dice[10] == pytest.approx(1 / 8)
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_coalesced():
+    async def _many() -> list[list[float]]:
+        return await asyncio.gather(*((10 * d(11)).aprobabilities() for _ in range(5)))
+
+    results = asyncio.run(_many())
+    assert all(result == results[0] for result in results)
+    assert stats()["dice.build"] == 1
+    assert stats()["dice.coalesced"] == 4
+    assert d._inflight == {}  # noqa: SLF001
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_already_calculated():
+    dice = 2 * d(7)
+    _ = list(dice)
+    asyncio.run(dice.aprobabilities())
+    assert stats()["dice.build"] == 1
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def test_configurable_executor(monkeypatch):
+    with CountingExecutor(1) as executor:
+        monkeypatch.setattr(d, "executor", executor)
+        asyncio.run((2 * d(4)).aprobabilities())
+    assert executor.submitted == 1
+
+
+def test_error_propagates():
+    dice = d.from_contents({6: 1})
+    dice.contents = {"six": 1}  # Bypass validation
+    with pytest.raises(TypeError):
+        asyncio.run(dice.aprobabilities())
+    assert d._inflight == {}  # noqa: SLF001
+
+
+def test_poolcomparison_acreate():
+    pools = {"3d6": 3 * d(6), "hits": SuccessPool(4 * d(10), 7)}
+    outcomes = {"1+": slice(1, None), "3+": slice(3, None)}
+    comparison = asyncio.run(PoolComparison.acreate(pools, outcomes))
+    assert comparison.chances == PoolComparison(pools, outcomes).chances
+    assert hasattr(pools["3d6"], "_probabilitycache")
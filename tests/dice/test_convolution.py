@@ -0,0 +1,60 @@
+import pytest
+
+from ttrpg_dice import d, instrumentation, stats
+from ttrpg_dice import dice as dicemodule
+
+POOLS = [
+    pytest.param(d(6), id="d6"),
+    pytest.param(2 * d(6), id="2d6"),
+    pytest.param(d(4) + d(6) + d(8) + 3, id="mixed"),
+    pytest.param(10 * d(20), id="10d20"),
+    pytest.param(d(100) + d(1000) + 5 * d(20), id="large mixed"),
+    pytest.param((3 * d(6)).explode() + d(20).reroll(1), id="modified"),
+    pytest.param(40 * d(6), id="counts wider than 64 bits"),
+]
+
+
+@pytest.mark.parametrize("dice", POOLS)
+def test_kronecker_matches_direct(dice, monkeypatch):
+    monkeypatch.setattr(dicemodule, "KRONECKER_THRESHOLD", float("inf"))
+    direct = dice._core_counts()  # noqa: SLF001
+    monkeypatch.setattr(dicemodule, "KRONECKER_THRESHOLD", 0)
+    assert dice._core_counts() == direct  # noqa: SLF001
+
+
+@pytest.mark.parametrize("dice", POOLS)
+def test_decimal_matches_direct(dice, monkeypatch):
+    monkeypatch.setattr(dicemodule, "KRONECKER_THRESHOLD", float("inf"))
+    direct = dice._core_counts()  # noqa: SLF001
+    monkeypatch.setattr(dicemodule, "KRONECKER_THRESHOLD", 0)
+    monkeypatch.setattr(dicemodule, "DECIMAL_THRESHOLD", 0)
+    assert dice._core_counts() == direct  # noqa: SLF001
+
+
+def test_decimal_beyond_int_str_limit(monkeypatch):
+    expected = (40 * d(6))._core_counts()  # noqa: SLF001
+    monkeypatch.setattr(dicemodule, "KRONECKER_THRESHOLD", 0)
+    monkeypatch.setattr(dicemodule, "DECIMAL_THRESHOLD", 0)
+    monkeypatch.setattr(dicemodule.sys, "get_int_max_str_digits", lambda: 10)
+    assert (40 * d(6))._core_counts() == expected  # noqa: SLF001
+
+
+def test_kronecker_chosen_for_large_pools():
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        _ = list(2 * d(6))
+        assert "dice.convolution_kronecker" not in stats()
+        _ = list(50 * d(20))
+        assert stats()["dice.convolution_kronecker"] == 1
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+
+
+def test_large_pool_exact():
+    counts = (100 * d(6))._counts()  # noqa: SLF001
+    assert sum(counts) == 6**100
+    assert counts[100] == 1
+    assert counts[101] == 100
+    assert counts[349] == counts[351]  # Symmetric
@@ -0,0 +1,124 @@
+import pickle
+from collections import Counter
+from itertools import product
+
+import pytest
+
+from ttrpg_dice import CombinedDice, TransformedDice, d, expression, instrumentation, stats
+
+
+def _clamped(result):
+    return min(max(result, 2), 5)
+
+
+def _enumerated(*terms):
+    """P(total) by enumerating every combination of `(results, transform)` terms."""
+    counts = Counter()
+    for rolls in product(*(range(1, faces + 1) for faces, _ in terms)):
+        counts[sum(transform(roll) for roll, (_, transform) in zip(rolls, terms, strict=True))] += 1
+    total = sum(counts.values())
+    return {result: count / total for result, count in counts.items()}
+
+
+def _distribution(dice):
+    probabilities = list(dice)
+    return {result: p for result, p in enumerate(probabilities, dice._lowest) if p}  # noqa: SLF001
+
+
+@pytest.mark.parametrize(
+    ["formula", "terms"],
+    [
+        pytest.param(lambda: d(6).clamp(2, 5) + d(4), [(6, _clamped), (4, int)], id="add dice"),
+        pytest.param(lambda: d(6).clamp(2, 5) + 3, [(6, lambda r: _clamped(r) + 3)], id="add constant"),
+        pytest.param(lambda: d(4) + d(6).clamp(2, 5), [(4, int), (6, _clamped)], id="radd"),
+        pytest.param(lambda: d(6).clamp(2, 5) - d(4), [(6, _clamped), (4, lambda r: -r)], id="subtract dice"),
+        pytest.param(lambda: 10 - d(6).clamp(2, 5), [(6, lambda r: 10 - _clamped(r))], id="rsubtract"),
+        pytest.param(lambda: -d(6).clamp(2, 5), [(6, lambda r: -_clamped(r))], id="negate"),
+        pytest.param(lambda: 2 * d(6).clamp(2, 5), [(6, _clamped), (6, _clamped)], id="multiply"),
+        pytest.param(lambda: -2 * d(6).clamp(2, 5), [(6, lambda r: -_clamped(r))] * 2, id="multiply negative"),
+        pytest.param(
+            lambda: d(6).clamp(2, 5) + d(4).map(lambda r: r * r) + d(8) - 1,
+            [(6, _clamped), (4, lambda r: r * r), (8, lambda r: r - 1)],
+            id="mixed",
+        ),
+    ],
+)
+def test_matches_enumeration(formula, terms):
+    assert _distribution(formula()) == pytest.approx(_enumerated(*terms))
+
+
+def test_types():
+    clamped = d(6).clamp(2, 5)
+    assert isinstance(clamped + d(4), CombinedDice)
+    assert isinstance(-clamped, TransformedDice)
+    assert clamped + 0 is clamped
+    assert (clamped + d(4) - clamped)._key == (d(4) + clamped - clamped)._key  # noqa: SLF001
+
+
+def test_simplified():
+    clamped = d(6).clamp(2, 5)
+    formula = clamped + d(4) + 2 + d(6) + clamped
+    assert formula.terms == ((clamped, 2), (d(4) + d(6) + 2, 1))
+    assert str(formula) == "2 * ((d6).clamp(2, 5)) + d4 + d6 + 2"
+
+
+@pytest.mark.parametrize(
+    ["first", "second"],
+    [
+        pytest.param(lambda t: t + d(4) + d(6), lambda t: t + (d(4) + d(6)), id="grouping"),
+        pytest.param(lambda t: d(4) + t + 1, lambda t: t + 1 + d(4), id="order"),
+        pytest.param(lambda t: t + t, lambda t: 2 * t, id="repeated"),
+    ],
+)
+def test_equivalent_keys(first, second):
+    assert first(d(20).clamp(5, 20))._key == second(d(20).clamp(5, 20))._key  # noqa: SLF001
+    assert first(d(20).clamp(5, 20)) == second(d(20).clamp(5, 20))
+
+
+def test_different_keys():
+    assert (d(20).clamp(5, 20) + d(4))._key != (d(20).clamp(5, 20) + d(6))._key  # noqa: SLF001
+    assert (d(20).clamp(5, 20) + d(4))._key != (d(20).clamp(6, 20) + d(4))._key  # noqa: SLF001
+
+
+def test_evaluate_shares_subexpressions(instrumented):  # noqa: ARG001
+    formulas = [(d(20) + 5).clamp(highest=20) + d(n) for n in (4, 6, 8)]
+    assert expression.evaluate(formulas) == formulas
+    assert stats()["dice.transform"] == 1
+    assert stats()["dice.combine"] == 3
+    assert stats()["expression.nodes"] == 1 + 1 + 3 + 3  # d20 + 5, clamp, d4/d6/d8, sums
+    assert stats()["expression.shared"] == 2
+    instrumentation.reset()
+    _ = [formula[10] for formula in formulas]
+    assert "dice.build" not in stats()
+    assert "dice.transform" not in stats()
+
+
+def test_evaluate_matches_individual():
+    formulas = [d(6).clamp(2, 5) + d(4), 2 * d(6).clamp(2, 5), d(6).clamp(2, 5) + d(4) - 1]
+    individually = [d(6).clamp(2, 5) + d(4), 2 * d(6).clamp(2, 5), d(6).clamp(2, 5) + d(4) - 1]
+    expected = [list(formula) for formula in individually]
+    assert [list(formula) for formula in expression.evaluate(formulas)] == expected
+
+
+def test_evaluate_already_calculated(instrumented):  # noqa: ARG001
+    clamped = d(6).clamp(2, 5)
+    _ = clamped[2]
+    expression.evaluate([clamped + d(4), d(6).clamp(2, 5) + d(6)])
+    assert stats()["dice.transform"] == 1
+
+
+def test_no_modifiers():
+    with pytest.raises(TypeError, match="Cannot explode or reroll 'CombinedDice'"):
+        (d(6).clamp(2, 5) + d(4)).explode()
+
+
+def test_no_bytes():
+    with pytest.raises(TypeError, match="Cannot convert 'CombinedDice' to bytes"):
+        (d(6).clamp(2, 5) + d(4)).to_bytes()
+
+
+def test_pickle():
+    formula = d(6).clamp(2, 5) + 2 * d(4).map({1: 1, 2: 1, 3: 2, 4: 3}) - 1
+    unpickled = pickle.loads(pickle.dumps(formula))  # noqa: S301
+    assert unpickled == formula
+    assert list(unpickled) == list(formula)
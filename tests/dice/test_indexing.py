@@ -7,6 +7,8 @@ from operator import indexOf
 
 import pytest  # noqa: F401, RUF100
 
+from ttrpg_dice import d
+
 
 @dataclass
 class SliceTest:
@@ -225,3 +227,85 @@ def test_invalid_index(dietype, index, errortype, errormsg):
     msg = re.escape(errormsg)
     with pytest.raises(errortype, match=msg):
         dietype[index]
+
+
+def test_sparse_storage():
+    dice = d(4) + 1000
+    assert len(dice) == 1004
+    assert len(dice._probabilitycache) == 4  # noqa: SLF001
+    assert dice._offset == 1001  # noqa: SLF001
+    assert dice[1000] == 0
+    assert dice[1001] == 0.25
+    assert dice[-4] == 0.25
+    assert dice[-5] == 0
+    assert dice[999:1003] == [0, 0, 0.25, 0.25]
+    assert list(dice)[:1000] == [0] * 1000
+    assert sum(dice) == 1
+
+
+def test_huge_offset():
+    dice = d(4) + 10**10
+    assert dice[10**10 + 4] == 0.25
+    assert dice[-1] == 0.25
+    assert dice[5] == 0
+    assert dice[10**10 : 10**10 + 3] == [0, 0.25, 0.25]
+    assert dice.weighted
+
+
+def _dense_getitem(dice, index):
+    """Previous implementation: index into the full list of probabilities, with `None` for 0."""
+    probabilities = dice._probabilities  # noqa: SLF001
+    if isinstance(index, slice):
+        if index.step is None or index.step > 0:
+            if index.start is None:
+                index = slice(1 if index.step is None else index.step, index.stop, index.step)
+        elif index.stop is None:
+            index = slice(index.start, 0, index.step)
+    return probabilities[index]
+
+
+@pytest.mark.parametrize(
+    "dice",
+    [
+        pytest.param(d(4) + 3, id="d4 + 3"),
+        pytest.param(2 * d(3) + 1, id="2d3 + 1"),
+        pytest.param(d(6).reroll(1, 2) + 2, id="d6r1r2 + 2"),
+    ],
+)
+def test_sparse_matches_dense(dice):
+    bounds = [None, *range(-len(dice) - 2, len(dice) + 3)]
+    for start in bounds:
+        for stop in bounds:
+            for step in [None, 1, 2, 3, -1, -2]:
+                index = slice(start, stop, step)
+                if start == 0 and (step is None or step > 0):
+                    continue  # DiceIndexError
+                assert dice[index] == _dense_getitem(dice, index), index
+    for index in range(-len(dice), len(dice) + 1):
+        if index:
+            assert dice[index] == _dense_getitem(dice, index)
+
+
+@pytest.mark.parametrize(
+    "dice",
+    [
+        pytest.param(d(4) + 3, id="d4 + 3"),
+        pytest.param(d(6).reroll(1, 2) + 2, id="d6r1r2 + 2"),
+        pytest.param(d(4) - d(4), id="d4 - d4"),
+        pytest.param(d(6) - 1, id="d6 - 1"),
+        pytest.param(-d(4) - 2, id="-d4 - 2"),
+    ],
+)
+def test_slices_match_each_result(dice):
+    _ = dice[-1]
+    lowest = dice._lowest  # noqa: SLF001
+    bounds = [None, *range(-len(dice) - 4, len(dice) + 4)]
+    for start in bounds:
+        for stop in bounds:
+            for step in [None, 1, 2, 3, -1, -2, -3]:
+                index = slice(start, stop, step)
+                if start == 0 and lowest > 0 and (step is None or step > 0):
+                    continue  # DiceIndexError
+                results = dice._results(index)  # noqa: SLF001
+                expected = [dice._probability(result) if result >= lowest else None for result in results]  # noqa: SLF001
+                assert dice[index] == expected, index
@@ -340,27 +340,21 @@ invalid_contents_cases = [
     InvalidDiceTestCase(
         contents={"foo": 1},
         errortype=TypeError,
-        errormsg="Number of faces must be a positive integer, not str",
+        errormsg="Number of faces must be a non-zero integer, not str",
         id="faces: str",
     ),
     InvalidDiceTestCase(
         contents={1.5: 1},
         errortype=TypeError,
-        errormsg="Number of faces must be a positive integer, not float",
+        errormsg="Number of faces must be a non-zero integer, not float",
         id="faces: float",
     ),
     InvalidDiceTestCase(
         contents={0: 1},
         errortype=ValueError,
-        errormsg="Number of faces must be a positive integer, not 0",
+        errormsg="Number of faces must be a non-zero integer, not 0",
         id="faces: zero",
     ),
-    InvalidDiceTestCase(
-        contents={-1: 1},
-        errortype=ValueError,
-        errormsg="Number of faces must be a positive integer, not -1",
-        id="faces: negative",
-    ),
     InvalidDiceTestCase(
         contents={4: 3, 2: 3.2, 1: "2"},
         errortype=TypeError,
@@ -376,13 +370,13 @@ invalid_contents_cases = [
     InvalidDiceTestCase(
         contents={5: 2, "-1": 1, 1: 2, 3.2: 4},
         errortype=TypeError,
-        errormsg="Number of faces must be a positive integer, not float, str",
+        errormsg="Number of faces must be a non-zero integer, not float, str",
         id="faces: partially valid types",
     ),
     InvalidDiceTestCase(
-        contents={5: 2, -1: 1, 1: 2, -2: 3},
+        contents={5: 2, -1: 1, 0: 2, -2: 3},
         errortype=ValueError,
-        errormsg="Number of faces must be a positive integer, not -2, -1",
+        errormsg="Number of faces must be a non-zero integer, not 0",
         id="faces: partially valid values",
     ),
 ]
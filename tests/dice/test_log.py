@@ -0,0 +1,50 @@
+from math import comb, inf, isclose, log
+
+import pytest  # noqa: F401, RUF100
+
+from ttrpg_dice import d
+
+
+@pytest.mark.parametrize("dice", [pytest.param(2 * d(6), id="2d6"), pytest.param(d(4) + 3, id="d4 + 3")])
+def test_matches_probabilities(dice):
+    for result in range(1, len(dice) + 1):
+        expected = log(dice[result]) if dice[result] else -inf
+        assert isclose(dice.log[result], expected)
+
+
+def test_impossible():
+    assert (d(4) + 3).log[2] == -inf
+    assert (d(4) + 3).log.sum(slice(None, 4)) == -inf
+
+
+def test_slice():
+    dice = 2 * d(2)
+    assert dice.log[:] == [-inf, log(0.25), log(0.5), log(0.25)]
+    assert dice.log[::-1] == [log(0.25), log(0.5), log(0.25), -inf]
+
+
+def test_huge_pool_does_not_underflow():
+    dice = 400 * d(20)
+    assert dice[400] == 0.0
+    assert isclose(dice.log[400], -400 * log(20))
+    assert isclose(dice.log[-1], -400 * log(20))
+    assert isclose(dice.log[401], log(400) - 400 * log(20))
+
+
+def test_sum():
+    dice = 2 * d(6)
+    assert isclose(dice.log.sum(slice(10, None)), log(6 / 36))
+    assert isclose(dice.log.sum(7), log(6 / 36))
+    assert isclose(dice.log.sum(slice(None)), 0, abs_tol=1e-15)
+
+
+def test_sum_huge_tail():
+    dice = 400 * d(20)
+    assert sum(dice[7990:]) == 0.0
+    ways = sum(comb(400 + k - 1, k) for k in range(11))  # Each way to fall short of the maximum by k <= 10
+    assert isclose(dice.log.sum(slice(7990, None)), log(ways) - 400 * log(20))
+
+
+def test_invalid_index():
+    with pytest.raises(IndexError):
+        _ = (2 * d(6)).log[0]
@@ -0,0 +1,67 @@
+import re
+
+import pytest
+
+from ttrpg_dice import d, instrumentation, stats
+from ttrpg_dice.dice import DistributionTooLargeError, _convolve_chunked, _convolve_kronecker, _number_possible_rolls
+
+
+def test_unlimited_by_default():
+    assert d.max_bytes is None
+    assert sum((50 * d(20))._counts()) == 20**50  # noqa: SLF001
+
+
+def test_too_large(monkeypatch):
+    monkeypatch.setattr(d, "max_bytes", 100_000)
+    dice = 50 * d(20)
+    msg = "A distribution with 951 possible results needs about 121,728 bytes, more than max_bytes=100,000."
+    with pytest.raises(DistributionTooLargeError, match=re.escape(msg)) as e:
+        dice[500]
+    assert isinstance(e.value, MemoryError)
+    assert e.value.needed == 121_728
+    assert not hasattr(dice, "_countcache")
+
+
+def test_instance_budget():
+    dice = 50 * d(20)
+    dice.max_bytes = 100_000
+    with pytest.raises(DistributionTooLargeError):
+        dice[500]
+    assert (50 * d(20))[500]
+
+
+def test_chunked_matches(monkeypatch, instrumented):  # noqa: ARG001
+    expected = (50 * d(20))._core_counts()  # noqa: SLF001
+    monkeypatch.setattr(d, "max_bytes", 140_000)
+    instrumentation.reset()
+    assert (50 * d(20))._core_counts() == expected  # noqa: SLF001
+    assert stats()["dice.convolution_chunked"] == 1
+    assert "dice.convolution_kronecker" not in stats()
+
+
+def test_fast_within_budget(monkeypatch, instrumented):  # noqa: ARG001
+    monkeypatch.setattr(d, "max_bytes", 200_000)
+    _ = (50 * d(20))[500]
+    assert stats()["dice.convolution_kronecker"] == 1
+    assert "dice.convolution_chunked" not in stats()
+
+
+def test_small_unaffected(monkeypatch):
+    monkeypatch.setattr(d, "max_bytes", 10_000)
+    assert (d(7) + d(11))[12] == pytest.approx(7 / 77)
+
+
+def test_combined(monkeypatch):
+    monkeypatch.setattr(d, "max_bytes", 100_000)
+    clamped = (25 * d(20)).clamp(30, 480)
+    assert clamped[250]
+    with pytest.raises(DistributionTooLargeError, match="901 possible results"):
+        (2 * clamped)[500]
+
+
+@pytest.mark.parametrize("max_bytes", [1, 2_000, 50_000, 10**9])
+def test_chunks_match_kronecker(max_bytes):
+    groups = [([1] * 100, 1), ([1] * 20, 12), ([1, 0, 2], 5)]
+    length = 1 + 99 + 19 * 12 + 2 * 5
+    width = (_number_possible_rolls(groups).bit_length() + 7) // 8
+    assert _convolve_chunked(groups, width, max_bytes) == _convolve_kronecker(groups, length)
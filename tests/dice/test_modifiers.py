@@ -0,0 +1,121 @@
+from fractions import Fraction
+
+import pytest  # noqa: F401, RUF100
+
+from ttrpg_dice import PoolComparison, d
+from ttrpg_dice.dice import ModifiedDie
+
+
+def test_explode_d6():
+    d6 = d(6).explode()
+    assert d6[1] == pytest.approx(1 / 6)
+    assert d6[6] == 0
+    assert d6[7] == pytest.approx(1 / 36)
+    assert d6[12] == 0
+    assert d6[13] == pytest.approx(1 / 216)
+
+
+def test_explode_sums_to_one():
+    assert sum(d(6).explode()) == pytest.approx(1)
+
+
+def test_explode_exact_counts():
+    counts = d(4).explode(cutoff=0.01)._counts()  # noqa: SLF001
+    total = sum(counts)
+    assert Fraction(counts[5], total) == Fraction(1, 16)
+    assert Fraction(counts[9], total) == Fraction(1, 64)
+
+
+def test_explode_cutoff():
+    assert len(d(6).explode(cutoff=0.01)) == 24
+    assert len(d(6).explode(cutoff=1e-9)) == 78
+
+
+def test_explode_default_cutoff():
+    assert d(6).explode() == d(6).explode(cutoff=d.EXPLODE_CUTOFF)
+
+
+@pytest.mark.parametrize("cutoff", [0, 1, -0.5])
+def test_explode_invalid_cutoff(cutoff):
+    with pytest.raises(ValueError, match="Cutoff must be a probability between 0 and 1"):
+        d(6).explode(cutoff=cutoff)
+
+
+def test_explode_pool():
+    pool = (2 * d(6)).explode(cutoff=0.01) + 1
+    assert pool.contents == {ModifiedDie(6, 3): 2, 1: 1}
+    assert pool == d(6).explode(cutoff=0.01) + d(6).explode(cutoff=0.01) + 1
+
+
+def test_reroll():
+    d20 = d(20).reroll(1)
+    assert d20[1] == 0
+    assert d20[2:] == pytest.approx([1 / 19] * 19)
+
+
+def test_reroll_multiple():
+    assert d(6).reroll(1, 2) == d(4) + 2
+
+
+def test_reroll_ignores_missing_faces():
+    assert (d(4) + d(20)).reroll(10).contents == {4: 1, ModifiedDie(20, reroll=[10]): 1}
+
+
+def test_reroll_everything():
+    with pytest.raises(ValueError, match="Cannot reroll every face on a d2"):
+        d(2).reroll(1, 2)
+
+
+def test_reroll_then_explode():
+    d6 = d(6).reroll(1).explode(cutoff=0.01)
+    assert d6[1] == 0
+    assert d6[2] == pytest.approx(1 / 5)
+    assert d6[8] == pytest.approx(1 / 25)
+
+
+@pytest.mark.parametrize("cutoff", [None, 0.01])
+def test_explode_then_reroll(cutoff):
+    assert d(6).explode(cutoff).reroll(1) == d(6).reroll(1).explode(cutoff)
+    assert -d(6).explode(cutoff).reroll(1) == -d(6).reroll(1).explode(cutoff)
+
+
+def test_explode_then_reroll_without_cutoff():
+    d6 = d.from_bytes(d(6).explode().to_bytes()).reroll(1)
+    assert next(iter(d6.contents)).explode > next(iter(d(6).explode().contents)).explode
+
+
+def test_reroll_highest_never_explodes():
+    assert d(4).reroll(4).explode() == d(3)
+
+
+@pytest.mark.parametrize(
+    ["description", "dice"],
+    [
+        pytest.param("d6!", d(6).explode(), id="explode"),
+        pytest.param("3d6!", (3 * d(6)).explode(), id="explode many"),
+        pytest.param("d20r1", d(20).reroll(1), id="reroll"),
+        pytest.param("d20r1r2", d(20).reroll(1, 2), id="reroll many"),
+        pytest.param("d6!r1", d(6).reroll(1).explode(), id="reroll and explode"),
+        pytest.param("2d6! + d20r1 + 2", (2 * d(6)).explode() + d(20).reroll(1) + 2, id="combined"),
+    ],
+)
+def test_from_str(description, dice):
+    assert d.from_str(description).contents == dice.contents
+    assert str(dice) == description
+
+
+def test_hash():
+    assert hash(d(6).explode()) == hash(d.from_str("d6!"))
+    assert hash(d(6).explode()) != hash(d(6))
+
+
+def test_slicing():
+    d6 = d(6).explode(cutoff=0.01)
+    assert d6[::6] == pytest.approx([0, 0, 0, 1 / 1296])
+    assert d6[-1] == pytest.approx(1 / 1296)
+
+
+def test_poolcomparison():
+    pools = [d(6), d(6).explode()]
+    comparison = PoolComparison(pools, {"6+": slice(6, None)})
+    assert comparison.chances == pytest.approx({(d(6), "6+"): 1 / 6, (d(6).explode(), "6+"): 1 / 6})
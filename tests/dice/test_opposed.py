@@ -0,0 +1,92 @@
+import operator
+from itertools import product
+
+import pytest
+
+from ttrpg_dice import d, stats
+from ttrpg_dice.dice import Dice
+
+COMPARISONS = {
+    "prob_gt": operator.gt,
+    "prob_ge": operator.ge,
+    "prob_lt": operator.lt,
+    "prob_le": operator.le,
+    "prob_eq": operator.eq,
+}
+
+
+def _enumerated(dice, other, k, comparison):
+    """Compare every pair of results."""
+    results = range(dice._lowest, dice._lowest + len(dice))  # noqa: SLF001
+    otherresults = range(other._lowest, other._lowest + len(other))  # noqa: SLF001
+    return sum(
+        dice[result] * other[otherresult]
+        for result, otherresult in product(results, otherresults)
+        if comparison(result, otherresult + k)
+    )
+
+
+@pytest.mark.parametrize("method", COMPARISONS)
+@pytest.mark.parametrize(
+    ["dice", "other"],
+    [
+        pytest.param(d(20), d(20), id="d20 vs d20"),
+        pytest.param(d(20) + 2, d(20), id="modifier"),
+        pytest.param(2 * d(6), d(4) - 3, id="negative results"),
+        pytest.param(d(6).explode(), 3 * d(4), id="exploding"),
+        pytest.param(d(4) + 100, d(6), id="no overlap"),
+    ],
+)
+def test_matches_enumerated(dice, other, method):
+    _ = list(dice), list(other)
+    for k in range(-15, 15):
+        expected = _enumerated(dice, other, k, COMPARISONS[method])
+        assert getattr(dice, method)(other, k) == pytest.approx(expected, abs=1e-12), k
+
+
+def test_opposed_d20():
+    assert d(20).prob_gt(d(20)) == pytest.approx(190 / 400)
+    assert d(20).prob_eq(d(20)) == pytest.approx(1 / 20)
+    assert d(20).prob_ge(d(20), 19) == pytest.approx(1 / 400)
+
+
+def test_compare_with_number():
+    assert d(6).prob_gt(4) == pytest.approx(1 / 3)
+    assert d(6).prob_ge("4") == pytest.approx(1 / 2)
+    assert (2 * d(6)).prob_eq(7) == pytest.approx(1 / 6)
+
+
+def test_compare_with_invalid():
+    with pytest.raises(TypeError, match="Cannot compare 'NoneType' with 'Dice'"):
+        d(6).prob_gt(None)
+
+
+def test_complementary():
+    attack, defence = 3 * d(6) + 2, 2 * d(8)
+    assert attack.prob_gt(defence, 1) + attack.prob_le(defence, 1) == pytest.approx(1)
+    assert attack.prob_ge(defence) - attack.prob_gt(defence) == pytest.approx(attack.prob_eq(defence))
+
+
+def test_huge_pools():
+    pool = 200 * d(20)
+    assert pool.prob_gt(pool) == pytest.approx((1 - pool.prob_eq(pool)) / 2)
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_cached():
+    Dice._opposedcache.clear()  # noqa: SLF001
+    _ = (2 * d(7)).prob_gt(d(9))
+    _ = (2 * d(7)).prob_gt(d(9))
+    _ = (2 * d(7)).prob_le(d(9))  # Same count as prob_gt
+    _ = (2 * d(7)).prob_eq(d(9))
+    measurements = stats()
+    assert measurements["dice.opposed"] == 2
+    assert measurements["dice.opposed_cache_hit"] == 3
+
+
+def test_cache_size(monkeypatch):
+    monkeypatch.setattr(Dice, "OPPOSED_CACHE_SIZE", 3)
+    for k in range(10):
+        _ = d(6).prob_gt(d(6), k)
+    assert len(Dice._opposedcache) == 3  # noqa: SLF001
+    assert (d(6).contents, d(6).contents, 10) in Dice._opposedcache  # noqa: SLF001
@@ -0,0 +1,65 @@
+import pickle
+from copy import deepcopy
+
+import pytest  # noqa: F401, RUF100
+
+from ttrpg_dice import d, instrumentation, stats
+
+
+@pytest.mark.parametrize(
+    "dice",
+    [
+        pytest.param(d(6), id="d6"),
+        pytest.param(3 * d(6) + 2, id="pool with constant"),
+        pytest.param((2 * d(6)).explode() + d(20).reroll(1, 2), id="modified"),
+        pytest.param((20 * d(20)).explode(), id="counts wider than 64 bits"),
+        pytest.param(d(20) - d(6).explode() - 3, id="subtracted"),
+        pytest.param(d(20) + 10**10, id="constant above 32 bits"),
+        pytest.param(d(20) - 10**30, id="constant above 64 bits"),
+        pytest.param(1000 * d(6), id="counts wider than 255 bytes"),
+    ],
+)
+def test_roundtrip(dice):
+    _ = dice._core  # noqa: SLF001
+    copy = d.from_bytes(dice.to_bytes())
+    assert copy.contents == dice.contents
+    assert copy._countcache == dice._countcache  # noqa: SLF001
+    assert copy._probabilitycache == dice._probabilitycache  # noqa: SLF001
+
+
+@pytest.mark.parametrize("dice", [d(20) + 10**10, (2**40 * d(6)).reroll(1), d(6) - 10**30 * d(4)])
+def test_pickle_and_copy_large_numbers(dice):
+    for copy in (pickle.loads(pickle.dumps(dice)), deepcopy(dice)):  # noqa: S301
+        assert copy._key == dice._key  # noqa: SLF001
+        assert getattr(copy, "_offset", None) == getattr(dice, "_offset", None)
+
+
+def test_roundtrip_not_calculated():
+    copy = d.from_bytes((3 * d(6)).to_bytes())
+    assert not hasattr(copy, "_probabilitycache")
+    assert copy == 3 * d(6)
+
+
+def test_pickle_keeps_distribution():
+    dice = 10 * d(10)
+    _ = list(dice)
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        copy = pickle.loads(pickle.dumps(dice))  # noqa: S301
+        assert list(copy) == list(dice)
+        assert "dice.build" not in stats()
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+
+
+def test_pickle_smaller_than_floats():
+    dice = 10 * d(10)
+    _ = list(dice)
+    assert len(pickle.dumps(dice)) < len(pickle.dumps(dice._probabilitycache))  # noqa: SLF001
+
+
+def test_invalid_bytes():
+    with pytest.raises(ValueError, match=r"Not a Dice created by to_bytes\(\)"):
+        d.from_bytes(b"not really dice")
@@ -0,0 +1,163 @@
+import re
+from itertools import product
+from math import log
+
+import pytest
+
+from ttrpg_dice import PoolComparison, SuccessPool, d
+from ttrpg_dice.dice import DiceIndexError, ModifiedDie
+
+
+def _enumerated(added, subtracted, constant=0):
+    """P(result) for each result, by enumerating every combination of faces."""
+    rolls = [sum(faces) - sum(minus) + constant for faces in product(*added) for minus in product(*subtracted)]
+    return {result: rolls.count(result) / len(rolls) for result in range(min(rolls), max(rolls) + 1)}
+
+
+@pytest.mark.parametrize(
+    ["dice", "expected"],
+    [
+        pytest.param(d(6) - d(6), _enumerated([range(1, 7)], [range(1, 7)]), id="d6 - d6"),
+        pytest.param(
+            2 * d(6) - d(4) - 1,
+            _enumerated([range(1, 7)] * 2, [range(1, 5)], -1),
+            id="2d6 - d4 - 1",
+        ),
+        pytest.param(d(4) - 2 * d(3) + 2, _enumerated([range(1, 5)], [range(1, 4)] * 2, 2), id="d4 - 2d3 + 2"),
+        pytest.param(10 - d(4), _enumerated([], [range(1, 5)], 10), id="10 - d4"),
+        pytest.param(-d(4), _enumerated([], [range(1, 5)]), id="-d4"),
+    ],
+)
+def test_distribution(dice, expected):
+    for result, probability in expected.items():
+        assert dice._probability(result) == pytest.approx(probability), result  # noqa: SLF001
+    assert sum(dice) == pytest.approx(1)
+
+
+def test_opposed():
+    opposed = d(20) - d(20)
+    assert len(opposed) == 39
+    assert opposed[0] == pytest.approx(1 / 20)
+    assert opposed[:0][0] == opposed[19] == pytest.approx(1 / 400)
+    assert sum(opposed[1:]) == pytest.approx(190 / 400)
+
+
+def test_large_opposed_pools():
+    opposed = 30 * d(20) - 30 * d(20)
+    assert opposed[0] == pytest.approx(max(opposed))
+    assert opposed._offset == -570  # noqa: SLF001
+    assert opposed._probability(-500) == pytest.approx(opposed[500])  # noqa: SLF001
+
+
+def test_constants_combine():
+    assert (d(6) - 3 + 1).contents == {6: 1, -1: 2}
+    assert (d(6) - 3 + 5).contents == {6: 1, 1: 2}
+    assert (d(6) + 3 - 3).contents == {6: 1}
+    assert (d(6) - d(6)).contents == {6: 1, -6: 1}
+
+
+def test_negative_multiplication():
+    assert (-2 * d(6)).contents == {-6: 2}
+    assert -2 * d(6) == -(2 * d(6))
+
+
+def test_subtract_modified():
+    dice = d(6).explode() - d(6).reroll(1)
+    assert dice.contents == {ModifiedDie(6, 12): 1, ModifiedDie(-6, reroll=[1]): 1}
+    assert dice._probability(-5) == pytest.approx(1 / 6 * 1 / 5)  # noqa: SLF001
+    assert sum(dice) == pytest.approx(1)
+    assert (-d(6)).explode() == -(d(6).explode())
+
+
+@pytest.mark.parametrize(
+    ["dice", "description"],
+    [
+        pytest.param(d(20) - d(20), "d20 - d20", id="opposed"),
+        pytest.param(2 * d(6) - d(4) - 1, "2d6 - d4 - 1", id="mixed"),
+        pytest.param(d(8) - d(4) + d(6) + 2, "d6 + d8 - d4 + 2", id="added then subtracted"),
+        pytest.param(-d(4), "-d4", id="only subtracted"),
+        pytest.param(d(6).explode() - d(20).reroll(1), "d6! - d20r1", id="modified"),
+    ],
+)
+def test_str(dice, description):
+    assert str(dice) == description
+    assert d.from_str(description) == dice
+    assert d.from_str(description).contents == dice.contents
+
+
+class TestIndexing:
+    dice = d(4) - d(4)
+
+    def test_indices(self):
+        assert self.dice[0] == 0.25
+        assert self.dice[1] == self.dice[-3] == 0.1875  # Negative indices count back from the highest result
+        assert self.dice[-1] == self.dice[-7] == 0.0625
+
+    def test_iter_starts_at_lowest(self):
+        assert list(self.dice) == [1 / 16, 2 / 16, 3 / 16, 4 / 16, 3 / 16, 2 / 16, 1 / 16]
+        assert len(self.dice) == 7
+
+    @pytest.mark.parametrize(
+        ["index", "results"],
+        [
+            pytest.param(slice(None), range(-3, 4), id="all"),
+            pytest.param(slice(None, 0), range(-3, 0), id="below zero"),
+            pytest.param(slice(1, None), range(1, 4), id="above zero"),
+            pytest.param(slice(-10, 10), range(-3, 4), id="beyond possible results"),
+            pytest.param(slice(None, None, 2), range(-2, 4, 2), id="step gives multiples"),
+            pytest.param(slice(-3, None), range(1, 4), id="from the end"),
+            pytest.param(slice(None, -3), range(-3, 1), id="until the end"),
+            pytest.param(slice(None, None, -1), range(3, -4, -1), id="backwards"),
+            pytest.param(slice(6, -5, -2), range(3, -1, -2), id="backwards from above highest"),
+            pytest.param(slice(2, 2), range(0), id="empty"),
+        ],
+    )
+    def test_slices(self, index, results):
+        assert self.dice[index] == [self.dice._probability(result) for result in results]  # noqa: SLF001
+
+    @pytest.mark.parametrize("index", [-8, 4])
+    def test_outside_possible_results(self, index):
+        with pytest.raises(DiceIndexError, match=re.escape("This Dice has sides numbered -3 to 3.")):
+            self.dice[index]
+
+    def test_zero_is_lowest(self):
+        dice = d(6) - 1
+        assert dice[0] == pytest.approx(1 / 6)
+        assert len(dice) == 6
+        assert dice[-1] == dice[5] == pytest.approx(1 / 6)
+        assert dice[-6] == dice[0]
+        with pytest.raises(DiceIndexError):
+            dice[-7]
+
+    def test_positive_dice_unchanged(self):
+        dice = 2 * d(6) - 1
+        assert dice[-1] == pytest.approx(1 / 36)  # Highest result
+        assert dice[11] == pytest.approx(1 / 36)
+        with pytest.raises(DiceIndexError):
+            dice[0]
+
+    def test_log(self):
+        assert self.dice.log[0] == pytest.approx(-1.3862943611198906)
+        assert self.dice.log[:0] == pytest.approx([-2.772588722239781, -2.0794415416798357, -1.6739764335716716])
+        assert self.dice.log[:] == pytest.approx([log(p) for p in self.dice])
+        assert self.dice.log.sum(0) == pytest.approx(log(0.25))
+        assert self.dice.log.sum(slice(None)) == pytest.approx(0.0)
+
+    def test_negative_indices_match_positive_dice(self):
+        outcomes = {"top": slice(-1, None), "bottom two": slice(None, -4)}
+        comparison = PoolComparison({"d6": d(6), "d6 - 1": d(6) - 1, "d6 - 3": d(6) - 3}, outcomes)
+        for pool in ["d6", "d6 - 1", "d6 - 3"]:
+            assert comparison.chances[pool, "top"] == pytest.approx(1 / 6)
+            assert comparison.chances[pool, "bottom two"] == pytest.approx(2 / 6)
+
+
+def test_negative_faces_still_invalid_for_single_die():
+    with pytest.raises(ValueError, match="Number of faces must be a positive integer, not -4"):
+        d(-4)
+
+
+def test_successpool_rejects_subtraction():
+    with pytest.raises(ValueError, match=re.escape("Cannot count successes for subtracted dice in '2d6 - d4'")):
+        SuccessPool(2 * d(6) - d(4), 4)
+    with pytest.raises(ValueError, match=re.escape("remove `- 1` from '2d6 - 1'")):
+        SuccessPool(2 * d(6) - 1, 4)
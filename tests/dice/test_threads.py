@@ -0,0 +1,102 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+import pytest
+
+from ttrpg_dice import d, stats
+
+NUMTHREADS = 8
+
+
+@pytest.fixture
+def slowbuild(monkeypatch):
+    """Make each calculation slow enough that all threads ask for it while it is running."""
+    original = d._core_counts  # noqa: SLF001
+
+    def _slow(self):
+        time.sleep(0.1)
+        return original(self)
+
+    monkeypatch.setattr(d, "_core_counts", _slow)
+
+
+def _together(func):
+    barrier = Barrier(NUMTHREADS)
+
+    def _call(_):
+        barrier.wait()
+        return func()
+
+    with ThreadPoolExecutor(NUMTHREADS) as pool:
+        return list(pool.map(_call, range(NUMTHREADS)))
+
+
+@pytest.mark.usefixtures("instrumented", "slowbuild")
+def test_same_dice_calculated_once():
+    dice = 5 * d(11)
+    results = _together(lambda: list(dice))
+    assert all(result == results[0] for result in results)
+    assert stats()["dice.build"] == 1
+    assert stats()["dice.coalesced"] == NUMTHREADS - 1
+
+
+@pytest.mark.usefixtures("instrumented", "slowbuild")
+def test_equal_contents_calculated_once():
+    results = _together(lambda: list(5 * d(11)))
+    assert all(result == results[0] for result in results)
+    assert stats()["dice.build"] == 1
+    assert stats()["dice.coalesced"] == NUMTHREADS - 1
+
+
+@pytest.mark.usefixtures("slowbuild")
+def test_exception_shared():
+    def _invalid():
+        dice = d.from_contents({6: 1})
+        dice.contents = d._Contents.__new__(d._Contents)  # noqa: SLF001
+        dict.update(dice.contents, {"six": 1})
+        try:
+            _ = list(dice)
+        except TypeError:
+            return "error"
+        return "no error"
+
+    assert _together(_invalid) == ["error"] * NUMTHREADS
+    assert d._building == {}  # noqa: SLF001
+
+
+@pytest.mark.usefixtures("slowbuild")
+def test_budgets_not_shared():
+    count = iter(range(NUMTHREADS))
+
+    def _half_budgeted():
+        dice = 50 * d(20)
+        if next(count) % 2:
+            dice.max_bytes = 100_000
+        try:
+            _ = dice[500]
+        except MemoryError:
+            return "too large"
+        return "calculated"
+
+    assert sorted(_together(_half_budgeted)) == ["calculated"] * (NUMTHREADS // 2) + ["too large"] * (NUMTHREADS // 2)
+
+
+def test_no_builds_left_behind():
+    _ = list(3 * d(8))
+    assert d._building == {}  # noqa: SLF001
+
+
+@pytest.mark.parametrize("threads", [1, 4, None])
+def test_compute_many(threads):
+    pools = [n * d(6) for n in range(1, 10)]
+    assert d.compute_many(pools, threads=threads) == pools
+    assert all(hasattr(pool, "_probabilitycache") for pool in pools)
+    assert [list(pool) for pool in pools] == [list(n * d(6)) for n in range(1, 10)]
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_compute_many_duplicates():
+    pools = d.compute_many([5 * d(11) for _ in range(NUMTHREADS)] + [d(7)], threads=NUMTHREADS)
+    assert all(pool == pools[0] for pool in pools[:NUMTHREADS])
+    assert stats()["dice.build"] + stats().get("dice.coalesced", 0) == NUMTHREADS + 1
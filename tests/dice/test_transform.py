@@ -0,0 +1,140 @@
+import pickle
+import re
+
+import pytest
+
+from ttrpg_dice import PoolComparison, TransformedDice, d, stats
+
+
+def _enumerated(dice, transform):
+    """P(result) after applying `transform` to each result of `dice` separately."""
+    probabilities = {}
+    for result in range(1, len(dice) + 1):
+        transformed = transform(result)
+        if transformed is not None and dice[result]:
+            probabilities[transformed] = probabilities.get(transformed, 0) + dice[result]
+    total = sum(probabilities.values())
+    return {result: p / total for result, p in probabilities.items()}
+
+
+@pytest.mark.parametrize(
+    ["transformed", "transform"],
+    [
+        pytest.param((2 * d(6)).map(lambda r: r // 2), lambda r: r // 2, id="map"),
+        pytest.param(d(6).map({1: 1, 2: 1, 3: 2, 4: 2, 5: 3, 6: 3}), lambda r: (r + 1) // 2, id="map table"),
+        pytest.param((d(20) + 5).clamp(8, 20), lambda r: min(max(r, 8), 20), id="clamp"),
+        pytest.param((3 * d(6)).given(lambda r: r % 2 == 0), lambda r: r if r % 2 == 0 else None, id="given"),
+        pytest.param(
+            d(20).threshold({10: 1, 15: 2, 20: 3}),
+            lambda r: (r >= 10) + (r >= 15) + (r >= 20),
+            id="threshold",
+        ),
+        pytest.param(
+            (2 * d(6) + 3).clamp(1, 12).given(lambda r: r > 6).map(lambda r: r - 6),
+            lambda r: min(r, 12) - 6 if min(r, 12) > 6 else None,
+            id="chain",
+        ),
+    ],
+)
+def test_matches_enumerated(transformed, transform):
+    expected = _enumerated(transformed.base, transform)
+    for result, probability in expected.items():
+        assert transformed[result] == pytest.approx(probability), result
+    assert sum(transformed) == pytest.approx(1)
+
+
+def test_clamp_one_side():
+    assert (d(20) + 5).clamp(highest=20)[20] == pytest.approx(6 / 20)
+    assert (d(20) - 5).clamp(lowest=1)[1] == pytest.approx(6 / 20)
+
+
+def test_threshold_below_all():
+    degrees = d(20).threshold({10: 1, 15: 2, 20: 3})
+    assert degrees[0] == pytest.approx(9 / 20)
+    assert degrees[:] == pytest.approx([0.45, 0.25, 0.25, 0.05])
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_lazy():
+    chain = (2 * d(7) + 3).clamp(1, 12).given(lambda r: r > 4).map(lambda r: r * 2)
+    assert isinstance(chain, TransformedDice)
+    assert "dice.build" not in stats()
+    _ = chain[10]
+    measurements = stats()
+    assert measurements["dice.build"] == 1
+    assert measurements["dice.transform"] == 1
+
+
+def test_chain_is_fused():
+    chain = (2 * d(6) + 3).clamp(1, 12).map(lambda r: r // 3)
+    assert chain.base.contents == (2 * d(6) + 3).contents
+    assert [kind for kind, _ in chain.steps] == ["clamp", "map"]
+
+
+def test_str():
+    def damage(result):
+        return result // 2
+
+    assert str((2 * d(6) + 3).clamp(1, 12).map(damage)) == "(2d6 + 3).clamp(1, 12).map(damage)"
+    assert str(d(20).threshold({15: 2, 10: 1})) == "(d20).threshold({10: 1, 15: 2})"
+
+
+def test_equal_and_hash():
+    assert d(20).clamp(5, 15) == d(20).clamp(5, 15)
+    assert hash(d(20).clamp(5, 15)) == hash(d(20).clamp(5, 15))
+    assert d(6).map({1: 2, 2: 2, 3: 2, 4: 2, 5: 2, 6: 2}) == d(2).clamp(2, 2)
+
+
+def test_opposed():
+    attack = (d(20) + 5).clamp(highest=20)
+    assert attack.prob_ge(15) == pytest.approx(11 / 20)
+    expected = sum(attack[a] * d(20)[b] for a in range(6, 21) for b in range(1, 21) if a > b)
+    assert attack.prob_gt(d(20)) == pytest.approx(expected)
+
+
+def test_poolcomparison():
+    comparison = PoolComparison({"clamped": (d(20) + 5).clamp(highest=20)}, {"20": slice(20, 21)})
+    assert comparison.chances["clamped", "20"] == pytest.approx(6 / 20)
+
+
+def test_pickle():
+    transformed = d(20).threshold({10: 1, 20: 2})
+    assert pickle.loads(pickle.dumps(transformed)) == transformed  # noqa: S301
+
+
+def test_nothing_remains():
+    with pytest.raises(ValueError, match=re.escape("No possible result of d6 remains after (d6).given(<lambda>)")):
+        d(6).given(lambda r: r > 6)[1]
+
+
+@pytest.mark.parametrize(
+    ["transform", "errortype", "errormsg"],
+    [
+        pytest.param(lambda dice: dice.map(3), TypeError, "requires a function or a mapping, not 'int'", id="map"),
+        pytest.param(lambda dice: dice.clamp(5, 1), ValueError, "Cannot clamp between 5 and 1", id="clamp"),
+        pytest.param(lambda dice: dice.given(True), TypeError, "requires a function, not 'bool'", id="given"),  # noqa: FBT003
+        pytest.param(lambda dice: dice.threshold({}), ValueError, "at least one threshold", id="threshold"),
+    ],
+)
+def test_invalid(transform, errortype, errormsg):
+    with pytest.raises(errortype, match=errormsg):
+        transform(d(6))
+
+
+def test_map_result_must_be_int():
+    with pytest.raises(TypeError):
+        d(6).map(lambda r: r / 2)[1]
+    with pytest.raises(ValueError, match="Cannot map 2: not in table"):
+        d(6).map({1: 1})[1]
+
+
+@pytest.mark.parametrize(
+    "modify",
+    [
+        pytest.param(lambda t: t.explode(), id="explode"),
+        pytest.param(lambda t: t.reroll(1), id="reroll"),
+    ],
+)
+def test_no_modifiers(modify):
+    with pytest.raises(TypeError, match="Cannot explode or reroll 'TransformedDice'"):
+        modify(d(6).clamp(2, 5))
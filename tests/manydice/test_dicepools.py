@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import pickle
 from dataclasses import dataclass
 from typing import Any
 
 import pytest  # noqa: F401, RUF100
 
-from ttrpg_dice import d
+from ttrpg_dice import SuccessPool, d
 from ttrpg_dice.manydice import PoolComparison
 
 # Anydice calculation:
@@ -315,3 +316,34 @@ def test_plot(pools, outcomes, poolnames, outcomenames, xticks, yticks):  # noqa
     assert list(ax.get_xticks()) == xticks
     assert [label.get_text() for label in ax.get_ymajorticklabels()] == poolnames
     assert list(ax.get_yticks()) == yticks
+
+
+@pytest.mark.parametrize(
+    ["pools", "outcomes"],
+    [
+        pytest.param([d(6), 2 * d(6)], {"3+": slice(3, None)}, id="unnamed"),
+        pytest.param(
+            {"sum": 3 * d(6), "hits": SuccessPool.from_checks([(4 * d(10), 7), (d(8), 5)]), "boom": d(6).explode()},
+            {"1+": slice(1, None), "evens": slice(2, 7, 2)},
+            id="named, mixed",
+        ),
+        pytest.param(
+            [d(20).clamp(5, 15), 2 * d(6) + d(20).clamp(5, 15), d(6)],
+            {"10+": slice(10, None)},
+            id="expressions",
+        ),
+    ],
+)
+def test_pickle(pools, outcomes):
+    comparison = PoolComparison(pools, outcomes)
+    copy = pickle.loads(pickle.dumps(comparison))  # noqa: S301
+    assert copy.chances == comparison.chances
+    assert list(copy.pools.values()) == list(comparison.pools.values())
+    assert copy.outcomes == comparison.outcomes
+    assert str(copy) == str(comparison)
+
+
+def test_to_bytes_invalid_name():
+    comparison = PoolComparison({1: d(6)}, {"1+": slice(1, None)})
+    with pytest.raises(TypeError, match="pools named by int"):
+        comparison.to_bytes()
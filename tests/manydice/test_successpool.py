@@ -0,0 +1,83 @@
+from itertools import product
+
+import pytest  # noqa: F401, RUF100
+
+from ttrpg_dice import PoolComparison, SuccessPool, d, lazyroll
+
+
+def _bruteforce(checks):
+    """Enumerate every roll of every die and count the successes."""
+    dice = [(faces, target) for pool, target in checks for faces, n in pool.contents.items() for _ in range(n)]
+    rolls = list(product(*[range(1, faces + 1) for faces, _ in dice]))
+    hits = [sum(roll >= target for roll, (_, target) in zip(rollset, dice)) for rollset in rolls]  # noqa: B905
+    return [hits.count(n) / len(rolls) for n in range(len(dice) + 1)]
+
+
+def test_single_dicetype():
+    pool = SuccessPool(3 * d(6), 5)
+    assert list(pool) == pytest.approx(_bruteforce([(3 * d(6), 5)]))
+
+
+def test_mixed_pool():
+    pool = SuccessPool((3 * d(10)) + (2 * d(8)), 7)
+    assert list(pool) == pytest.approx(_bruteforce([((3 * d(10)) + (2 * d(8)), 7)]))
+
+
+def test_variable_targets():
+    checks = [(2 * d(10), 7), (2 * d(8), 5), (d(6), 2)]
+    pool = SuccessPool.from_checks(checks)
+    assert list(pool) == pytest.approx(_bruteforce(checks))
+
+
+def test_matches_lazyroll():
+    """`lazyroll` counts successes rolling under, so roll over the flipped target."""
+    pool = SuccessPool(4 * d(100), 100 - 33 + 1)
+    assert [round(sum(pool[i:]) * 100) for i in range(5)] == lazyroll(4, 100, 33)
+
+
+def test_impossible_target():
+    assert list(SuccessPool(2 * d(6), 7)) == [1, 0, 0]
+
+
+def test_guaranteed_target():
+    assert list(SuccessPool(2 * d(6), 1)) == [0, 0, 1]
+
+
+def test_exploding():
+    pool = SuccessPool(2 * d(6).explode(), 7)
+    assert pool[2] == pytest.approx((1 / 6) ** 2)
+
+
+def test_large_pool():
+    pool = SuccessPool((100 * d(10)) + (100 * d(8)), 7)
+    assert len(pool) == 201
+    assert sum(pool) == pytest.approx(1)
+
+
+def test_constant():
+    with pytest.raises(ValueError, match=r"Cannot count successes for a constant, remove `\+ 2` from 'd6 \+ 2'"):
+        SuccessPool(d(6) + 2, 5)
+
+
+@pytest.mark.parametrize("dice", [3 * d(6).clamp(2, 6), d(6) + d(6).map(abs)])
+def test_expression(dice):
+    with pytest.raises(TypeError, match=r"Cannot count successes for '(Combined|Transformed)Dice: .*', use the"):
+        SuccessPool(dice, 5)
+
+
+def test_str():
+    assert str(SuccessPool.from_checks([(3 * d(10), 7), (2 * d(8), 5)])) == "3d10 >= 7, 2d8 >= 5"
+
+
+def test_poolcomparison():
+    pools = [SuccessPool(3 * d(6), 5), SuccessPool(3 * d(6), 6)]
+    comparison = PoolComparison(pools, {"none": slice(None, 1), "some": slice(1, None)})
+    assert comparison.chances == pytest.approx(
+        {
+            (pools[0], "none"): (2 / 3) ** 3,
+            (pools[0], "some"): 1 - (2 / 3) ** 3,
+            (pools[1], "none"): (5 / 6) ** 3,
+            (pools[1], "some"): 1 - (5 / 6) ** 3,
+        },
+    )
+    assert str(comparison).splitlines()[1].startswith("3d6 >= 5")
@@ -0,0 +1,122 @@
+import sqlite3
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from ttrpg_dice import d, diskcache, stats
+
+
+@pytest.fixture
+def cache(tmp_path, instrumented):  # noqa: ARG001
+    yield diskcache.enable(tmp_path / "dice.db")
+    diskcache.disable()
+
+
+def test_disabled_by_default():
+    assert diskcache.cache is None
+
+
+def test_store_and_load(cache):
+    assert (3 * d(7))[12] == pytest.approx(37 / 343)
+    assert len(cache) == 1
+    assert (3 * d(7))[12] == pytest.approx(37 / 343)
+    measurements = stats()
+    assert measurements["dice.build"] == 1
+    assert measurements["diskcache.miss"] == 1
+    assert measurements["diskcache.hit"] == 1
+
+
+def test_loaded_distribution_is_identical(cache):
+    pool = (2 * d(6)).explode() + d(20).reroll(1) + 2
+    expected = pool._core_counts()  # noqa: SLF001
+    cache.store(pool.contents, *expected)
+    assert cache.load(pool.contents) == expected
+    assert cache.load(((2 * d(6)).explode() + d(20) + 2).contents) is None
+
+
+@pytest.mark.parametrize("count", [0, 1, 255, 256, 2**40, 2**64, 2**200])
+def test_pack_widths(count):
+    assert diskcache.unpack_counts(*diskcache.pack_counts([0, count, 1])) == [0, count, 1]
+
+
+def test_eviction(tmp_path):
+    small = diskcache.DistributionCache(tmp_path / "dice.db", max_bytes=20)
+    small.store(d(6).contents, *d(6)._core_counts())  # noqa: SLF001
+    small.store(d(8).contents, *d(8)._core_counts())  # noqa: SLF001
+    assert small.load(d(6).contents) is not None  # d6 now used more recently than d8
+    small.store(d(10).contents, *d(10)._core_counts())  # noqa: SLF001
+    assert small.load(d(8).contents) is None
+    assert small.load(d(6).contents) is not None
+    assert small.load(d(10).contents) is not None
+
+
+def _used(path):
+    db = sqlite3.connect(path)
+    try:
+        return dict(db.execute("SELECT key, used FROM distributions"))
+    finally:
+        db.close()
+
+
+def test_loads_written_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(diskcache, "RECENCY_BATCH", 2)
+    path = tmp_path / "dice.db"
+    cache = diskcache.DistributionCache(path)
+    cache.store(d(6).contents, *d(6)._core_counts())  # noqa: SLF001
+    cache.store(d(8).contents, *d(8)._core_counts())  # noqa: SLF001
+    stored = _used(path)
+    assert cache.load(d(6).contents) is not None
+    assert _used(path) == stored
+    assert cache.load(d(8).contents) is not None
+    assert all(used > stored[key] for key, used in _used(path).items())
+
+
+@pytest.mark.parametrize("offset", [2**63, -(10**30)])
+def test_large_offset(cache, offset):
+    cache.store(d(7).contents, offset, [1] * 7)
+    assert cache.load(d(7).contents) == (offset, [1] * 7)
+
+
+def test_too_large_not_stored(tmp_path):
+    small = diskcache.DistributionCache(tmp_path / "dice.db", max_bytes=10)
+    small.store(d(100).contents, *d(100)._core_counts())  # noqa: SLF001
+    assert len(small) == 0
+
+
+def test_invalid_max_bytes(tmp_path):
+    with pytest.raises(ValueError, match="max_bytes must be a positive integer"):
+        diskcache.DistributionCache(tmp_path / "dice.db", max_bytes=0)
+
+
+def test_clear(cache):
+    _ = list(2 * d(7))
+    cache.clear()
+    assert len(cache) == 0
+
+
+def _calculate(path, numdice):
+    diskcache.enable(path)
+    return list(numdice * d(11))
+
+
+def test_shared_between_processes(tmp_path):
+    path = tmp_path / "dice.db"
+    with ProcessPoolExecutor(4) as pool:
+        results = list(pool.map(_calculate, [path] * 8, [5, 6, 7, 8] * 2))
+    assert results[:4] == results[4:]
+    assert len(diskcache.DistributionCache(path)) == 4
+
+
+def test_new_process_loads_from_disk(tmp_path):
+    path = tmp_path / "dice.db"
+    code = (
+        "from ttrpg_dice import d, diskcache, instrumentation, stats;"
+        f"diskcache.enable({str(path)!r}); instrumentation.enable(); _ = list(20 * d(20));"
+        "print(stats().get('dice.build', 0))"
+    )
+    first = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)  # noqa: S603
+    second = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)  # noqa: S603
+    assert first.stdout.strip() == "1"
+    assert second.stdout.strip() == "0"
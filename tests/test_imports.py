@@ -0,0 +1,12 @@
+import subprocess
+import sys
+
+import pytest  # noqa: F401, RUF100
+
+
+@pytest.mark.parametrize("module", ["asyncio", "matplotlib", "sqlite3", "tabulate2"])
+def test_not_imported_up_front(module):
+    """Importing ttrpg_dice and using Dice should not pay for importing plotting or formatting libraries."""
+    code = f"import sys, ttrpg_dice; _ = list(2 * ttrpg_dice.d(6)); assert {module!r} not in sys.modules"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=False)  # noqa: S603
+    assert result.returncode == 0, result.stderr
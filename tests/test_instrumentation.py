@@ -0,0 +1,87 @@
+import pytest
+
+from ttrpg_dice import LazyRollTable, PoolComparison, d, instrumentation, stats
+
+
+def test_disabled_by_default():
+    instrumentation.reset()
+    _ = list(2 * d(6))
+    assert stats() == {}
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_build():
+    _ = list(2 * d(7))
+    measurements = stats()
+    assert measurements["dice.build"] == 1
+    assert measurements["dice.build.seconds"] > 0
+    assert measurements["dice.combinations"] == 49
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_cache_hits():
+    dice = 2 * d(7)
+    _ = dice[2]
+    _ = dice[3]
+    _ = dice[4]
+    measurements = stats()
+    assert measurements["dice.cache_miss"] == 1
+    assert measurements["dice.cache_hit"] >= 2
+    assert measurements["dice.build"] == 1
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_convolution_terms():
+    _ = list(d(4) + d(6))
+    assert stats()["dice.convolution_terms"] == 4 * 6
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_parse():
+    _ = d.from_str("2d6 + 3")
+    measurements = stats()
+    assert measurements["dice.parse"] == 1
+    assert measurements["dice.validate"] == 1
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_tables():
+    _ = str(LazyRollTable(3, 100, 33))
+    _ = str(PoolComparison([d(4)], {"all": slice(None, None)}))
+    assert stats()["table.format"] == 2
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_hook():
+    measurements = []
+
+    def hook(name, value):
+        measurements.append((name, value))
+
+    instrumentation.add_hook(hook)
+    try:
+        _ = d.from_str("d6")
+    finally:
+        instrumentation.remove_hook(hook)
+    _ = d.from_str("d6")
+
+    names = [name for name, _ in measurements]
+    assert names.count("dice.parse") == 1
+    assert names.count("dice.parse.seconds") == 1
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_disable_keeps_stats():
+    _ = d.from_str("d6")
+    instrumentation.disable()
+    _ = d.from_str("d6")
+    assert stats()["dice.parse"] == 1
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_cache_hits_only_public():
+    dice = 2 * d(7)
+    _ = dice[2]
+    _ = dice.prob_gt(d(6))
+    _ = dice[3]
+    assert stats()["dice.cache_hit"] == 1
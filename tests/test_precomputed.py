@@ -0,0 +1,61 @@
+import pytest
+
+from ttrpg_dice import d, precomputed, stats
+
+
+def test_shipped_file_is_up_to_date():
+    shipped = (precomputed.resources.files("ttrpg_dice") / precomputed.FILENAME).read_bytes()
+    assert shipped == precomputed.build()
+
+
+@pytest.mark.parametrize(
+    "dice",
+    [
+        pytest.param(d(6), id="d6"),
+        pytest.param(3 * d(6), id="3d6"),
+        pytest.param(10 * d(20), id="10d20"),
+        pytest.param(5 * d(100), id="5d100"),
+    ],
+)
+def test_matches_calculated(dice):
+    assert precomputed.load(dice.contents) == dice._core_counts()  # noqa: SLF001
+
+
+def test_constant_added():
+    offset, counts = precomputed.load((2 * d(20) + 5).contents)
+    assert offset == 7
+    assert counts == (2 * d(20))._core_counts()[1]  # noqa: SLF001
+
+
+def test_not_precomputed():
+    assert precomputed.load((2 * d(7)).contents) is None
+    assert precomputed.load((11 * d(6)).contents) is None
+    assert precomputed.load((d(6) + d(8)).contents) is None
+    assert precomputed.load(d(6).explode().contents) is None
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_not_calculated():
+    assert (3 * d(6) + 2)[12] == pytest.approx(27 / 216)
+    measurements = stats()
+    assert "dice.build" not in measurements
+    assert measurements["precomputed.hit"] == 1
+
+
+@pytest.mark.usefixtures("instrumented")
+def test_disabled():
+    precomputed.disable()
+    try:
+        assert precomputed.load((3 * d(6)).contents) is None
+        assert (3 * d(6) + 2)[12] == pytest.approx(27 / 216)
+        assert stats()["dice.build"] == 1
+    finally:
+        precomputed.enable()
+    assert precomputed.load((3 * d(6)).contents) is not None
+
+
+def test_constant_subtracted():
+    offset, counts = precomputed.load((d(6) - 1).contents)
+    assert offset == 0
+    assert counts == [1] * 6
+    assert precomputed.load((d(6) - d(6)).contents) is None
@@ -124,6 +124,16 @@ def test_no_direct_instantiation_with_args():
         _ = StatBlock(WS=7)
 
 
+@pytest.mark.parametrize("roll", [d(6) - 3, d(6) - 1, d(4) - d(4)])
+def test_stats_cannot_roll_zero_or_less(roll):
+    msg = re.escape(f"Cannot use '{roll}' for `A`, stats must be rolled with Dice which cannot roll 0 or less.")
+    with pytest.raises(ValueError, match=msg):
+
+        @statblock
+        class Stats:
+            A = roll
+
+
 def test_subclass_has__STATS():
     @statblock
     class Combat:
@@ -281,7 +291,57 @@ def test_table():
 
     assert albert.as_table() == tabulate([[33,0]], headers=["WS","BS"], tablefmt="github")
 
+def test_caps_precomputed():
+    @statblock
+    class Combat:
+        WS = d(100)
+        W = d(20)
+
+    assert Combat._CAPS == (100, 20)  # noqa: SLF001
+
+
+def test_arithmetic_skips_reinit(monkeypatch):
+    @statblock
+    class Combat:
+        WS = d(100)
+
+    fighter = Combat(WS=41)
+
+    def _fail(*_args, **_kwargs):
+        pytest.fail("`__init__` should not be called for the result of arithmetic")
+
+    monkeypatch.setattr(Combat, "__init__", _fail)
+    assert (fighter + fighter).WS == 82
+    assert (fighter - fighter).WS == 0
+    assert (fighter | fighter).WS == 41
+
+
+def test_arithmetic_custom_pre_init():
+    @statblock
+    class Combat:
+        WS = d(100)
+
+        def _pre_init_(self, /, name="Anonymous", **kwargs):
+            self.name = name
+            return kwargs
+
+    knight = Combat(WS=41, name="Albert") + Combat(WS=10)
+    assert knight.WS == 51
+    assert knight.name == "Anonymous"
+
+
+@pytest.mark.parametrize("slots", [False, True])
+def test_arithmetic_with_mapping(slots):
+    @statblock(slots=slots)
+    class FullCombat:
+        WS = d(100)
+        BS = d(100)
+
+    fighter = FullCombat(WS=41, BS=20)
+    assert dict(fighter + {"WS": 10, "BS": 90}) == {"WS": 51, "BS": 100}
+    assert dict(fighter - {"WS": 50, "BS": 5}) == {"WS": 0, "BS": 15}
+    assert dict(fighter | {"WS": 30, "BS": 30}) == {"WS": 41, "BS": 30}
+
 # TODO: type-hinting instances (https://docs.python.org/3/library/typing.html#typing.get_type_hints)
-# TODO: Handle `@statblock()` usage
 # TODO: Maths where blocks have different stats
 # TODO: Make stats immutable and enable hash (allowing usage as a dict key)
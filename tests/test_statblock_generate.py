@@ -0,0 +1,65 @@
+from collections import Counter
+from random import Random
+
+import pytest
+
+from ttrpg_dice import StatBlockArray, d, statblock
+
+
+@statblock
+class Goblin:
+    WS = d(100)
+    W = 2 * d(4)
+
+
+def test_generate_list():
+    goblins = Goblin.generate(10, rng=1)
+    assert len(goblins) == 10
+    assert all(type(goblin) is Goblin for goblin in goblins)
+    assert all(1 <= goblin.WS <= 100 for goblin in goblins)
+    assert all(2 <= goblin.W <= 8 for goblin in goblins)
+
+
+def test_generate_array():
+    goblins = Goblin.generate(10, rng=1, as_array=True)
+    assert isinstance(goblins, StatBlockArray)
+    assert len(goblins) == 10
+
+
+def test_reproducible():
+    rng = Random(7)  # noqa: S311
+    assert Goblin.generate(100, rng=rng, as_array=True) == Goblin.generate(100, rng=7, as_array=True)
+
+
+def test_list_matches_array():
+    blocks = Goblin.generate(100, rng=3)
+    population = Goblin.generate(100, rng=3, as_array=True)
+    assert [dict(block) for block in blocks] == [dict(block) for block in population]
+
+
+def test_distribution():
+    n = 100_000
+    wounds = Counter(Goblin.generate(n, rng=11, as_array=True)["W"])
+    expected = 2 * d(4)
+    for result in range(1, 9):
+        assert wounds[result] / n == pytest.approx(expected[result], abs=0.01)
+
+
+def test_slots():
+    @statblock(slots=True)
+    class Orc:
+        WS = d(100)
+
+    orcs = Orc.generate(5, rng=1)
+    assert all(type(orc) is Orc for orc in orcs)
+
+
+def test_large_results():
+    @statblock
+    class Titan:
+        W = 2 * d(4) + 10**9
+
+    titans = Titan.generate(10, rng=1, as_array=True)
+    assert all(10**9 + 2 <= wounds <= 10**9 + 8 for wounds in titans["W"])
+    expected = [sum(Titan._STATS["W"][10**9 : wounds + 1]) for wounds in titans["W"]]  # noqa: SLF001
+    assert list(titans.success_matrix()["W"]) == pytest.approx(expected)
@@ -0,0 +1,113 @@
+import re
+
+import pytest
+
+from ttrpg_dice import StatBlock, d, statblock
+
+
+@statblock(slots=True)
+class Combat:
+    WS = d(100)
+    BS = d(100)
+    W = d(20)
+
+
+class Human(Combat):
+    WS = 33
+
+
+def test_no_dict():
+    fighter = Combat(WS=41)
+    assert not hasattr(fighter, "__dict__")
+    assert Combat.__slots__ == ("WS", "BS", "W")
+
+
+def test_instantiation():
+    fighter = Combat(WS=41)
+    assert fighter.WS == 41
+    assert fighter.BS == 0
+    assert isinstance(fighter, StatBlock)
+    assert type(fighter) is Combat
+
+
+def test_subclass_defaults():
+    albert = Human(BS=20)
+    assert dict(albert) == {"WS": 33, "BS": 20, "W": 0}
+
+
+def test_invalid_stat():
+    msg = re.escape("Invalid stat. Combat does not contain `M`.")
+    with pytest.raises(AttributeError, match=msg):
+        Combat(WS=33, M=4)
+
+
+def test_subscripting():
+    fighter = Combat(WS=41)
+    assert fighter["WS"] == 41
+    with pytest.raises(KeyError, match="Unknown stat 'M'"):
+        fighter["M"]
+
+
+def test_mapping():
+    fighter = Combat(WS=41, W=12)
+    assert len(fighter) == 3
+    assert list(fighter) == ["WS", "BS", "W"]
+    assert dict(fighter) == {"WS": 41, "BS": 0, "W": 12}
+
+
+@pytest.mark.parametrize(
+    ["operation", "expected"],
+    [
+        pytest.param("__add__", {"WS": 100, "BS": 15, "W": 20}, id="add"),
+        pytest.param("__sub__", {"WS": 0, "BS": 5, "W": 4}, id="sub"),
+        pytest.param("__or__", {"WS": 60, "BS": 10, "W": 12}, id="or"),
+    ],
+)
+def test_arithmetic(operation, expected):
+    fighter = Combat(WS=41, BS=10, W=12)
+    other = Combat(WS=60, BS=5, W=8)
+    result = getattr(fighter, operation)(other)
+    assert type(result) is Combat
+    assert dict(result) == expected
+
+
+def test_matches_unslotted():
+    @statblock
+    class Unslotted:
+        WS = d(100)
+        BS = d(100)
+        W = d(20)
+
+    stats = [{"WS": 41, "BS": 10, "W": 12}, {"WS": 60, "BS": 5, "W": 8}]
+    slotted = [Combat(**s) for s in stats]
+    unslotted = [Unslotted(**s) for s in stats]
+    for operation in ["__add__", "__sub__", "__or__"]:
+        assert dict(getattr(slotted[0], operation)(slotted[1])) == dict(
+            getattr(unslotted[0], operation)(unslotted[1]),
+        )
+    assert repr(slotted[0]) == repr(unslotted[0]).replace("Unslotted", "Combat")
+
+
+def test_extra_slots():
+    @statblock(slots=True)
+    class Named:
+        __slots__ = ("name",)
+        WS = d(100)
+
+        def _pre_init_(self, /, name, **kwargs):
+            self.name = name
+            return kwargs
+
+    albert = Named(name="Albert", WS=33)
+    assert albert.name == "Albert"
+    assert albert.WS == 33
+    assert not hasattr(albert, "__dict__")
+
+
+def test_parentheses_without_slots():
+    @statblock()
+    class Unslotted:
+        WS = d(100)
+
+    fighter = Unslotted(WS=41)
+    assert vars(fighter) == {"WS": 41}
@@ -0,0 +1,179 @@
+import re
+
+import pytest
+
+from ttrpg_dice import StatBlockArray, d, statblock
+
+
+@statblock
+class Combat:
+    WS = d(100)
+    BS = d(100)
+    W = d(20)
+
+
+class Goblin(Combat):
+    WS = 25
+
+
+def test_from_blocks():
+    population = StatBlockArray.from_blocks([Combat(WS=10, BS=20), Combat(WS=30, W=4)])
+    assert len(population) == 2
+    assert list(population["WS"]) == [10, 30]
+    assert list(population["BS"]) == [20, 0]
+    assert list(population["W"]) == [0, 4]
+
+
+def test_columns_are_typed_arrays():
+    population = StatBlockArray(Combat, WS=[10, 20])
+    assert population["WS"].typecode == StatBlockArray.TYPECODE
+
+
+def test_default_columns():
+    population = StatBlockArray(Goblin, BS=[10, 20, 30])
+    assert list(population["WS"]) == [25, 25, 25]
+    assert list(population["W"]) == [0, 0, 0]
+
+
+def test_getitem_block():
+    population = StatBlockArray(Combat, WS=[10, 20], BS=[30, 40], W=[1, 2])
+    block = population[1]
+    assert isinstance(block, Combat)
+    assert dict(block) == {"WS": 20, "BS": 40, "W": 2}
+    assert dict(population[-2]) == {"WS": 10, "BS": 30, "W": 1}
+
+
+def test_getitem_slice():
+    population = StatBlockArray(Combat, WS=[10, 20, 30])
+    assert population[1:] == StatBlockArray(Combat, WS=[20, 30])
+
+
+def test_iter():
+    blocks = [Combat(WS=10), Combat(WS=20)]
+    assert [dict(block) for block in StatBlockArray.from_blocks(blocks)] == [dict(block) for block in blocks]
+
+
+def test_unknown_stat():
+    with pytest.raises(KeyError, match="Unknown stat 'M'"):
+        StatBlockArray(Combat, WS=[10])["M"]
+
+
+def test_invalid_stat():
+    with pytest.raises(AttributeError, match=re.escape("Invalid stat. Combat does not contain `M`.")):
+        StatBlockArray(Combat, M=[4])
+
+
+def test_mismatched_lengths():
+    with pytest.raises(ValueError, match=re.escape("All stats must have the same number of values, `BS` has 1 not 2.")):
+        StatBlockArray(Combat, WS=[10, 20], BS=[10])
+
+
+def test_mixed_types():
+    with pytest.raises(TypeError, match=re.escape("All StatBlocks must be Combat, not Goblin.")):
+        StatBlockArray.from_blocks([Combat(), Goblin()])
+
+
+@pytest.mark.parametrize(
+    ["left", "right"],
+    [
+        pytest.param({"WS": 41, "BS": 10, "W": 12}, {"WS": 60, "BS": 5, "W": 12}, id="capped"),
+        pytest.param({"WS": 10, "BS": 0, "W": 3}, {"WS": 20, "BS": 0, "W": 2}, id="uncapped"),
+        pytest.param({"WS": 10, "BS": 50, "W": 3}, {"WS": 20, "BS": 5, "W": 5}, id="mixed"),
+    ],
+)
+@pytest.mark.parametrize("operation", ["__add__", "__sub__", "__or__"])
+def test_matches_statblock(left, right, operation):
+    blocks = [Combat(**left), Combat(**right)]
+    others = [Combat(**right), Combat(**left)]
+    population = getattr(StatBlockArray.from_blocks(blocks), operation)(StatBlockArray.from_blocks(others))
+    expected = [getattr(block, operation)(other) for block, other in zip(blocks, others)]  # noqa: B905
+    assert [dict(block) for block in population] == [dict(block) for block in expected]
+
+
+def test_broadcast_statblock():
+    population = StatBlockArray(Combat, WS=[10, 95], BS=[30, 5], W=[1, 2])
+    career = Combat(WS=10, BS=10, W=1)
+    assert population + career == StatBlockArray(Combat, WS=[20, 100], BS=[40, 15], W=[2, 3])
+    assert population - career == StatBlockArray(Combat, WS=[0, 85], BS=[20, 0], W=[0, 1])
+    assert population | career == StatBlockArray(Combat, WS=[10, 95], BS=[30, 10], W=[1, 2])
+
+
+def test_mismatched_populations():
+    msg = re.escape("Cannot combine populations of 2 and 1 StatBlocks.")
+    with pytest.raises(ValueError, match=msg):
+        StatBlockArray(Combat, WS=[10, 20]) + StatBlockArray(Combat, WS=[10])
+
+
+def test_large_population():
+    population = StatBlockArray(Combat, WS=range(100_000))
+    total = population + population
+    assert total["WS"][99_999] == 100
+    assert total["WS"][10] == 20
+
+
+def test_addition_uses_caps(monkeypatch):
+    population = StatBlockArray(Combat, WS=[90, 10], W=[15, 1])
+    monkeypatch.setattr(d, "__len__", lambda _: pytest.fail("caps recalculated"))
+    total = population + population
+    assert list(total["WS"]) == [100, 20]
+    assert list(total["W"]) == [20, 2]
+
+
+def test_success_matrix():
+    population = StatBlockArray(Combat, WS=[45, 0], BS=[100, 150], W=[10, 3])
+    chances = population.success_matrix()
+    assert list(chances) == ["WS", "BS", "W"]
+    assert list(chances["WS"]) == [0.45, 0.0]
+    assert list(chances["BS"]) == [1.0, 1.0]
+    assert list(chances["W"]) == [0.5, 0.15]
+
+
+def test_success_matrix_weighted():
+    @statblock
+    class Weighted:
+        W = 2 * d(6)
+
+    population = StatBlockArray(Weighted, W=range(13))
+    assert list(population.success_matrix()["W"]) == pytest.approx(
+        [sum((2 * d(6))[:target + 1]) if target else 0 for target in range(13)],
+    )
+
+
+def test_file_roundtrip(tmp_path):
+    population = StatBlockArray(Combat, WS=[10, 20, 30], BS=[40, 50, 60], W=[1, 2, 3])
+    population.to_file(tmp_path / "combat.sba")
+    loaded = StatBlockArray.from_file(tmp_path / "combat.sba", Combat)
+    assert loaded == population
+    assert loaded[1] == Combat(WS=20, BS=50, W=2)
+
+
+def test_file_is_memory_mapped(tmp_path):
+    StatBlockArray(Combat, WS=[10, 20]).to_file(tmp_path / "combat.sba")
+    loaded = StatBlockArray.from_file(tmp_path / "combat.sba", Combat)
+    assert isinstance(loaded["WS"], memoryview)
+    assert isinstance(loaded[:1]["WS"], memoryview)
+    assert list((loaded + loaded)["WS"]) == [20, 40]
+
+
+def test_file_without_blocktype(tmp_path):
+    StatBlockArray(Combat, WS=[10, 20], BS=[30, 40], W=[5, 6]).to_file(tmp_path / "combat.sba")
+    loaded = StatBlockArray.from_file(tmp_path / "combat.sba")
+    assert loaded.blocktype.__name__ == "Combat"
+    assert loaded.blocktype._STATS == Combat._STATS  # noqa: SLF001
+    assert dict(loaded[0]) == {"WS": 10, "BS": 30, "W": 5}
+
+
+def test_file_wrong_blocktype(tmp_path):
+    @statblock
+    class Other:
+        WS = d(100)
+
+    StatBlockArray(Combat, WS=[10]).to_file(tmp_path / "combat.sba")
+    with pytest.raises(TypeError, match="not Other"):
+        StatBlockArray.from_file(tmp_path / "combat.sba", Other)
+
+
+def test_file_not_statblockarray(tmp_path):
+    (tmp_path / "other.sba").write_bytes(b"not a statblockarray file")
+    with pytest.raises(ValueError, match="is not a StatBlockArray file"):
+        StatBlockArray.from_file(tmp_path / "other.sba")
@@ -1,5 +1,9 @@
 """Various functions for TTRPG Gamesmasters to help with dice rolls."""
 
+from . import diskcache, expression, instrumentation, precomputed
 from .dice import Dice as d  # noqa: N813
-from .manydice import LazyRollTable, PoolComparison, lazyroll
-from .statblock import StatBlock, statblock
+from .expression import CombinedDice
+from .instrumentation import stats
+from .manydice import LazyRollTable, PoolComparison, SuccessPool, lazyroll
+from .statblock import StatBlock, StatBlockArray, statblock
+from .transform import TransformedDice
@@ -2,12 +2,24 @@
 
 from __future__ import annotations
 
-from collections import defaultdict, deque
-from itertools import product, repeat
-from typing import TYPE_CHECKING, SupportsInt
+import operator
+import re
+import struct
+import sys
+from collections import defaultdict
+from functools import reduce
+from itertools import accumulate, repeat
+from math import ceil, inf, log, log10
+from threading import Event, Lock
+from typing import TYPE_CHECKING, ClassVar, SupportsInt
+
+from . import diskcache, instrumentation, precomputed
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Iterator
+    from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+    from concurrent.futures import Executor
+
+    from .transform import TransformedDice
 
 try:
     from typing import Self
@@ -26,25 +38,23 @@ class Dice:
             super().__init__(int, {faces: numdice for faces, numdice in tempdict.items() if numdice != 0})
             self._validate()
 
+        @instrumentation.timed("dice.validate")
         def _validate(self) -> None:
             """
             `Dice._probabilities()` is called lazily and will be very hard to debug if contents are not valid.
 
-            - `range(1,faces)` requires positive `int`
+            - `range(1,faces)` requires non-zero `int` (or a `ModifiedDie`, which validates itself), negative faces
+              are subtracted dice
             - `repeat(...,numdice)` requires postive `int`
             """
-            int_faces = {faces: isinstance(faces, int) for faces in self.keys()}
+            int_faces = {faces: isinstance(faces, (int, ModifiedDie)) for faces in self.keys()}
             if not all(int_faces.values()):
                 invalid = ", ".join(sorted(type(faces).__name__ for faces, isint in int_faces.items() if not isint))
-                msg = f"Number of faces must be a positive integer, not {invalid}"
+                msg = f"Number of faces must be a non-zero integer, not {invalid}"
                 raise TypeError(msg)
 
-            positive_faces = {faces: faces > 0 for faces in self.keys()}
-            if not all(positive_faces.values()):
-                invalid = ", ".join(
-                    str(faces) for faces, ispositive in sorted(positive_faces.items()) if not ispositive
-                )
-                msg = f"Number of faces must be a positive integer, not {invalid}"
+            if 0 in self:
+                msg = "Number of faces must be a non-zero integer, not 0"
                 raise ValueError(msg)
 
             int_numdice = {faces: isinstance(numdice, int) for faces, numdice in self.items()}
@@ -75,8 +85,44 @@ class Dice:
             """Hash contents as tuple of sorted (key, value) tuples."""
             return hash(tuple(sorted(self.items())))
 
+    EXPLODE_CUTOFF: ClassVar[float] = 1e-9
+    """Default probability below which exploding dice stop exploding, see `Dice.explode()`."""
+
+    executor: ClassVar[Executor | None] = None
+    """Executor used by `Dice.aprobabilities()`, `None` uses the event loop's default executor."""
+
+    max_bytes: ClassVar[int | None] = None
+    """
+    Approximate memory budget for calculating a single distribution, `None` for no limit. Can also be set on one `Dice`.
+
+    Distributions which would not fit raise `DistributionTooLargeError` before anything is calculated. Large
+    distributions whose fastest calculation would not fit are calculated in chunks instead. This needs little more
+    memory than the result, but takes longer the tighter the budget: `100 * d(100)` takes about 6 seconds within
+    4MB, rather than 0.2 seconds using 5MB, and around 20 seconds within 2.6MB.
+    """
+
+    _building: ClassVar[dict[Hashable, _Build]] = {}
+    """`(_key, max_bytes)`: distribution currently being calculated by `_shared_counts()`, in any thread"""
+    _buildinglock: ClassVar[Lock] = Lock()
+
+    _inflight: ClassVar[dict] = {}
+    """`(event loop, _key, max_bytes)`: future for a distribution currently being calculated by `aprobabilities()`"""
+
+    OPPOSED_CACHE_SIZE: ClassVar[int] = 4096
+    """Number of opposed rolls to remember, see `Dice.prob_gt()`."""
+
+    _opposedcache: ClassVar[dict[tuple[Hashable, Hashable, int], int]] = {}
+    """`(_key, other _key, k)`: number of ways for `_key` to roll less than `other _key` + `k`"""
+    _opposedlock: ClassVar[Lock] = Lock()
+
     def __init__(self, faces: int) -> None:
         """Build a die with `faces` sides."""
+        if not isinstance(faces, (int, ModifiedDie)):
+            msg = f"Number of faces must be a positive integer, not {type(faces).__name__}"
+            raise TypeError(msg)
+        if isinstance(faces, int) and faces < 1:
+            msg = f"Number of faces must be a positive integer, not {faces}"
+            raise ValueError(msg)
         self.contents = self._Contents({faces: 1})
 
     @property
@@ -84,19 +130,252 @@ class Dice:
         """
         Use Dice[index] to get the probability(-ies) of a given (set of) roll(s) NOT _probabilities.
 
-        If for some reason you MUST access the underlying probabilities list use this property and not
-        Dice._probabilitycache which is created lazily on the first call to this method.
+        Returns a list of P(result) with _probabilities[0] = `None`. This is built on every call from `_core`, which
+        does not store the zeros for impossible results below the lowest possible roll, so is not used internally:
+        `d(4) + 10**10` would need ten billion zeros. For `Dice` which can roll `0` or less, _probabilities[1] is
+        P(lowest possible result) and so on.
+        """
+        core = self._core
+        return [None] + [0.0] * (self._offset - self._lowest) + core
 
-        Returns a list of P(result) with _probabilities[0] = `None`.
+    @property
+    def _core(self) -> list[float]:
+        """
+        P(result) for each result from the lowest possible (`self._offset`) to the highest.
+
+        Created lazily on first access as `Dice._probabilitycache`, along with `Dice._offset` and `Dice._countcache`,
+        so that e.g. `d(4) + 1000` stores only four probabilities.
         """
         try:
-            return self._probabilitycache  # pytype: disable=attribute-error
+            probabilities = self._probabilitycache  # pytype: disable=attribute-error
         except AttributeError:
-            all_possible_rolls = [sum(r) for r in product(*self._individual_dice_rolls())]
-            ways_to_roll = {roll: all_possible_rolls.count(roll) for roll in range(1, max(all_possible_rolls) + 1)}
-            number_possible_rolls = len(all_possible_rolls)
-            self._probabilitycache = [None] + [n / number_possible_rolls for _, n in sorted(ways_to_roll.items())]
+            number_possible_rolls = self._set_counts(*self._shared_counts())
+            if instrumentation.enabled:
+                instrumentation.record("dice.cache_miss")
+                instrumentation.record("dice.combinations", number_possible_rolls)
             return self._probabilitycache
+        return probabilities
+
+    def _lookup(self) -> list[float]:
+        """`_core` for public entry points such as `Dice[index]`, recording a cache hit if already calculated."""
+        if instrumentation.enabled and hasattr(self, "_probabilitycache"):
+            instrumentation.record("dice.cache_hit")
+        return self._core
+
+    @property
+    def _cumulative(self) -> list[float]:
+        """
+        P(roll <= result) for each result from the lowest possible (`self._offset`) to the highest, as for `_core`.
+
+        Created lazily on first access and cached. Calculated from the exact number of ways to roll each result, so
+        that rounding errors do not accumulate.
+        """
+        try:
+            return self._cumulativecache  # pytype: disable=attribute-error
+        except AttributeError:
+            ways_to_roll = self._cumulative_counts
+            number_possible_rolls = ways_to_roll[-1]
+            self._cumulativecache = [n / number_possible_rolls for n in ways_to_roll]
+            return self._cumulativecache
+
+    def _at_most(self, result: int) -> float:
+        """P(roll <= result), for any `result`."""
+        cumulative = self._cumulative
+        if result < self._offset:
+            return 0.0
+        return cumulative[min(result - self._offset, len(cumulative) - 1)]
+
+    @property
+    def _cumulative_counts(self) -> list[int]:
+        """Number of ways to roll each result or lower, from the lowest possible result (`self._offset`) upwards."""
+        try:
+            return self._cumulativecountcache  # pytype: disable=attribute-error
+        except AttributeError:
+            _ = self._core  # Ensure self._countcache exists
+            self._cumulativecountcache = list(accumulate(self._countcache))
+            return self._cumulativecountcache
+
+    async def aprobabilities(self) -> list[float]:
+        """
+        Calculate the probabilities in `Dice.executor`, without blocking the event loop.
+
+        Returns the probabilities starting with P(1), as for `list(dice)`. Afterwards the `Dice` can be indexed
+        without any further calculation. Concurrent calls for `Dice` with the same contents share one calculation.
+
+        Example:
+            ```
+            >>> import asyncio
+            >>> from ttrpg_dice import d
+            >>> asyncio.run((2 * d(2)).aprobabilities())
+            [0.0, 0.25, 0.5, 0.25]
+            ```
+        """
+        import asyncio  # noqa: PLC0415 - Deferred import: slow and only needed for async use
+
+        if not hasattr(self, "_probabilitycache"):
+            loop = asyncio.get_running_loop()
+            key = (loop, self._key, self.max_bytes)
+            future = self._inflight.get(key)
+            if future is None:
+                future = loop.run_in_executor(self.executor, self._shared_counts)
+                self._inflight[key] = future
+                future.add_done_callback(lambda _: self._inflight.pop(key, None))
+            elif instrumentation.enabled:
+                instrumentation.record("dice.coalesced")
+            offset, ways_to_roll = await asyncio.shield(future)  # Cancelling one caller must not cancel the others
+            if not hasattr(self, "_probabilitycache"):
+                self._set_counts(offset, ways_to_roll)
+        return list(self)
+
+    @classmethod
+    def compute_many(cls, dice: Iterable[Dice], threads: int | None = None) -> list[Dice]:
+        """
+        Calculate the probabilities of many `Dice` at once, using a pool of `threads` threads.
+
+        On free-threaded Python (e.g. `python3.13t`) the calculations run in parallel across cores; with the GIL
+        they are still safe but take about as long as calculating each in turn. `threads=None` uses the default size
+        of a `ThreadPoolExecutor`, `threads=1` calculates each in turn in the current thread.
+
+        Returns the `Dice`, which can then be indexed without any further calculation.
+
+        Example:
+            ```
+            >>> from ttrpg_dice import d
+            >>> pools = d.compute_many([n * d(6) for n in range(1, 5)], threads=2)
+            >>> pools[2][10]
+            0.125
+            ```
+        """
+        dice = list(dice)
+        if threads == 1:
+            for die in dice:
+                _ = die._core  # noqa: SLF001
+            return dice
+
+        from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415 - Deferred import: slow and rarely needed
+
+        with ThreadPoolExecutor(threads) as pool:
+            for _ in pool.map(lambda die: die._core, dice):  # noqa: SLF001
+                pass  # Raise any exception
+        return dice
+
+    def _counts(self) -> list[int]:
+        """
+        Number of ways to roll each result, indexed by result (so `_counts()[0]` is always `0`).
+
+        Example:
+            ```
+            >>> from ttrpg_dice import d
+            >>> (2 * d(3))._counts()
+            [0, 0, 1, 2, 3, 2, 1]
+            ```
+        """
+        offset, ways_to_roll = self._core_counts()
+        return [0] * offset + ways_to_roll
+
+    @instrumentation.timed("dice.build")
+    def _core_counts(self) -> tuple[int, list[int]]:
+        """
+        `(lowest possible result, number of ways to roll each result from there upwards)`.
+
+        Built by convolving the counts for each individual die, rather than enumerating every possible combination
+        of rolls. Only the possible results of each die are convolved, the lowest results are simply added, so
+        constants cost nothing and `d(4) + 1000` is as quick to calculate as `d(4)`.
+
+        Example:
+            ```
+            >>> from ttrpg_dice import d
+            >>> (2 * d(3) + 10)._core_counts()
+            (12, [1, 2, 3, 2, 1])
+            ```
+        """
+        offset = 0
+        groups = []
+        for faces, numdice in self.contents.items():
+            die_offset, die_counts = self._die_counts(faces)
+            offset += die_offset * numdice
+            if len(die_counts) > 1:
+                groups.append((die_counts, numdice))
+        return offset, _convolve_all(groups, self.max_bytes)
+
+    def _set_counts(self, offset: int, ways_to_roll: list[int]) -> int:
+        """Fill `_offset`, `_countcache` & `_probabilitycache`, returning the number of possible rolls."""
+        number_possible_rolls = sum(ways_to_roll)
+        self._lognumberpossiblerolls = log(number_possible_rolls)
+        self._offset = offset
+        self._countcache = ways_to_roll
+        self._probabilitycache = [n / number_possible_rolls for n in ways_to_roll]
+        return number_possible_rolls
+
+    @property
+    def _key(self) -> Hashable:
+        """Identifies the distribution in caches shared between `Dice`: the contents."""
+        return self.contents
+
+    def _shared_counts(self) -> tuple[int, list[int]]:
+        """
+        `_cached_counts()`, calculated only once when several threads ask for the same contents at the same time.
+
+        The first thread calculates the distribution, the others wait for its result (or exception). Only `Dice` with
+        the same `max_bytes` share a calculation, as others could succeed (or fail) where it does not.
+        """
+        key = (self._key, self.max_bytes)
+        with self._buildinglock:
+            build = self._building.get(key)
+            first = build is None
+            if first:
+                build = self._building[key] = _Build()
+        if not first:
+            if instrumentation.enabled:
+                instrumentation.record("dice.coalesced")
+            return build.wait()
+        try:
+            build.result = self._cached_counts()
+        except BaseException as e:
+            build.exception = e
+            raise
+        finally:
+            with self._buildinglock:
+                del self._building[key]
+            build.done.set()
+        return build.result
+
+    def _cached_counts(self) -> tuple[int, list[int]]:
+        """
+        `_core_counts()`, loaded if possible from the distributions shipped with the package or the disk cache.
+
+        Distributions calculated while the disk cache is enabled are also stored there.
+        See `ttrpg_dice.precomputed` and `ttrpg_dice.diskcache`.
+        """
+        stored = precomputed.load(self.contents)
+        if stored is not None:
+            return stored
+        cache = diskcache.cache
+        if cache is None:
+            return self._core_counts()
+        stored = cache.load(self.contents)
+        if stored is not None:
+            return stored
+        offset, ways_to_roll = self._core_counts()
+        cache.store(self.contents, offset, ways_to_roll)
+        return offset, ways_to_roll
+
+    @staticmethod
+    def _die_counts(faces: int | ModifiedDie) -> tuple[int, list[int]]:
+        """
+        `(lowest possible result, number of ways to roll each result from there upwards)` for a single die.
+
+        A subtracted die (negative `faces`) has the reversed distribution of the die, below zero.
+        """
+        if faces < 0:
+            offset, ways_to_roll = Dice._die_counts(-faces)
+            return -(offset + len(ways_to_roll) - 1), ways_to_roll[::-1]
+        try:
+            ways_to_roll = faces._counts()  # noqa: SLF001 # pytype: disable=attribute-error
+        except AttributeError:
+            return 1, [1] * faces
+        offset = next(result for result, count in enumerate(ways_to_roll) if count)
+        return offset, ways_to_roll[offset:]
 
     @_probabilities.setter
     def _probabilities(self, _: None) -> None:
@@ -106,11 +385,14 @@ class Dice:
     @property
     def weighted(self) -> bool:
         """Is this Dice weighted, or are all results equally likely?"""
-        return min(self) != max(self)
+        core = self._core
+        return self._offset > 1 or min(core) != max(core)  # Results from 1 up to the offset are impossible
 
     def __iter__(self) -> Iterator:
-        """Iterating over a Dice yields the probabilities starting with P(1)."""
-        yield from self._probabilities[1:]
+        """Iterating over a Dice yields the probabilities starting with P(1), or the lowest possible result if lower."""
+        core = self._lookup()
+        yield from repeat(0.0, self._offset - self._lowest)
+        yield from core
 
     def __getitem__(self, index: int | slice) -> float | list[float] | None:
         """
@@ -119,6 +401,11 @@ class Dice:
         This handles the fact that dice faces are numbered from 1, not 0. Slicing with a step > 1 will
         return the probabilities of results beginning with the given step, not beginning with 1.
 
+        Indices of `0` or more are results, negative indices count back from the highest result, as for a list. The
+        same applies to every `Dice`, including those which can roll `0` or less (e.g. `d(20) - d(20)`), whose
+        results of `0` or less come first in `list(dice)` and in slices: `dice[0]` is P(0), `dice[:0]` is the
+        probabilities of results below zero and `dice[-1]` is P(highest result).
+
         Example:
             ```
             >>> from ttrpg_dice import d
@@ -137,62 +424,328 @@ class Dice:
 
             >>> dice[1::2] # odds
             [0.0, 0.5]
+
+            >>> opposed = d(4) - d(4)
+            >>> opposed[0]
+            0.25
+            >>> opposed[:0]  # Results below zero
+            [0.0625, 0.125, 0.1875]
+            >>> opposed[-1]  # Highest result
+            0.0625
             ```
         """
-        if index == 0 or index == -(len(self) + 1):
-            raise DiceIndexError(self)
+        _ = self._lookup()
+        results = self._results(index)
+        if isinstance(results, range):
+            return self._slice(results)
+        return self._probability(results)
 
-        try:
-            # pytype: disable=attribute-error
-            if index.step is None or index.step > 0:  # Positive step
-                if index.start is None:
-                    index = slice(1 if index.step is None else index.step, index.stop, index.step)
-                elif index.start == 0:  # To avoid possible confusion by slicing [0:]
-                    raise DiceIndexError(self)
-            else:  # Negative Step  # noqa: PLR5501
-                if index.stop is None:
-                    index = slice(index.start, 0, index.step)
-            # pytype: enable=attribute-error
-        except AttributeError:
-            pass
+    def _slice(self, results: range) -> list[float | None]:
+        """
+        P(result) for each of `results`, or `None` for results below `self._lowest`.
+
+        Slices `_core` in one go, adding any zeros for impossible results below the lowest possible result.
+        """
+        core = self._core
+        offset, lowest, step = self._offset, self._lowest, results.step
+        if step > 0:
+            nones = len(range(results.start, min(results.stop, lowest), step))
+            zeros = len(range(results.start, min(results.stop, offset), step)) - nones
+            possible = results[nones + zeros :]
+            start, stop = possible.start - offset, possible.stop - offset
+            return [None] * nones + [0.0] * zeros + (core[start:stop:step] if possible else [])
+        possible = results[: len(range(results.start, max(results.stop, offset - 1), step))]
+        impossible = results[len(possible) :]
+        nones = len(impossible) - len(range(impossible.start, max(impossible.stop, lowest - 1), step))
+        start, stop = possible.start - offset, possible.stop - offset
+        probabilities = core[start : stop if stop >= 0 else None : step] if possible else []
+        return probabilities + [0.0] * (len(impossible) - nones) + [None] * nones
+
+    def _results(self, index: int | slice) -> int | range:
+        """
+        The result, or range of results, given by `index`.
+
+        Indices of `0` or more are results, negative indices count back from the highest result, as for
+        `list(dice)`. Slices are clamped to the results from `0` (or the lowest possible result, if lower) to the
+        highest, as for a list of probabilities indexed by result, so ranges may include the impossible result `0`.
+        """
+        core = self._core
+        lowest, highest = self._lowest, self._offset + len(core) - 1
+        if isinstance(index, slice):
+            return self._slice_results(index, lowest, highest)
 
         try:
-            return self._probabilities[index]
+            result = operator.index(index)
         except TypeError as e:
             msg = f"Cannot index '{type(self).__name__}' with '{type(index).__name__}'."
             raise TypeError(msg) from e
-        except IndexError as e:
-            raise DiceIndexError(self) from e
+        if result < 0:
+            result += highest + 1
+        if not lowest <= result <= highest:
+            raise DiceIndexError(self)
+        return result
+
+    def _slice_results(self, index: slice, lowest: int, highest: int) -> range:
+        """`_results()` for a slice, with negative start or stop counting back from the highest result."""
+        start, stop = (
+            bound if bound is None or bound >= 0 else bound + highest + 1 for bound in (index.start, index.stop)
+        )
+        step = 1 if index.step is None else index.step
+        if step > 0:
+            if start is None:
+                start = lowest + -lowest % step  # First multiple of step, e.g. [::2] gives the even results
+            elif index.start == 0 and lowest > 0:  # To avoid possible confusion by slicing [0:]
+                raise DiceIndexError(self)
+            start = max(start, min(lowest, 0))
+            stop = highest + 1 if stop is None else min(stop, highest + 1)
+        else:
+            start = highest if start is None else min(start, highest)
+            stop = lowest - 1 if stop is None else max(stop, min(lowest, 0) - 1)
+        return range(start, stop, step)
+
+    @property
+    def _lowest(self) -> int:
+        """
+        Lowest result which can be indexed: `1`, or the lowest possible result if that is `0` or less.
+
+        Only available once the distribution has been calculated.
+        """
+        return min(self._offset, 1)
+
+    def _probability(self, result: int) -> float:
+        """P(result) for a `result` between `self._lowest` and the highest possible result."""
+        core = self._core
+        return core[result - self._offset] if result >= self._offset else 0.0
+
+    def _count(self, result: int) -> int:
+        """Number of ways to roll `result`, for a `result` between `self._lowest` and the highest possible result."""
+        _ = self._core  # Ensure self._countcache exists
+        return self._countcache[result - self._offset] if result >= self._offset else 0
+
+    @property
+    def log(self) -> LogProbabilities:
+        """
+        Natural logarithms of the probabilities, indexed and sliced in the same way as the `Dice`.
+
+        Calculated from the exact number of ways to roll each result, so that the probabilities of extremely unlikely
+        results in huge pools are still accurate, rather than rounding to `0.0`. Use `dice.log.sum(index)` for the
+        logarithm of the chance of rolling any of several results.
+
+        Example:
+            ```
+            >>> from ttrpg_dice import d
+            >>> dice = 300 * d(20)
+            >>> dice[300]
+            0.0
+            >>> round(dice.log[300], 2)
+            -898.72
+            >>> round(dice.log.sum(slice(5500, None)), 2)
+            -373.03
+            ```
+        """
+        return LogProbabilities(self)
+
+    def map(self, function: Callable[[int], int] | Mapping[int, int]) -> TransformedDice:
+        """
+        Each result becomes `function(result)`, or `function[result]` for a mapping such as a damage table.
+
+        Transformations are lazy: chains such as `(2 * d(6) + 3).clamp(1, 12).map(damage)` are only calculated when
+        first needed, in a single pass over the original results. See `ttrpg_dice.transform`.
+
+        Example:
+            ```
+            >>> from ttrpg_dice import d
+            >>> halved = (2 * d(6)).map(lambda result: result // 2)
+            >>> halved[6]
+            0.027777777777777776
+            ```
+        """
+        return self._transformed(("map", function))
+
+    def clamp(self, lowest: int | None = None, highest: int | None = None) -> TransformedDice:
+        """
+        Results below `lowest` count as `lowest`, and those above `highest` as `highest`, see `Dice.map()`.
+
+        Example:
+            ```
+            >>> from ttrpg_dice import d
+            >>> (d(20) + 5).clamp(highest=20)[20]
+            0.3
+            ```
+        """
+        return self._transformed(("clamp", (lowest, highest)))
+
+    def given(self, condition: Callable[[int], bool]) -> TransformedDice:
+        """
+        The distribution of results for which `condition(result)` is true, see `Dice.map()`.
+
+        Example:
+            ```
+            >>> from ttrpg_dice import d
+            >>> hit = d(20).given(lambda result: result >= 11)
+            >>> hit[20]
+            0.1
+            ```
+        """
+        return self._transformed(("given", condition))
+
+    def threshold(self, table: Mapping[int, int]) -> TransformedDice:
+        """
+        Each result becomes the value for the highest threshold it reaches in `table`, or `0` if it reaches none.
+
+        See `Dice.map()`.
+
+        Example:
+            ```
+            >>> from ttrpg_dice import d
+            >>> degrees = d(20).threshold({10: 1, 15: 2, 20: 3})
+            >>> degrees[:]
+            [0.45, 0.25, 0.25, 0.05]
+            ```
+        """
+        return self._transformed(("threshold", table))
+
+    def _transformed(self, step: tuple[str, object]) -> TransformedDice:
+        """A lazy `TransformedDice` applying `step` to this `Dice`."""
+        from .transform import TransformedDice  # noqa: PLC0415 - transform uses this module
+
+        return TransformedDice(self, (step,))
+
+    def _combined(self, other: Dice) -> Dice:
+        """Sum of independent rolls of this and `other`, when either is a `DiceExpression`."""
+        from .expression import CombinedDice  # noqa: PLC0415 - expression uses this module
+
+        return CombinedDice.of([(self, 1), (other, 1)])
+
+    def _children(self) -> tuple[Dice, ...]:
+        """`Dice` whose distributions this distribution is calculated from, see `ttrpg_dice.expression`."""
+        return ()
+
+    def prob_gt(self, other: Dice | SupportsInt, k: int = 0) -> float:
+        """
+        P(this roll > `other` + `k`), for two independent rolls, e.g. an attack beating a defence by more than `k`.
+
+        `other` may also be a number. Calculated exactly from the cumulative number of ways to roll each result, in
+        time proportional to the number of possible results of each `Dice`, rather than comparing every pair of
+        results. Results for pairs of `Dice` compared before are remembered (up to `Dice.OPPOSED_CACHE_SIZE`).
+
+        Example:
+            ```
+            >>> from ttrpg_dice import d
+            >>> d(20).prob_gt(d(20))
+            0.475
+            >>> (d(20) + 2).prob_ge(d(20), 5)
+            0.3825
+            >>> d(6).prob_eq(d(6))
+            0.16666666666666666
+            ```
+        """
+        other = self._opponent(other)
+        return (self._total_opposed(other) - self._opposed_below(other, k + 1)) / self._total_opposed(other)
+
+    def prob_ge(self, other: Dice | SupportsInt, k: int = 0) -> float:
+        """P(this roll >= `other` + `k`), see `Dice.prob_gt()`."""
+        other = self._opponent(other)
+        return (self._total_opposed(other) - self._opposed_below(other, k)) / self._total_opposed(other)
+
+    def prob_lt(self, other: Dice | SupportsInt, k: int = 0) -> float:
+        """P(this roll < `other` + `k`), see `Dice.prob_gt()`."""
+        other = self._opponent(other)
+        return self._opposed_below(other, k) / self._total_opposed(other)
+
+    def prob_le(self, other: Dice | SupportsInt, k: int = 0) -> float:
+        """P(this roll <= `other` + `k`), see `Dice.prob_gt()`."""
+        other = self._opponent(other)
+        return self._opposed_below(other, k + 1) / self._total_opposed(other)
+
+    def prob_eq(self, other: Dice | SupportsInt, k: int = 0) -> float:
+        """P(this roll == `other` + `k`), see `Dice.prob_gt()`."""
+        other = self._opponent(other)
+        return (self._opposed_below(other, k + 1) - self._opposed_below(other, k)) / self._total_opposed(other)
+
+    def _opponent(self, other: Dice | SupportsInt) -> Dice:
+        """`other` as a `Dice`, numbers become constants."""
+        if isinstance(other, Dice):
+            return other
+        return Dice.from_contents(self._constant(self._int(other, "compare", "with")))
+
+    def _total_opposed(self, other: Dice) -> int:
+        """Number of possible combinations of rolling `self` and `other`."""
+        return self._cumulative_counts[-1] * other._cumulative_counts[-1]
+
+    def _opposed_below(self, other: Dice, k: int) -> int:
+        """
+        Number of ways for `self` to roll less than `other` + `k`, counted over every combination of both rolls.
+
+        For each result of `other`, the number of ways for `self` to roll less than `result + k` is read from
+        `self._cumulative_counts`, so this takes one pass over each distribution. Remembered in `Dice._opposedcache`.
+        """
+        key = (self._key, other._key, k)
+        with self._opposedlock:
+            ways = self._opposedcache.pop(key, None)
+            if ways is not None:
+                self._opposedcache[key] = ways  # Most recently used
+        if ways is not None:
+            if instrumentation.enabled:
+                instrumentation.record("dice.opposed_cache_hit")
+            return ways
+
+        if instrumentation.enabled:
+            instrumentation.record("dice.opposed")
+        cumulative = self._cumulative_counts
+        highest = len(cumulative) - 1
+        # self rolls < other + k <=> self <= other + k - 1 <=> cumulative[other + k - 1 - self._offset]
+        shift = k - 1 - self._offset
+        _ = other._core  # Ensure other._countcache exists
+        ways = sum(
+            count * cumulative[min(index, highest)]
+            for index, count in enumerate(other._countcache, shift + other._offset)
+            if index >= 0
+        )
+        with self._opposedlock:
+            self._opposedcache[key] = ways
+            while len(self._opposedcache) > self.OPPOSED_CACHE_SIZE:
+                del self._opposedcache[next(iter(self._opposedcache))]  # Least recently used
+        return ways
 
     def __eq__(self, value: object) -> bool:
         """Dice are equal if they give the same probabilities, even with different contents."""
         try:
-            return self._probabilities == value._probabilities  # pytype: disable=attribute-error
+            core = value._core  # pytype: disable=attribute-error
         except AttributeError:
             return False
+        return self._core == core and self._offset == value._offset  # pytype: disable=attribute-error
 
     def __hash__(self) -> int:
         """Use contents for hashing - but NOT equality."""
-        return hash(self.contents)
+        return hash(self._key)
 
     def __len__(self) -> int:
-        """Number of faces."""
-        return len(self._probabilities) - 1
+        """Number of faces, counting from 1 or from the lowest possible result if that is `0` or less."""
+        core = self._core
+        return self._offset + len(core) - self._lowest
 
     def __str__(self) -> str:
-        """The type of Dice in NdX notation."""
-        sortedcontents = deque(sorted(self.contents.items()))
+        """The type of Dice in NdX notation, subtracted dice after those added (`"2d6 - d4 - 1"`)."""
 
-        # Place any constant at the end ("d4 + 2" not "2 + d4")
-        if sortedcontents[0][0] == 1:
-            sortedcontents.rotate(-1)
+        def _order(entry: tuple[int | ModifiedDie, int]) -> tuple:
+            # Place any constant at the end ("d4 + 2" not "2 + d4")
+            faces, _ = entry
+            return (faces in {1, -1}, faces < 0, _sortkey(-faces if faces < 0 else faces))
 
         def _ndx(n: int, x: int) -> str:
             if x == 1:
                 return str(n)
             return f"{n if n > 1 else ''}d{x}"
 
-        return " + ".join(_ndx(n, x) for x, n in sortedcontents)
+        description = ""
+        for faces, numdice in sorted(self.contents.items(), key=_order):
+            term = _ndx(numdice, -faces if faces < 0 else faces)
+            if faces < 0:
+                description = f"{description} - {term}" if description else f"-{term}"
+            else:
+                description = f"{description} + {term}" if description else term
+        return description
 
     def __repr__(self) -> str:
         """Classname: ndX (contents)."""
@@ -204,8 +757,10 @@ class Dice:
     # pytype: disable=invalid-annotation
 
     def __rmul__(self, other: SupportsInt) -> Self:
-        """2 * Dice(4) returns a Dice with probabilities for 2d4."""
+        """2 * Dice(4) returns a Dice with probabilities for 2d4, -2 * Dice(4) subtracts 2d4."""
         other = self._int(other, "multiply", "by")
+        if other < 0:
+            return -other * -self
         return self.from_contents({f: n * other for f, n in self.contents.items()})
 
     def __add__(self, other: Self | SupportsInt) -> Self:
@@ -213,13 +768,95 @@ class Dice:
         try:
             othercontents = other.contents  # pytype: disable=attribute-error
         except AttributeError:
-            othercontents = defaultdict(int, {1: self._int(other, "add", "and")})
+            if isinstance(other, Dice):  # e.g. TransformedDice, see `ttrpg_dice.expression`
+                return self._combined(other)
+            othercontents = defaultdict(int, self._constant(self._int(other, "add", "and")))
 
         contents = {
             face: self.contents[face] + othercontents[face] for face in set(self.contents.keys() | othercontents.keys())
         }
+        return self.from_contents(self._net_constant(contents))
 
-        return self.from_contents(contents)
+    def __neg__(self) -> Self:
+        """-Dice(4) subtracts a d4, and so rolls from -4 to -1."""
+        return self.from_contents({-faces: numdice for faces, numdice in self.contents.items()})
+
+    def __sub__(self, other: Self | SupportsInt) -> Self:
+        """
+        Subtracting Dice gives the difference between two independent rolls, e.g. for opposed rolls.
+
+        Example:
+            ```
+            >>> from ttrpg_dice import d
+            >>> str(2 * d(6) - d(4) - 1)
+            '2d6 - d4 - 1'
+            >>> (d(20) - d(20))[0]
+            0.05
+            ```
+        """
+        if isinstance(other, Dice):
+            return self + -other
+        return self + -self._int(other, "subtract", "from")
+
+    def __rsub__(self, other: SupportsInt) -> Self:
+        """10 - Dice(4) gives results from 6 to 9."""
+        return -self + self._int(other, "subtract", "from")
+
+    @staticmethod
+    def _constant(value: int) -> dict[int, int]:
+        """Contents for a constant: `{1: value}`, or `{-1: -value}` to subtract."""
+        return {1: value} if value >= 0 else {-1: -value}
+
+    @classmethod
+    def _net_constant(cls, contents: dict) -> dict:
+        """Combine any added (`1`) and subtracted (`-1`) constants in `contents` into one."""
+        if contents.get(1) and contents.get(-1):
+            contents.update(cls._constant(contents.pop(1) - contents.pop(-1)))
+        return contents
+
+    def explode(self, cutoff: float | None = None) -> Self:
+        """
+        Each die (but not any constant) explodes: on its highest face it is rolled again and the new roll added.
+
+        Exploding dice can, in theory, roll infinitely high. Each die explodes at most as many times as it takes for
+        the chance of getting that far to drop below `cutoff` (default: `Dice.EXPLODE_CUTOFF`). The final roll then
+        counts as normal. This keeps the distribution finite while ignoring only vanishingly unlikely results.
+
+        Example:
+            ```
+            >>> from ttrpg_dice import d
+            >>> str(d(6).explode())
+            'd6!'
+            >>> d(6).explode()[6]
+            0.0
+            >>> round(d(6).explode()[7], 6)
+            0.027778
+            ```
+        """
+        cutoff = self.EXPLODE_CUTOFF if cutoff is None else cutoff
+        if not 0 < cutoff < 1:
+            msg = f"Cutoff must be a probability between 0 and 1, not {cutoff}"
+            raise ValueError(msg)
+        return self.from_contents(
+            {ModifiedDie.modify(faces, cutoff=cutoff): numdice for faces, numdice in self.contents.items()},
+        )
+
+    def reroll(self, *rerolls: int) -> Self:
+        """
+        Each die (but not any constant) is rerolled whenever it shows one of the `rerolls` faces.
+
+        Example:
+            ```
+            >>> from ttrpg_dice import d
+            >>> str(d(20).reroll(1))
+            'd20r1'
+            >>> d(20).reroll(1)[1]
+            0.0
+            ```
+        """
+        return self.from_contents(
+            {ModifiedDie.modify(faces, reroll=rerolls): numdice for faces, numdice in self.contents.items()},
+        )
 
     @classmethod
     def from_contents(cls, contents: dict) -> Self:
@@ -228,42 +865,107 @@ class Dice:
         die.contents = cls._Contents(contents)
         return die
     
-    @classmethod
-    def from_str(cls, description: str) -> Self:
-        """Create a new die from ndX notation."""
-        dice = description.split("+")
-        contents = {
-            int(x) if x else 1: int(n) if n else 1
-            for die in dice
-            for n, d, x in [die.strip().partition("d")]
-        }
-        return cls.from_contents(contents)
+    _BYTES_HEADER = struct.Struct("<4sBI")
+    """
+    Magic bytes, format version, number of entries in contents.
 
-    # pytype: enable=invalid-annotation
-    # END Block of stuff that returns Self ... pytype doesn't like this while we have Python3.10 and below
-    # =================
+    Followed by varints (see `_varint()`), so that numbers of any size fit: for each entry, faces (negative to
+    subtract), number of dice, explode, number of rerolled faces and each rerolled face. Then the number of counts
+    (`0` if not yet calculated) and, if calculated, the width of each count in bytes, the lowest possible result and
+    the packed counts.
+    """
+    _BYTES_MAGIC = b"TTRD"
+    _BYTES_VERSION = 4
 
-    def _individual_dice_rolls(self) -> Generator[list, None, None]:
+    def to_bytes(self) -> bytes:
         """
-        Yields a series of lists, each containing the valid faces of the individual dice contained within this `Dice`.
+        Compact binary representation of the contents and, if already calculated, the exact distribution.
 
-        Examples:
-            For a simple d4:
-            ```
-            >>> list(Dice(4)._individual_dice_rolls())
-            [[1, 2, 3, 4]]
-            ```
+        Use `Dice.from_bytes()` to recreate the `Dice`. This is also used when pickling, so that a `Dice` can be
+        sent to another process without it having to calculate the distribution again.
 
-            For 2d4 + d6 + 2:
+        Example:
             ```
             >>> from ttrpg_dice import d
-            >>> dice = (2*d(4)) + d(6) + 2
-            >>> list(dice._individual_dice_rolls())
-            [[1], [1], [1, 2, 3, 4], [1, 2, 3, 4], [1, 2, 3, 4, 5, 6]]
+            >>> dice = 3 * d(6)
+            >>> dice[10]
+            0.125
+            >>> copy = d.from_bytes(dice.to_bytes())
+            >>> copy._countcache is not None  # Already calculated
+            True
+            >>> copy == dice
+            True
             ```
         """
+        parts = [self._BYTES_HEADER.pack(self._BYTES_MAGIC, self._BYTES_VERSION, len(self.contents))]
         for faces, numdice in self.contents.items():
-            yield from repeat(list(range(1, faces + 1)), numdice)
+            die = faces if isinstance(faces, ModifiedDie) else ModifiedDie(faces)
+            parts.extend(map(_varint, (die.faces, numdice, die.explode, len(die.reroll), *sorted(die.reroll))))
+        try:
+            width, packed = diskcache.pack_counts(self._countcache)  # pytype: disable=attribute-error
+        except AttributeError:
+            parts.append(_varint(0))
+        else:
+            parts.extend([*map(_varint, (len(self._countcache), width, self._offset)), packed])
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Self:
+        """Recreate a `Dice` from the output of `Dice.to_bytes()`, including its distribution if it was included."""
+        view = memoryview(data)
+        magic, version, numentries = cls._BYTES_HEADER.unpack_from(view)
+        if magic != cls._BYTES_MAGIC or version != cls._BYTES_VERSION:
+            msg = f"Not a {cls.__name__} created by to_bytes() (version {cls._BYTES_VERSION})"
+            raise ValueError(msg)
+        offset = cls._BYTES_HEADER.size
+        contents = {}
+        for _ in range(numentries):
+            (faces, numdice, explode, numrerolls), offset = _read_varints(view, offset, 4)
+            reroll, offset = _read_varints(view, offset, numrerolls)
+            contents[ModifiedDie(faces, explode, reroll) if explode or reroll else faces] = numdice
+        dice = cls.from_contents(contents)
+
+        (numcounts,), offset = _read_varints(view, offset, 1)
+        if numcounts:
+            (width, lowest), offset = _read_varints(view, offset, 2)
+            ways_to_roll = diskcache.unpack_counts(width, view[offset : offset + width * numcounts])
+            dice._set_counts(lowest, ways_to_roll)  # noqa: SLF001
+        return dice
+
+    def __reduce__(self) -> tuple:
+        """Pickle via `to_bytes()`, carrying the distribution compactly if it has been calculated."""
+        return type(self).from_bytes, (self.to_bytes(),)
+
+    @classmethod
+    @instrumentation.timed("dice.parse")
+    def from_str(cls, description: str) -> Self:
+        """
+        Create a new die from ndX notation.
+
+        Dice may be followed by `!` to explode and/or `rN` to reroll any `N`s, e.g. `"3d6! + d20r1 + 2"`, and may be
+        subtracted, e.g. `"2d6 - d4 - 1"`.
+        """
+        contents = defaultdict(int)
+        for sign, die in re.findall(r"([+-]?)\s*([^+-]+)", description):
+            n, _, x = die.strip().partition("d")
+            faces = cls._faces_from_str(x) if x else 1
+            contents[-faces if sign == "-" else faces] += int(n) if n else 1
+        return cls.from_contents(cls._net_constant(contents))
+
+    @classmethod
+    def _faces_from_str(cls, description: str) -> int | ModifiedDie:
+        """Faces from the `X` in ndX notation, including any modifiers."""
+        faces, modifiers = re.fullmatch(r"(.*?)((?:!|r\d+)*)", description.strip()).groups()
+        faces = int(faces)
+        if not modifiers:
+            return faces
+        rerolls = [int(reroll) for reroll in re.findall(r"r(\d+)", modifiers)]
+        cutoff = cls.EXPLODE_CUTOFF if "!" in modifiers else None
+        return ModifiedDie.modify(faces, cutoff=cutoff, reroll=rerolls)
+
+    # pytype: enable=invalid-annotation
+    # END Block of stuff that returns Self ... pytype doesn't like this while we have Python3.10 and below
+    # =================
 
     @classmethod
     def _int(cls, other: SupportsInt, action: str, conjunction: str) -> int:
@@ -280,6 +982,433 @@ class Dice:
         return other
 
 
+class LogProbabilities:
+    """Natural logarithms of the probabilities of a `Dice`, see `Dice.log`. Impossible results give `-inf`."""
+
+    __slots__ = ("dice",)
+
+    def __init__(self, dice: Dice) -> None:  # noqa: D107
+        self.dice = dice
+
+    def __getitem__(self, index: int | slice) -> float | list[float | None]:
+        """Log of the probability of a specific result, or a list of them for a slice."""
+        results = self.dice._results(index)  # noqa: SLF001
+        if isinstance(results, range):
+            lowest = self.dice._lowest  # noqa: SLF001
+            return [self._log(self.dice._count(result)) if result >= lowest else None for result in results]  # noqa: SLF001
+        return self._log(self.dice._count(results))  # noqa: SLF001
+
+    def sum(self, index: int | slice) -> float:
+        """Log of the probability of rolling any of the results in `index`, summed exactly before taking the log."""
+        results = self.dice._results(index)  # noqa: SLF001
+        if not isinstance(results, range):
+            results = [results]
+        lowest = self.dice._lowest  # noqa: SLF001
+        return self._log(sum(self.dice._count(result) for result in results if result >= lowest))  # noqa: SLF001
+
+    def _log(self, count: int) -> float:
+        """`log(count / number possible rolls)`, without dividing, which would underflow for huge pools."""
+        if not count:
+            return -inf
+        return log(count) - self.dice._lognumberpossiblerolls  # noqa: SLF001
+
+
+class ModifiedDie:
+    """
+    A single die which does not follow the normal rules, used in place of the number of faces in `Dice.contents`.
+
+    Create these via `Dice.explode()`, `Dice.reroll()` or `Dice.from_str()` rather than directly.
+
+    Attributes:
+        faces (int): The number of faces on the die, negative if the die is subtracted.
+        explode (int): The maximum number of times the die explodes on its highest face.
+        reroll (frozenset[int]): Faces which are rerolled whenever they come up.
+        cutoff (float | None): The `cutoff` given to `Dice.explode()`, if known, to recalculate `explode` from when
+            rerolls are added later.
+    """
+
+    __slots__ = ("cutoff", "explode", "faces", "reroll")
+
+    def __init__(self, faces: int, explode: int = 0, reroll: Iterable[int] = (), cutoff: float | None = None) -> None:
+        """A die with `faces` sides, exploding up to `explode` times and rerolling any of `reroll`."""
+        self.faces = faces
+        self.explode = explode
+        self.reroll = frozenset(reroll)
+        self.cutoff = cutoff
+        self._validate()
+
+    def _validate(self) -> None:
+        """Ensure `_counts` will terminate and give a valid distribution."""
+        if not isinstance(self.faces, int) or self.faces == 0:
+            msg = f"Number of faces must be a non-zero integer, not {self.faces}"
+            raise ValueError(msg)
+        size = abs(self.faces)
+        if not self.reroll <= set(range(1, size + 1)):
+            invalid = ", ".join(str(face) for face in sorted(self.reroll - set(range(1, size + 1))))
+            msg = f"Cannot reroll {invalid} on a d{size}"
+            raise ValueError(msg)
+        if len(self.reroll) == size:
+            msg = f"Cannot reroll every face on a d{size}"
+            raise ValueError(msg)
+
+    @classmethod
+    def modify(
+        cls,
+        faces: int | ModifiedDie,
+        cutoff: float | None = None,
+        reroll: Iterable[int] = (),
+    ) -> int | ModifiedDie:
+        """
+        Add explosions (if `cutoff` is given) and/or rerolls to `faces`.
+
+        Constants (`faces == 1`) are returned unchanged, as are dice which do not have any of the faces to `reroll`.
+        Subtracted dice (negative `faces`) are modified in the same way and remain subtracted. Rerolls make the
+        highest face more likely, so an exploding die is given enough explosions to stay within its original cutoff.
+        """
+        if faces in {1, -1}:
+            return faces
+        if faces < 0:
+            return -cls.modify(-faces, cutoff, reroll)
+        base = faces if isinstance(faces, ModifiedDie) else cls(faces)
+        rerolls = base.reroll | {face for face in reroll if face <= base.faces}
+        explode = base.explode
+        if cutoff is None and explode:
+            cutoff = base.cutoff
+            if cutoff is None and rerolls != base.reroll:  # e.g. from `Dice.from_bytes()`: keep the same chance
+                cutoff = (1 / (base.faces - len(base.reroll))) ** explode
+        if cutoff is not None:
+            p_highest = 1 / (base.faces - len(rerolls)) if base.faces not in rerolls else 0
+            explode = 0 if p_highest in {0, 1} else max(ceil(log(cutoff) / log(p_highest)), 1)
+        if not explode and not rerolls:
+            return base.faces
+        return cls(base.faces, explode, rerolls, cutoff if explode else None)
+
+    def _counts(self) -> list[int]:
+        """
+        Number of ways to roll each result, indexed by result, as for `Dice._counts()`, for a die which is added.
+
+        Rerolling a face `n` times is a geometric series which converges to never rolling that face, so rerolled
+        faces are simply removed. Each explosion multiplies the number of ways to reach every result, so that the
+        final explosion is weighted correctly against those which stopped earlier.
+        """
+        single_roll = [0] + [0 if face in self.reroll else 1 for face in range(1, self.faces + 1)]
+        counts = single_roll
+        for _ in range(self.explode):
+            explosion = [0] * self.faces + counts
+            ways_to_explode = sum(counts)
+            counts = [n * ways_to_explode for n in single_roll[:-1]] + [0] * (len(explosion) - self.faces)
+            counts = [n + m * single_roll[-1] for n, m in zip(counts, explosion)]  # noqa: B905
+        while not counts[-1]:  # Rerolling the highest face(s) makes them impossible
+            counts.pop()
+        return counts
+
+    def _sortkey(self) -> tuple:
+        return (self.faces, 1, self.explode, sorted(self.reroll))
+
+    def __neg__(self) -> ModifiedDie:
+        """The same die, subtracted instead of added (or vice versa)."""
+        return type(self)(-self.faces, self.explode, self.reroll, self.cutoff)
+
+    def __eq__(self, other: object) -> bool:
+        """Only equal to an identical `ModifiedDie`, never to an `int`."""
+        if not isinstance(other, ModifiedDie):
+            return NotImplemented
+        return self._sortkey() == other._sortkey()
+
+    def __hash__(self) -> int:  # noqa: D105
+        return hash((self.faces, self.explode, self.reroll))
+
+    def __lt__(self, other: int | ModifiedDie) -> bool:
+        """Sorts after a plain die with the same number of faces, so that `Dice` str and hash are stable."""
+        return self._sortkey() < _sortkey(other)
+
+    def __gt__(self, other: int | ModifiedDie) -> bool:  # noqa: D105
+        return self._sortkey() > _sortkey(other)
+
+    def __str__(self) -> str:
+        """Number of faces plus modifiers in ndX notation, e.g. `6!` or `20r1`."""
+        rerolls = "".join(f"r{face}" for face in sorted(self.reroll))
+        return f"{self.faces}{'!' if self.explode else ''}{rerolls}"
+
+    def __repr__(self) -> str:  # noqa: D105
+        return f"{type(self).__name__}({self.faces}, explode={self.explode}, reroll={tuple(sorted(self.reroll))})"
+
+
+class _Build:
+    """A distribution being calculated by one thread, which other threads can wait for."""
+
+    __slots__ = ("done", "exception", "result")
+
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result: list[int] | None = None
+        self.exception: BaseException | None = None
+
+    def wait(self) -> list[int]:
+        """Wait for the calculation to finish, then return its result or raise its exception."""
+        self.done.wait()
+        if self.exception is not None:
+            raise self.exception
+        return self.result
+
+
+_VARINT_CONTINUES = 0x80
+"""Set on every byte of a varint except the last, each of which holds 7 bits of the value."""
+
+
+def _varint(value: int) -> bytes:
+    r"""
+    `value` as a zigzag-encoded LEB128 varint: integers of any size, with small ones in a single byte.
+
+    Example:
+        ```
+        >>> from ttrpg_dice.dice import _read_varints, _varint
+        >>> _varint(-1), _varint(200)
+        (b'\x01', b'\x90\x03')
+        >>> _read_varints(_varint(-1) + _varint(10**12), 0, 2)
+        ([-1, 1000000000000], 7)
+        ```
+    """
+    zigzag = 2 * value if value >= 0 else -2 * value - 1
+    encoded = bytearray()
+    while zigzag >= _VARINT_CONTINUES:
+        encoded.append(zigzag & 0x7F | _VARINT_CONTINUES)
+        zigzag >>= 7
+    encoded.append(zigzag)
+    return bytes(encoded)
+
+
+def _read_varints(data: memoryview, offset: int, number: int) -> tuple[list[int], int]:
+    """`number` values encoded by `_varint()`, starting at `offset`, and the offset after them."""
+    values = []
+    for _ in range(number):
+        zigzag = shift = 0
+        while True:
+            byte = data[offset]
+            offset += 1
+            zigzag |= (byte & 0x7F) << shift
+            shift += 7
+            if byte < _VARINT_CONTINUES:
+                break
+        values.append(zigzag >> 1 if zigzag % 2 == 0 else -(zigzag + 1 >> 1))
+    return values, offset
+
+
+def _sortkey(faces: int | ModifiedDie) -> tuple:
+    """Allow plain and modified dice to be sorted together."""
+    try:
+        return faces._sortkey()  # noqa: SLF001 # pytype: disable=attribute-error
+    except AttributeError:
+        return (faces, 0)
+
+
+def _convolve(left: list[int], right: list[int]) -> list[int]:
+    """
+    Number of ways to roll each result for two independent rolls, given the number of ways for each of them.
+
+    Example:
+        ```
+        >>> from ttrpg_dice.dice import _convolve
+        >>> _convolve([0, 1, 1], [0, 1, 1])
+        [0, 0, 1, 2, 1]
+        ```
+    """
+    if instrumentation.enabled:
+        instrumentation.record("dice.convolution_terms", len(left) * len(right))
+    result = [0] * (len(left) + len(right) - 1)
+    for i, n in enumerate(left):
+        if n:
+            for j, m in enumerate(right):
+                result[i + j] += n * m
+    return result
+
+
+KRONECKER_THRESHOLD = 128
+"""
+Distributions with more results than this, multiplied by the number of faces on the largest die, are calculated by
+`_convolve_kronecker()` rather than `_convolve()`.
+"""
+
+
+def _convolve_all(groups: list[tuple[list[int], int]], max_bytes: int | None = None) -> list[int]:
+    """
+    Number of ways to roll each result for a number of dice, given as `(ways to roll each result, numdice)`.
+
+    Within a memory budget of `max_bytes`, if given: see `Dice.max_bytes`.
+    """
+    if not groups:
+        return [1]
+    length = 1 + sum((len(counts) - 1) * numdice for counts, numdice in groups)
+    kronecker = length * max(len(counts) for counts, _ in groups) > KRONECKER_THRESHOLD
+    if max_bytes is not None:
+        bits = _number_possible_rolls(groups).bit_length()
+        counts = _counts_bytes(bits, length, max_bytes)
+        copies = KRONECKER_COPIES if bits * length <= DECIMAL_THRESHOLD else DECIMAL_COPIES
+        if kronecker and counts + copies * bits * length // 8 > max_bytes:
+            return _convolve_chunked(groups, (bits + 7) // 8, max_bytes - 2 * counts)
+    if not kronecker:
+        return reduce(_convolve, (counts for counts, numdice in groups for _ in range(numdice)))
+    return _convolve_kronecker(groups, length)
+
+
+KRONECKER_COPIES = 5
+"""Packed numbers held in memory at once by `_convolve_kronecker()`, each of `bits * length` bits."""
+
+DECIMAL_COPIES = 8
+"""The same for `_convolve_kronecker_decimal()`, whose string of decimal digits is about 2.4 times larger."""
+
+
+def _counts_bytes(bits: int, length: int, max_bytes: int) -> int:
+    """
+    Approximate memory used by a list of `length` counts of up to `bits` bits.
+
+    Raises `DistributionTooLargeError` if `max_bytes` cannot hold the result: the counts and probabilities stored
+    afterwards, or two lists of counts while calculating them.
+    """
+    counts = length * (8 + sys.getsizeof(1) + 4 * (bits // 30))  # List entry & int with a 4-byte digit per 30 bits
+    needed = max(counts + length * (8 + sys.getsizeof(0.0)), 2 * counts)
+    if needed > max_bytes:
+        raise DistributionTooLargeError(length, needed, max_bytes)
+    return counts
+
+
+def _number_possible_rolls(groups: list[tuple[list[int], int]]) -> int:
+    number_possible_rolls = 1
+    for counts, numdice in groups:
+        number_possible_rolls *= sum(counts) ** numdice
+    return number_possible_rolls
+
+
+def _convolve_kronecker(groups: list[tuple[list[int], int]], length: int) -> list[int]:
+    """
+    Exactly the same as repeatedly using `_convolve()`, but much faster for large distributions.
+
+    Each die's counts are packed into one (very large) integer, each count in a slot wide enough to hold any count
+    in the result. Multiplying these integers (or raising them to a power for identical dice) then convolves the
+    counts, using python's integer arithmetic, which is sub-quadratic and in C, instead of multiplying each pair of
+    counts in python. The result is unpacked once at the end.
+
+    Example:
+        ```
+        >>> from ttrpg_dice.dice import _convolve_kronecker
+        >>> _convolve_kronecker([([1, 1], 2), ([1, 2], 1)], 4)
+        [1, 4, 5, 2]
+        ```
+    """
+    if instrumentation.enabled:
+        instrumentation.record("dice.convolution_kronecker")
+    bits = _number_possible_rolls(groups).bit_length()  # No result can have more ways to roll than this
+    if bits * length > DECIMAL_THRESHOLD:
+        return _convolve_kronecker_decimal(groups, length, int(bits * log10(2)) + 1)
+
+    width = (bits + 7) // 8
+    product = 1
+    for counts, numdice in groups:
+        product *= _pack(counts, width) ** numdice
+    return _unpack(product, width, length)
+
+
+def _pack(counts: list[int], width: int) -> int:
+    """`counts` as one integer, each count in a slot of `width` bytes."""
+    return int.from_bytes(b"".join(count.to_bytes(width, "little") for count in counts), "little")
+
+
+def _unpack(packed: int, width: int, length: int) -> list[int]:
+    """The `length` counts packed into slots of `width` bytes by `_pack()`."""
+    data = packed.to_bytes(width * length, "little")
+    return [int.from_bytes(data[i : i + width], "little") for i in range(0, width * length, width)]
+
+
+def _convolve_chunked(groups: list[tuple[list[int], int]], width: int, max_bytes: int) -> list[int]:
+    """
+    `_convolve_kronecker()`, packing at most about `max_bytes` at once, for when the whole result would not fit.
+
+    Adds as many dice at a time as fit in one chunk, multiplying each chunk of the counts so far by the packed
+    counts for those dice. Only two lists of counts and one chunk are in memory at a time, but each step unpacks a
+    whole list of counts, so this is several times slower than `_convolve_kronecker()` for large pools.
+
+    Example:
+        ```
+        >>> from ttrpg_dice.dice import _convolve_chunked
+        >>> _convolve_chunked([([1, 1], 2), ([1, 2], 1)], 1, 1)
+        [1, 4, 5, 2]
+        ```
+    """
+    if instrumentation.enabled:
+        instrumentation.record("dice.convolution_chunked")
+    chunk = max(1, max_bytes // (2 * KRONECKER_COPIES * width))  # Results in each chunk, and in each set of dice
+    ways_to_roll = [1]
+    for counts, numdice in groups:
+        atonce = max(1, (chunk - 1) // (len(counts) - 1))
+        for done in range(0, numdice, atonce):
+            dice = _pack(counts, width) ** min(atonce, numdice - done)
+            dicelength = (len(counts) - 1) * min(atonce, numdice - done) + 1
+            result = [0] * (len(ways_to_roll) + dicelength - 1)
+            for start in range(0, len(ways_to_roll), chunk):
+                part = ways_to_roll[start : start + chunk]
+                for i, count in enumerate(_unpack(_pack(part, width) * dice, width, len(part) + dicelength - 1), start):
+                    result[i] += count
+            ways_to_roll = result
+    return ways_to_roll
+
+
+DECIMAL_THRESHOLD = 2**18
+"""Kronecker convolutions packing more than this many bits use `_convolve_kronecker_decimal()`."""
+
+
+def _convolve_kronecker_decimal(groups: list[tuple[list[int], int]], length: int, width: int) -> list[int]:
+    """
+    `_convolve_kronecker()`, packing counts as `width` decimal digits into `Decimal`s rather than bytes into `int`s.
+
+    For enormous pools the packed numbers have millions of digits. The `decimal` module multiplies numbers this
+    large using a number-theoretic transform, which is much faster than python's `int` multiplication. With
+    unlimited precision and `Inexact` trapped, the result is still exact.
+    """
+    from decimal import MAX_EMAX, MAX_PREC, MIN_EMIN, Decimal, Inexact, localcontext  # noqa: PLC0415 - Rarely needed
+
+    with localcontext() as context:
+        context.prec = MAX_PREC
+        context.Emax = MAX_EMAX
+        context.Emin = MIN_EMIN
+        context.traps[Inexact] = True
+        product = Decimal(1)
+        for counts, numdice in groups:
+            product *= Decimal("".join(str(count).zfill(width) for count in reversed(counts))) ** numdice
+        packed = str(product).zfill(width * length)
+
+    # Python (3.10.7+) may limit conversion of very long strings to int, but not of Decimals
+    limit = getattr(sys, "get_int_max_str_digits", int)()
+    toint = int if not limit or width < limit else lambda digits: int(Decimal(digits))
+    return [toint(packed[i - width : i]) for i in range(width * length, 0, -width)]
+
+
+class DistributionTooLargeError(MemoryError):
+    """
+    Exception raised when calculating a distribution would need more memory than `Dice.max_bytes`.
+
+    Attributes:
+        needed (int): Approximate number of bytes needed.
+        max_bytes (int): The memory budget.
+    """
+
+    def __init__(self, results: int, needed: int, max_bytes: int) -> None:
+        """
+        Initialize the DistributionTooLargeError for a distribution with `results` possible results.
+
+        Args:
+            results (int): Number of possible results.
+            needed (int): Approximate number of bytes needed.
+            max_bytes (int): The memory budget.
+        """
+        self.needed = needed
+        self.max_bytes = max_bytes
+        msg = (
+            f"A distribution with {results:,} possible results needs about {needed:,} bytes, more than"
+            f" max_bytes={max_bytes:,}. Use fewer or smaller dice, or increase Dice.max_bytes."
+        )
+        super().__init__(msg)
+
+
 class DiceIndexError(IndexError):
     """
     Exception raised for errors in the indexing of a Dice object.
@@ -295,5 +1424,6 @@ class DiceIndexError(IndexError):
         Args:
             dice (Dice): The Dice object where the error occurred.
         """
-        msg = f"Invalid side: This Dice has sides numbered 1 to {len(dice)}."
+        lowest = dice._lowest  # noqa: SLF001
+        msg = f"Invalid side: This Dice has sides numbered {lowest} to {lowest + len(dice) - 1}."
         super().__init__(msg)
@@ -0,0 +1,218 @@
+"""
+Optional on-disk cache of calculated distributions, shared between processes.
+
+Large pools and exploding dice can take a long time to calculate, and each new process would otherwise calculate
+them again. The disk cache is off by default. Turn it on with `enable(path)` and every `Dice` whose distribution is
+not yet known will first look for it on disk, and store it there after calculating it.
+
+Distributions are stored in a sqlite database as packed integer counts, keyed by the `Dice` contents (including any
+modifiers). Several processes may use the same file at once. When the stored distributions exceed `max_bytes`,
+those used least recently are removed. Loading does not write to the database: when each distribution was last used
+is remembered and written along with the next distribution stored, or every `RECENCY_BATCH` loads.
+
+Example:
+    ```
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> from ttrpg_dice import d, diskcache
+    >>> cachedir = tempfile.TemporaryDirectory()
+    >>> _ = diskcache.enable(Path(cachedir.name) / "dice.db")
+    >>> (2 * d(6))[7]  # calculated and stored
+    0.16666666666666666
+    >>> (2 * d(6))[7]  # loaded from disk
+    0.16666666666666666
+    >>> diskcache.disable()
+    >>> cachedir.cleanup()
+    ```
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from time import time
+from typing import TYPE_CHECKING
+
+from . import instrumentation
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from os import PathLike
+    from sqlite3 import Connection
+
+FORMAT_VERSION = 3
+"""Version of the stored data, distributions stored by other versions are discarded."""
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+RECENCY_BATCH = 100
+"""Number of loads after which the times they were used are written to the database, see `DistributionCache.load()`"""
+
+cache: DistributionCache | None = None
+"""The cache currently in use, if any. Use `enable()` & `disable()` to change this."""
+
+_TYPECODES = {1: "B", 2: "H", 4: "I", 8: "Q"}
+"""Width in bytes: memoryview format to read packed counts of that width without converting each one"""
+
+
+class DistributionCache:
+    """A sqlite database of distributions, used by `Dice` while enabled via `enable()`."""
+
+    def __init__(self, path: str | PathLike, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Use (or create) the database at `path`, storing at most `max_bytes` of distributions."""
+        if max_bytes <= 0:
+            msg = f"max_bytes must be a positive integer, not {max_bytes}"
+            raise ValueError(msg)
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._used: dict[str, float] = {}  # key: time last loaded, not yet written to the database
+        db = self._connect()
+        try:
+            with db:
+                (version,) = db.execute("PRAGMA user_version").fetchone()
+                if version != FORMAT_VERSION:
+                    db.execute("DROP TABLE IF EXISTS distributions")
+                    db.execute(f"PRAGMA user_version = {FORMAT_VERSION:d}")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS distributions ("
+                    " key TEXT PRIMARY KEY, offset TEXT, width INTEGER, counts BLOB, size INTEGER, used REAL)",
+                )
+        finally:
+            db.close()
+
+    def _connect(self) -> Connection:
+        """
+        A new connection for each operation: safe to use from several threads, and after forking.
+
+        WAL mode lets processes read while another process is writing.
+        """
+        import sqlite3  # noqa: PLC0415 # Only needed if the disk cache is used
+
+        db = sqlite3.connect(self.path, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        return db
+
+    def load(self, contents: Mapping) -> tuple[int, list[int]] | None:
+        """
+        Stored `(lowest possible result, counts from there upwards)` for `contents`, or `None` if not stored.
+
+        The time of use is only remembered, and written to the database later in a batch (see `RECENCY_BATCH`).
+        """
+        key = _key(contents)
+        db = self._connect()
+        try:
+            row = db.execute("SELECT offset, width, counts FROM distributions WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._used[key] = time()
+                if len(self._used) >= RECENCY_BATCH:
+                    with db:
+                        self._write_used(db)
+        finally:
+            db.close()
+        if instrumentation.enabled:
+            instrumentation.record("diskcache.miss" if row is None else "diskcache.hit")
+        if row is None:
+            return None
+        offset, width, packed = row
+        return int(offset), unpack_counts(width, packed)
+
+    def store(self, contents: Mapping, offset: int, counts: list[int]) -> None:
+        """
+        Store the `counts` for each result from `offset` upwards for `contents`.
+
+        Then remove the least recently used distributions if over `max_bytes`.
+        """
+        width, packed = pack_counts(counts)
+        if len(packed) > self.max_bytes:
+            return
+        db = self._connect()
+        try:
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO distributions VALUES (?, ?, ?, ?, ?, ?)",
+                    (_key(contents), str(offset), width, packed, len(packed), time()),
+                )
+                self._write_used(db)
+                self._evict(db)
+        finally:
+            db.close()
+
+    def _write_used(self, db: Connection) -> None:
+        """Write the times distributions were loaded, which are only remembered by `load()`."""
+        used, self._used = self._used, {}
+        db.executemany("UPDATE distributions SET used = ? WHERE key = ?", [(when, key) for key, when in used.items()])
+
+    def _evict(self, db: Connection) -> None:
+        (total,) = db.execute("SELECT COALESCE(SUM(size), 0) FROM distributions").fetchone()
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in db.execute("SELECT key, size FROM distributions ORDER BY used"):
+            evicted.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        db.executemany("DELETE FROM distributions WHERE key = ?", evicted)
+        if instrumentation.enabled:
+            instrumentation.record("diskcache.evicted", len(evicted))
+
+    def flush(self) -> None:
+        """Write the times distributions were last loaded, which are otherwise written in batches."""
+        db = self._connect()
+        try:
+            with db:
+                self._write_used(db)
+        finally:
+            db.close()
+
+    def clear(self) -> None:
+        """Remove all stored distributions."""
+        db = self._connect()
+        try:
+            with db:
+                db.execute("DELETE FROM distributions")
+        finally:
+            db.close()
+
+    def __len__(self) -> int:
+        """Number of stored distributions."""
+        db = self._connect()
+        try:
+            (count,) = db.execute("SELECT COUNT(*) FROM distributions").fetchone()
+        finally:
+            db.close()
+        return count
+
+
+def enable(path: str | PathLike, max_bytes: int = DEFAULT_MAX_BYTES) -> DistributionCache:
+    """Start loading & storing distributions in the database at `path`."""
+    global cache  # noqa: PLW0603
+    cache = DistributionCache(path, max_bytes)
+    return cache
+
+
+def disable() -> None:
+    """Stop using the disk cache. Stored distributions are kept on disk."""
+    global cache  # noqa: PLW0603
+    if cache is not None:
+        cache.flush()
+    cache = None
+
+
+def _key(contents: Mapping) -> str:
+    """Canonical text for `contents`, `ModifiedDie`s include their explode depth & rerolls in their repr."""
+    return repr(sorted(contents.items()))
+
+
+def pack_counts(counts: list[int]) -> tuple[int, bytes]:
+    """Counts as `(width, little-endian bytes)`, each count using `width` bytes."""
+    width = max(max(counts).bit_length() + 7, 8) // 8
+    width = next((size for size in _TYPECODES if size >= width), width)
+    return width, b"".join(count.to_bytes(width, "little") for count in counts)
+
+
+def unpack_counts(width: int, packed: bytes) -> list[int]:
+    """Counts from the `(width, little-endian bytes)` created by `pack_counts()`."""
+    if width in _TYPECODES and sys.byteorder == "little":
+        return memoryview(packed).cast(_TYPECODES[width]).tolist()
+    return [int.from_bytes(packed[i : i + width], "little") for i in range(0, len(packed), width)]
@@ -0,0 +1,225 @@
+"""
+Dice formulas as expression graphs, evaluated once per distinct sub-expression.
+
+Plain `Dice` arithmetic simply adds up the contents, so `2 * d(6) + d(4) - 1` is a single `Dice`. Once a roll is
+transformed (see `ttrpg_dice.transform`), further arithmetic records a `CombinedDice`: the sum of independent rolls
+of its terms, calculated by convolving their distributions. Formulas therefore form a graph, in which each node is
+identified by a hash of its whole sub-expression (`Dice._key`), so identical sub-expressions are recognised even when
+built separately.
+
+`evaluate()` takes a batch of formulas, finds every distinct sub-expression across all of them, and calculates each
+exactly once, children before parents, sharing the result with every formula that contains it.
+
+Example:
+    ```
+    >>> from ttrpg_dice import d, expression
+    >>> hit = (d(20) + 5).clamp(highest=20)
+    >>> formulas = [hit + d(6), hit + d(8), (d(20) + 5).clamp(highest=20) + d(6) + 2]
+    >>> [str(formula) for formula in formulas]
+    ['(d20 + 5).clamp(None, 20) + d6', '(d20 + 5).clamp(None, 20) + d8', '(d20 + 5).clamp(None, 20) + d6 + 2']
+    >>> _ = expression.evaluate(formulas)  # d20 + 5 and the clamp are calculated once
+    >>> formulas[0][26]
+    0.05
+    ```
+"""
+
+from __future__ import annotations
+
+import operator
+from collections import Counter
+from typing import TYPE_CHECKING, NoReturn, SupportsInt
+
+from . import instrumentation
+from .dice import Dice, _convolve_all
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterable
+
+
+class DiceExpression(Dice):
+    """
+    Base for `Dice` calculated from the distributions of other `Dice`, rather than from contents.
+
+    Arithmetic with a `DiceExpression` gives a `CombinedDice`, negating it transforms each result. Distributions are
+    not stored in the precomputed distributions or disk cache, which are keyed by contents.
+    """
+
+    def _cached_counts(self) -> tuple[int, list[int]]:
+        """Always calculated, from the (possibly already calculated) distributions of `_children()`."""
+        return self._core_counts()
+
+    def __repr__(self) -> str:  # noqa: D105
+        return f"{type(self).__name__}: {self}"
+
+    def __add__(self, other: Dice | SupportsInt) -> Dice:
+        """Sum of independent rolls, see `CombinedDice`."""
+        return self._combined(self._operand(other, "add", "and"))
+
+    def __sub__(self, other: Dice | SupportsInt) -> Dice:
+        """Difference between independent rolls, see `CombinedDice`."""
+        return self + -self._operand(other, "subtract", "from")
+
+    def __rsub__(self, other: SupportsInt) -> Dice:  # noqa: D105
+        return -self + self._operand(other, "subtract", "from")
+
+    def __rmul__(self, other: SupportsInt) -> Dice:
+        """`2 * expression` is the sum of two independent rolls of `expression`."""
+        other = self._int(other, "multiply", "by")
+        if other < 0:
+            return -other * -self
+        return CombinedDice.of([(self, other)])
+
+    def __neg__(self) -> Dice:
+        """Each result negated, via `Dice.map()`."""
+        return self.map(operator.neg)
+
+    def _operand(self, other: Dice | SupportsInt, action: str, conjunction: str) -> Dice:
+        """`other` as a `Dice`, numbers become constants."""
+        if isinstance(other, Dice):
+            return other
+        return Dice.from_contents(self._constant(self._int(other, action, conjunction)))
+
+    def _unsupported(self, *_: object) -> NoReturn:
+        msg = f"Cannot explode or reroll '{type(self).__name__}', modify the dice before transforming them"
+        raise TypeError(msg)
+
+    explode = reroll = _unsupported
+
+    def to_bytes(self) -> NoReturn:
+        """Not available: expressions may include arbitrary functions."""
+        msg = f"Cannot convert '{type(self).__name__}' to bytes, use pickle if all functions can be pickled"
+        raise TypeError(msg)
+
+
+class CombinedDice(DiceExpression):
+    """
+    The sum of independent rolls of several `Dice`, at least one of which is a `DiceExpression`.
+
+    Created by arithmetic with a `DiceExpression`, rather than directly.
+
+    Attributes:
+        terms (tuple[tuple[Dice, int], ...]): Each `Dice` and how many times it is rolled. Any plain `Dice` are
+            combined into a single term.
+    """
+
+    def __init__(self, terms: Iterable[tuple[Dice, int]]) -> None:
+        """Sum of rolling each `Dice` in `terms` the given number of times, use `CombinedDice.of()` instead."""
+        self.terms = tuple(terms)
+
+    @classmethod
+    def of(cls, terms: Iterable[tuple[Dice, int]]) -> Dice:
+        """
+        Sum of rolling each `Dice` in `terms` the given number of times, simplified.
+
+        Nested `CombinedDice` are flattened, plain `Dice` are added together, and identical expressions are rolled
+        several times, so that equivalent formulas give the same `_key`. Returns a plain `Dice`, or the only
+        expression, if nothing needs combining.
+        """
+        plain = Dice.from_contents({})
+        expressions: dict[Hashable, list] = {}
+        for dice, numrolls in cls._flatten(terms):
+            if isinstance(dice, DiceExpression):
+                expressions.setdefault(dice._key, [dice, 0])[1] += numrolls  # noqa: SLF001
+            else:
+                plain += numrolls * dice
+        combined = [(dice, numrolls) for dice, numrolls in expressions.values() if numrolls]
+        if not combined:
+            return plain
+        if plain.contents:
+            combined.append((plain, 1))
+        if len(combined) == 1 and combined[0][1] == 1:
+            return combined[0][0]
+        return cls(combined)
+
+    @staticmethod
+    def _flatten(terms: Iterable[tuple[Dice, int]]) -> Iterable[tuple[Dice, int]]:
+        for dice, numrolls in terms:
+            if isinstance(dice, CombinedDice):
+                for inner, innerrolls in CombinedDice._flatten(dice.terms):
+                    yield inner, innerrolls * numrolls
+            else:
+                yield dice, numrolls
+
+    @property
+    def _key(self) -> Hashable:
+        """Identifies the distribution in caches shared between `Dice`: each term's `_key`, in any order."""
+        return (type(self).__name__, frozenset(Counter({dice._key: n for dice, n in self.terms}).items()))  # noqa: SLF001
+
+    def _children(self) -> tuple[Dice, ...]:
+        """`Dice` whose distributions this distribution is calculated from."""
+        return tuple(dice for dice, _ in self.terms)
+
+    @instrumentation.timed("dice.combine")
+    def _core_counts(self) -> tuple[int, list[int]]:
+        """
+        `(lowest possible result, number of ways to roll each result from there upwards)`.
+
+        Convolves the distributions of the terms, in the same way as the individual dice in a plain `Dice`.
+
+        Example:
+            ```
+            >>> from ttrpg_dice import d
+            >>> (d(3).clamp(2, 3) + d(2))._core_counts()
+            (3, [2, 3, 1])
+            ```
+        """
+        offset = 0
+        groups = []
+        for dice, numrolls in self.terms:
+            _ = dice._core  # noqa: SLF001 # Ensure dice._countcache exists
+            offset += dice._offset * numrolls  # noqa: SLF001
+            if len(dice._countcache) > 1:  # noqa: SLF001
+                groups.append((dice._countcache, numrolls))  # noqa: SLF001
+        return offset, _convolve_all(groups, self.max_bytes)
+
+    def __str__(self) -> str:
+        """Each term, e.g. `(d20).clamp(5, 20) + 2d6`."""
+        return " + ".join(str(dice) if numrolls == 1 else f"{numrolls} * ({dice})" for dice, numrolls in self.terms)
+
+    def __reduce__(self) -> tuple:
+        """Pickle the terms, which requires any functions in them to be picklable."""
+        return type(self), (self.terms,)
+
+
+def evaluate(formulas: Iterable[Dice]) -> list[Dice]:
+    """
+    Calculate the distributions of all `formulas`, calculating each distinct sub-expression only once.
+
+    Builds the graph of every sub-expression of every formula, identified by `Dice._key`, then calculates each node
+    once, in topological order (children first). Every `Dice` object for the same node, in any formula, is given the
+    result. Returns the formulas, which can then be indexed without any further calculation.
+    """
+    formulas = list(formulas)
+    graph = _graph(formulas)
+    for instances in graph.values():
+        calculated = next((dice for dice in instances if hasattr(dice, "_countcache")), instances[0])
+        _ = calculated._core  # noqa: SLF001
+        for dice in instances:
+            if dice is not calculated and not hasattr(dice, "_countcache"):
+                dice._set_counts(calculated._offset, calculated._countcache)  # noqa: SLF001
+    if instrumentation.enabled:
+        instrumentation.record("expression.nodes", len(graph))
+        instrumentation.record("expression.shared", sum(len(instances) for instances in graph.values()) - len(graph))
+    return formulas
+
+
+def _graph(formulas: list[Dice]) -> dict[Hashable, list[Dice]]:
+    """
+    Every distinct sub-expression of `formulas`: all `Dice` objects for it, in topological order (children first).
+
+    The children of an object identical to one already seen are not visited again, as it will be given the result.
+    """
+    graph: dict[Hashable, list[Dice]] = {}
+
+    def _visit(dice: Dice) -> None:
+        key = dice._key  # noqa: SLF001
+        if key in graph:
+            graph[key].append(dice)
+            return
+        for child in dice._children():  # noqa: SLF001
+            _visit(child)
+        graph[key] = [dice]
+
+    for formula in formulas:
+        _visit(formula)
+    return graph
@@ -0,0 +1,122 @@
+"""
+Opt-in counters and timers for the calculations behind ttrpg-dice.
+
+Instrumentation is off by default and costs a single flag check per instrumented call while off. Turn it on with
+`enable()`, then read a snapshot with `stats()` (also available as `ttrpg_dice.stats()`) and/or register a hook with
+`add_hook()` to forward every measurement to your own metrics.
+
+Example:
+    ```
+    >>> from ttrpg_dice import d, instrumentation, stats
+    >>> instrumentation.enable()
+    >>> _ = list(2 * d(7))
+    >>> stats()["dice.build"]
+    1
+    >>> instrumentation.disable()
+    >>> instrumentation.reset()
+    ```
+
+Measurements:
+    - `dice.build`, `dice.build.seconds`: distributions calculated for a `Dice`
+    - `dice.cache_hit`, `dice.cache_miss`: indexing or iterating over a `Dice` whose distribution was already
+      calculated, and distributions which were not yet calculated when first needed
+    - `dice.combine`, `dice.combine.seconds`: distributions calculated for arithmetic involving transformed dice, see
+      `ttrpg_dice.expression`
+    - `dice.coalesced`: calculations avoided by waiting for an identical distribution already being calculated
+    - `dice.combinations`: total number of combinations of rolls covered by calculated distributions
+    - `dice.convolution_terms`: multiplications performed while combining individual dice
+    - `dice.convolution_kronecker`: large combinations calculated by multiplying packed integers instead
+    - `dice.convolution_chunked`: large combinations calculated in chunks, to fit in `Dice.max_bytes`
+    - `dice.opposed`, `dice.opposed_cache_hit`: opposed rolls compared via `Dice.prob_gt()` etc., and comparisons
+      answered from the cache of opposed rolls
+    - `dice.parse`, `dice.parse.seconds`: calls to `Dice.from_str()`
+    - `dice.transform`, `dice.transform.seconds`: distributions calculated for `Dice.map()`, `clamp()` etc., see
+      `ttrpg_dice.transform`
+    - `diskcache.hit`, `diskcache.miss`, `diskcache.evicted`: distributions loaded from, not found in, or removed from
+      the disk cache, see `ttrpg_dice.diskcache`
+    - `expression.nodes`, `expression.shared`: distinct sub-expressions in formulas passed to
+      `ttrpg_dice.expression.evaluate()`, and repeated sub-expressions which were not calculated again
+    - `precomputed.hit`: distributions loaded from those shipped with ttrpg-dice, see `ttrpg_dice.precomputed`
+    - `dice.validate`, `dice.validate.seconds`: validation of `Dice` contents
+    - `table.format`, `table.format.seconds`: rendering `PoolComparison`, `LazyRollTable` & `StatBlock` tables
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+enabled: bool = False
+"""Whether measurements are currently being recorded. Use `enable()` & `disable()` to change this."""
+
+_measurements: Counter = Counter()
+_hooks: list[Callable[[str, float], None]] = []
+_lock = Lock()
+
+
+def enable() -> None:
+    """Start recording measurements."""
+    global enabled  # noqa: PLW0603
+    enabled = True
+
+
+def disable() -> None:
+    """Stop recording measurements, existing measurements are kept until `reset()`."""
+    global enabled  # noqa: PLW0603
+    enabled = False
+
+
+def reset() -> None:
+    """Discard all measurements recorded so far."""
+    with _lock:
+        _measurements.clear()
+
+
+def stats() -> dict[str, float]:
+    """Snapshot of all measurements recorded so far."""
+    with _lock:
+        return dict(_measurements)
+
+
+def add_hook(hook: Callable[[str, float], None]) -> None:
+    """Call `hook(name, value)` for every measurement recorded, e.g. to forward it to an external metrics system."""
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[str, float], None]) -> None:
+    """Stop calling a hook previously added with `add_hook()`."""
+    _hooks.remove(hook)
+
+
+def record(name: str, value: float = 1) -> None:
+    """Add `value` to the measurement `name`. Callers should check `instrumentation.enabled` first."""
+    with _lock:
+        _measurements[name] += value
+    for hook in _hooks:
+        hook(name, value)
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """Decorator: count calls as `name` and their duration as `name.seconds`, while enabled."""
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not enabled:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name)
+                record(f"{name}.seconds", perf_counter() - start)
+
+        return wrapper
+
+    return decorator
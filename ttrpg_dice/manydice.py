@@ -2,22 +2,28 @@
 
 from __future__ import annotations
 
+import copyreg
+import json
+import struct
+import sys
+from array import array
+from collections import Counter
 from collections.abc import Mapping
+from functools import reduce
 from itertools import zip_longest
 from math import comb
 from typing import TYPE_CHECKING
 
-from matplotlib import pyplot as plt
-from tabulate2 import tabulate
+from . import instrumentation
+from .dice import Dice
+from .expression import DiceExpression
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Iterator
 
     from matplotlib.figure import Figure
     from mpl_toolkits.mplot3d.axes3d import Axes3D
 
-    from .dice import Dice
-
 
 def lazyroll(numdice: int, dicetype: int, target: int) -> list[int]:
     """
@@ -48,15 +54,30 @@ def lazyroll(numdice: int, dicetype: int, target: int) -> list[int]:
         msg = f"Good luck rolling {target} on a d{dicetype}!"
         raise ValueError(msg)
 
+    probs = _binomial(numdice, target / dicetype)
+    return [round(sum(probs[i:]) * dicetype) for i, _ in enumerate(probs)]
+
+
+def _binomial(numdice: int, p_success: float) -> list[float]:
+    """Probability of exactly 0, 1, ... `numdice` hits, when each die hits with `p_success`."""
+
     def _p(hits: int) -> float:
         """Calculates the probability of an exact number of hits."""
         misses = numdice - hits
-        p_successes = (target / dicetype) ** hits
-        p_fails = (1 - (target / dicetype)) ** (misses)
+        p_successes = p_success**hits
+        p_fails = (1 - p_success) ** (misses)
         return p_successes * p_fails * comb(numdice, hits)
 
-    probs = [_p(hits) for hits in range(numdice + 1)]
-    return [round(sum(probs[i:]) * dicetype) for i, _ in enumerate(probs)]
+    return [_p(hits) for hits in range(numdice + 1)]
+
+
+def _add_hits(left: list[float], right: list[float]) -> list[float]:
+    """Probability of each number of hits from two independent groups of dice."""
+    result = [0.0] * (len(left) + len(right) - 1)
+    for i, p in enumerate(left):
+        for j, q in enumerate(right):
+            result[i + j] += p * q
+    return result
 
 
 class LazyRollTable:
@@ -81,6 +102,7 @@ class LazyRollTable:
     def __repr__(self) -> str:  # noqa: D105
         return f"LazyRollTable for up to {self._maxdice}d{self._dicetype} targeting {self._target}: {self.rolls}"
 
+    @instrumentation.timed("table.format")
     def __str__(self) -> str:
         """Format as a nice table ignoring zero dice and zero hits."""
         tab = "\t"
@@ -96,11 +118,127 @@ class LazyRollTable:
         return newline.join([description, "", table_header, *table_lines[1:]])
 
 
+class SuccessPool:
+    """
+    Number of successes when rolling a pool of dice, where each die succeeds if it rolls at least its target.
+
+    The dice in a pool can be of different types, and different parts of the pool can have different targets. Index
+    a `SuccessPool` by number of successes to get the probability of exactly that many (`pool[2]`), or slice it to
+    get a list of probabilities (`sum(pool[2:])` for "at least two").
+
+    Examples:
+        Rolling 3d10 and 2d8, counting every 7 or higher as a success:
+        ```
+        >>> from ttrpg_dice import SuccessPool, d
+        >>> pool = SuccessPool((3 * d(10)) + (2 * d(8)), 7)
+        >>> str(pool)
+        '2d8 + 3d10 >= 7'
+        >>> round(sum(pool[3:]), 4)
+        0.217
+        ```
+
+        With different targets for different dice:
+        ```
+        >>> pool = SuccessPool.from_checks([(3 * d(10), 7), (2 * d(8), 5)])
+        >>> str(pool)
+        '3d10 >= 7, 2d8 >= 5'
+        ```
+    """
+
+    def __init__(self, dice: Dice, target: int) -> None:
+        """Count the dice in `dice` which roll `target` or higher."""
+        self.checks = ((dice, target),)
+        """Tuple of `(dice, target)`"""
+        self._validate()
+
+    @classmethod
+    def from_checks(cls, checks: Iterable[tuple[Dice, int]]) -> SuccessPool:
+        """Count successes across several groups of dice, each given as `(dice, target)`."""
+        pool = cls.__new__(cls)
+        pool.checks = tuple(checks)
+        pool._validate()  # noqa: SLF001
+        return pool
+
+    def _validate(self) -> None:
+        for dice, _ in self.checks:
+            if isinstance(dice, DiceExpression):
+                msg = f"Cannot count successes for '{type(dice).__name__}: {dice}', use the individual dice instead"
+                raise TypeError(msg)
+            if dice.contents[1]:
+                msg = f"Cannot count successes for a constant, remove `+ {dice.contents[1]}` from '{dice}'"
+                raise ValueError(msg)
+            if dice.contents[-1]:
+                msg = f"Cannot count successes for a constant, remove `- {dice.contents[-1]}` from '{dice}'"
+                raise ValueError(msg)
+            if any(faces < 0 for faces in dice.contents):
+                msg = f"Cannot count successes for subtracted dice in '{dice}'"
+                raise ValueError(msg)
+
+    @property
+    def _probabilities(self) -> list[float]:
+        """
+        Use SuccessPool[index] to get the probability(-ies) of a given (set of) number(s) of successes.
+
+        Identical dice with the same target are grouped as a binomial distribution, the groups are then combined one
+        at a time (a Poisson-binomial distribution), without enumerating the rolls of the individual dice.
+        """
+        try:
+            return self._probabilitycache  # pytype: disable=attribute-error
+        except AttributeError:
+            groups = Counter()
+            for dice, target in self.checks:
+                for faces, numdice in dice.contents.items():
+                    die = type(dice).from_contents({faces: 1})
+                    groups[sum(die[target:]) if target > 1 else 1.0] += numdice
+            binomials = (_binomial(numdice, p_success) for p_success, numdice in sorted(groups.items()))
+            self._probabilitycache = reduce(_add_hits, binomials, [1.0])
+            return self._probabilitycache
+
+    def __iter__(self) -> Iterator[float]:
+        """Iterating over a SuccessPool yields the probabilities starting with P(0 successes)."""
+        yield from self._probabilities
+
+    def __getitem__(self, index: int | slice) -> float | list[float]:
+        """Get the probability of a specific number of successes, or a list of probabilities for a slice."""
+        return self._probabilities[index]
+
+    def __len__(self) -> int:
+        """Number of possible results, including zero successes."""
+        return len(self._probabilities)
+
+    def __eq__(self, value: object) -> bool:
+        """SuccessPools are equal if they give the same probabilities."""
+        try:
+            return self._probabilities == value._probabilities  # pytype: disable=attribute-error
+        except AttributeError:
+            return False
+
+    def __hash__(self) -> int:
+        """Use checks for hashing - but NOT equality."""
+        return hash(self.checks)
+
+    def __str__(self) -> str:
+        """The dice and targets, e.g. `3d10 >= 7, 2d8 >= 5`."""
+        return ", ".join(f"{dice} >= {target}" for dice, target in self.checks)
+
+    def __repr__(self) -> str:  # noqa: D105
+        return f"{type(self).__name__}: {self}"
+
+
 class PoolComparison:
     """Comparison of related dicepools."""
 
-    def __init__(self, pools: dict[str, Dice] | Iterable[Dice], outcomes: dict[str, slice]) -> None:
-        """Create comparison based on dict of named pools and dict of named outcomes."""
+    def __init__(
+        self,
+        pools: dict[str, Dice | SuccessPool] | Iterable[Dice | SuccessPool],
+        outcomes: dict[str, slice],
+    ) -> None:
+        """
+        Create comparison based on dict of named pools and dict of named outcomes.
+
+        Pools can be `Dice`, for which outcomes slice the results rolled, or `SuccessPool`s, for which outcomes slice
+        the number of successes.
+        """
         if isinstance(pools, Mapping):
             self.pools = pools
         else:
@@ -113,14 +251,150 @@ class PoolComparison:
         }
         """Dict of chances indexed by (pool, outcome)"""
 
+    @classmethod
+    async def acreate(
+        cls,
+        pools: dict[str, Dice | SuccessPool] | Iterable[Dice | SuccessPool],
+        outcomes: dict[str, slice],
+    ) -> PoolComparison:
+        """
+        Create a `PoolComparison` without blocking the event loop.
+
+        Takes the same arguments as `PoolComparison()`. The pools' distributions are calculated in `Dice.executor`.
+        """
+        import asyncio  # noqa: PLC0415 - Deferred import: slow and only needed for async use
+
+        if not isinstance(pools, Mapping):
+            pools = {pool: pool for pool in pools}
+        loop = asyncio.get_running_loop()
+
+        def _calculate(pool: SuccessPool) -> None:
+            _ = pool._probabilities  # noqa: SLF001
+
+        await asyncio.gather(
+            *(
+                pool.aprobabilities()
+                if isinstance(pool, Dice)
+                else loop.run_in_executor(Dice.executor, _calculate, pool)
+                for pool in pools.values()
+            ),
+        )
+        return cls(pools, outcomes)
+
+    _BYTES_HEADER = struct.Struct("<4sBI")
+    """Magic bytes, format version, length of JSON description of pools & outcomes"""
+    _BYTES_LENGTH = struct.Struct("<I")
+    _BYTES_MAGIC = b"TTRC"
+    _BYTES_VERSION = 1
+
+    def to_bytes(self) -> bytes:
+        """
+        Compact binary representation, including the distributions of the pools and the calculated chances.
+
+        Use `PoolComparison.from_bytes()` to recreate the comparison without calculating anything again. This is
+        also used when pickling. Pools must be named with strings (or by themselves, if given as a list), and
+        outcomes named with strings.
+        """
+        description = {"outcomes": [], "pools": []}
+        for name, index in self.outcomes.items():
+            description["outcomes"].append([name, index.start, index.stop, index.step])
+        dice = []
+        for name, pool in self.pools.items():
+            if name is not pool and not isinstance(name, str):
+                msg = f"Cannot convert a PoolComparison with pools named by {type(name).__name__} to bytes"
+                raise TypeError(msg)
+            try:
+                checks = pool.checks
+            except AttributeError:
+                description["pools"].append({"name": None if name is pool else name, "targets": None})
+                dice.append(pool)
+            else:
+                targets = [target for _, target in checks]
+                description["pools"].append({"name": None if name is pool else name, "targets": targets})
+                dice.extend(die for die, _ in checks)
+
+        header = json.dumps(description).encode()
+        parts = [self._BYTES_HEADER.pack(self._BYTES_MAGIC, self._BYTES_VERSION, len(header)), header]
+        for die in dice:
+            packed = die.to_bytes()
+            parts.extend([self._BYTES_LENGTH.pack(len(packed)), packed])
+        chances = array("d", (self.chances[pool, outcome] for pool in self.pools for outcome in self.outcomes))
+        if sys.byteorder != "little":
+            chances.byteswap()
+        parts.append(chances.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> PoolComparison:
+        """Recreate a `PoolComparison` from the output of `PoolComparison.to_bytes()`."""
+        view = memoryview(data)
+        magic, version, headerlength = cls._BYTES_HEADER.unpack_from(view)
+        if magic != cls._BYTES_MAGIC or version != cls._BYTES_VERSION:
+            msg = f"Not a {cls.__name__} created by to_bytes() (version {cls._BYTES_VERSION})"
+            raise ValueError(msg)
+        offset = cls._BYTES_HEADER.size
+        description = json.loads(bytes(view[offset : offset + headerlength]))
+        offset += headerlength
+
+        def _next_dice() -> Dice:
+            nonlocal offset
+            (length,) = cls._BYTES_LENGTH.unpack_from(view, offset)
+            offset += cls._BYTES_LENGTH.size
+            dice = Dice.from_bytes(view[offset : offset + length])
+            offset += length
+            return dice
+
+        pools = {}
+        for pool in description["pools"]:
+            if pool["targets"] is None:
+                dice = _next_dice()
+            else:
+                dice = SuccessPool.from_checks([(_next_dice(), target) for target in pool["targets"]])
+            pools[dice if pool["name"] is None else pool["name"]] = dice
+        outcomes = {name: slice(start, stop, step) for name, start, stop, step in description["outcomes"]}
+
+        chances = array("d")
+        chances.frombytes(view[offset:])
+        if sys.byteorder != "little":
+            chances.byteswap()
+        comparison = cls.__new__(cls)
+        comparison.pools = pools
+        comparison.outcomes = outcomes
+        comparison.chances = dict(zip([(pool, outcome) for pool in pools for outcome in outcomes], chances))  # noqa: B905
+        return comparison
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickle via `to_bytes()`, carrying the pools' distributions compactly.
+
+        Comparisons including a `DiceExpression`, which cannot be converted to bytes, are pickled attribute by
+        attribute instead.
+        """
+        if any(isinstance(pool, DiceExpression) for pool in self.pools.values()):
+            return copyreg.__newobj__, (type(self),), vars(self)
+        return type(self).from_bytes, (self.to_bytes(),)
+
+    @instrumentation.timed("table.format")
     def __str__(self) -> str:
         """Nicely formatted table."""
+        from tabulate2 import tabulate  # noqa: PLC0415 - Deferred import: only needed for formatting
+
         data = [[pool] + [self.chances[pool, outcome] * 100 for outcome in self.outcomes] for pool in self.pools]
         headers = ["pool", *self.outcomes]
         return tabulate(data, headers=headers, tablefmt="plain", floatfmt=".2f")
 
     def plot(self) -> tuple[Figure, Axes3D]:
-        """Plot as a 3d Bar with matplotlib and return the Axes."""
+        """
+        Plot as a 3d Bar with matplotlib and return the Axes.
+
+        Requires the optional `plot` dependencies: `pip install ttrpg-dice[plot]`.
+        """
+        try:
+            from matplotlib import pyplot as plt  # noqa: PLC0415 - Deferred import: optional and slow
+        except ImportError as e:
+            msg = "Plotting requires matplotlib, install it with `pip install ttrpg-dice[plot]`"
+            raise ImportError(msg) from e
+
         fig, ax = plt.subplots(subplot_kw={"projection": "3d"})
         ax.bar3d(**self.plotable(), shade=True)
         ax.set_yticks([y + 0.5 for y, _ in enumerate(self.pools)], [str(pool) for pool in self.pools])
@@ -0,0 +1,121 @@
+"""
+Distributions of commonly used dice, calculated in advance and shipped with ttrpg-dice.
+
+`Dice` look here before calculating anything, so that e.g. `3 * d(6)` or `2 * d(20) + 5` are available straight
+away in a fresh process. Any constant is ignored when looking up a distribution, and simply added afterwards.
+
+The distributions are stored in `distributions.bin`, which is only read on first use. To recreate it after changing
+`COMMON_DICE` or the format, run `python -m ttrpg_dice.precomputed` (or `just precompute`). Use `disable()` to
+always calculate distributions instead, e.g. to measure how long calculating them takes.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from importlib import resources
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from . import diskcache, instrumentation
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+FORMAT_VERSION = 1
+"""Version of `distributions.bin`, a file with any other version is ignored."""
+
+FILENAME = "distributions.bin"
+
+COMMON_DICE: dict[int, range] = {
+    2: range(1, 11),
+    3: range(1, 11),
+    4: range(1, 11),
+    6: range(1, 11),
+    8: range(1, 11),
+    10: range(1, 11),
+    12: range(1, 11),
+    20: range(1, 11),
+    100: range(1, 6),
+}
+"""Faces: numbers of dice, for the distributions to store"""
+
+_HEADER = struct.Struct("<4sBI")
+"""Magic bytes, format version, length of JSON index"""
+_MAGIC = b"TTRP"
+
+_table: tuple[dict[str, list[int]], memoryview] | None = None
+"""Index of `key: [lowest result, width, start, number of counts]` and the packed counts, once loaded"""
+_loadlock = Lock()
+
+enabled: bool = True
+"""Whether `Dice` look up distributions here. Use `enable()` & `disable()` to change this."""
+
+
+def enable() -> None:
+    """Look up distributions here before calculating them (the default)."""
+    global enabled  # noqa: PLW0603
+    enabled = True
+
+
+def disable() -> None:
+    """Always calculate distributions, rather than looking them up here."""
+    global enabled  # noqa: PLW0603
+    enabled = False
+
+
+def load(contents: Mapping) -> tuple[int, list[int]] | None:
+    """`(lowest possible result, counts from there upwards)` for `contents`, or `None` if not precomputed."""
+    if not enabled:
+        return None
+    index, data = _table or _load()
+    constant = contents.get(1, 0) - contents.get(-1, 0)
+    dice = {faces: numdice for faces, numdice in contents.items() if faces not in {1, -1}}
+    try:
+        offset, width, start, length = index[diskcache._key(dice)]  # noqa: SLF001
+    except KeyError:
+        return None
+    if instrumentation.enabled:
+        instrumentation.record("precomputed.hit")
+    return offset + constant, diskcache.unpack_counts(width, data[start : start + width * length])
+
+
+def _load() -> tuple[dict[str, list[int]], memoryview]:
+    global _table  # noqa: PLW0603
+    with _loadlock:
+        if _table is None:
+            try:
+                data = memoryview(resources.files(__package__).joinpath(FILENAME).read_bytes())
+                magic, version, indexlength = _HEADER.unpack_from(data)
+            except (OSError, struct.error):
+                magic = version = None
+            if magic != _MAGIC or version != FORMAT_VERSION:
+                _table = ({}, memoryview(b""))
+            else:
+                index = json.loads(bytes(data[_HEADER.size : _HEADER.size + indexlength]))
+                _table = (index, data[_HEADER.size + indexlength :])
+    return _table
+
+
+def build() -> bytes:
+    """Calculate all of `COMMON_DICE` and pack them in the format of `distributions.bin`."""
+    from .dice import Dice  # noqa: PLC0415 - Dice uses this module
+
+    index = {}
+    packed = []
+    start = 0
+    for faces, numbers in COMMON_DICE.items():
+        for numdice in numbers:
+            dice = numdice * Dice(faces)
+            offset, counts = dice._core_counts()  # noqa: SLF001
+            width, data = diskcache.pack_counts(counts)
+            index[diskcache._key(dice.contents)] = [offset, width, start, len(counts)]  # noqa: SLF001
+            packed.append(data)
+            start += len(data)
+    header = json.dumps(index, separators=(",", ":")).encode()
+    return b"".join([_HEADER.pack(_MAGIC, FORMAT_VERSION, len(header)), header, *packed])
+
+
+if __name__ == "__main__":
+    Path(__file__).with_name(FILENAME).write_bytes(build())
@@ -2,15 +2,26 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterator, Mapping
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
+from functools import partial
+from itertools import repeat
+from operator import add, attrgetter, sub
+from pathlib import Path
+from random import Random
 from typing import TYPE_CHECKING
 
-from tabulate2 import tabulate
-
+from . import instrumentation
 from .dice import Dice
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
     from contextlib import suppress
+    from os import PathLike
 
     with suppress(ImportError):
         from typing import ClassVar, Self
@@ -19,7 +30,20 @@ if TYPE_CHECKING:
 class StatBlock(Mapping):
     """A TTRPG StatBlock, acts as a mapping of stats."""
 
+    __slots__ = ()  # Allow `@statblock(slots=True)`, other StatBlocks get a `__dict__` as normal
+
     _STATS: ClassVar[dict[str, Dice]]
+    _DEFAULTS: ClassVar[dict[str, int | Dice]]
+    _CAPS: ClassVar[tuple[int, ...]]
+    """Highest possible roll for each stat, in the order of `_STATS`, calculated once by the decorator."""
+    _GETSTATS: ClassVar[Callable[[StatBlock], tuple[int | Dice, ...]]]
+    """Get all stats from a StatBlock as a tuple, in the order of `_STATS`."""
+
+    def __init_subclass__(cls, **kwargs) -> None:  # noqa: ANN003
+        """Record the default stats for subclasses of a `@statblock`."""
+        super().__init_subclass__(**kwargs)
+        if hasattr(cls, "_STATS"):  # The decorator sets `_STATS` after creating the initial class
+            cls._DEFAULTS = {stat: vars(cls).get(stat, 0) for stat in cls._STATS}
 
     def __init__(self, *_args, **_kwargs) -> None:  # noqa: ANN002, ANN003
         """Raises TypeError - this method is replaced by `_init_` by the decorator."""
@@ -42,16 +66,39 @@ class StatBlock(Mapping):
             val = stats.pop(stat, vars(type(self)).get(stat, 0))
             setattr(self, stat, val)
         if stats:
-            remaining_stats = ", ".join(f"`{stat}`" for stat in stats)
-            msg = f"Invalid stat. {type(self).__name__} does not contain {remaining_stats}."
-            raise AttributeError(msg)
+            self._invalid_stats_(stats)
+
+    @classmethod
+    def _new_(cls, *stats: int | Dice) -> Self:
+        """
+        Trusted constructor: create a StatBlock from a complete set of valid stats, in the order of `_STATS`.
+
+        Skips keyword parsing and validation, unless `_pre_init_` is overridden, which is then called as normal.
+        """
+        if cls._pre_init_ is not StatBlock._pre_init_:
+            return cls(**dict(zip(cls._STATS, stats)))  # noqa: B905
+        block = cls.__new__(cls)
+        vars(block).update(zip(cls._STATS, stats))  # noqa: B905
+        return block
+
+    @classmethod
+    def _stats_(cls, block: Mapping[str, int | Dice]) -> tuple[int | Dice, ...]:
+        """All stats from `block` in the order of `_STATS`, `block` can be any type of Mapping."""
+        try:
+            return cls._GETSTATS(block)
+        except AttributeError:
+            return tuple(block[stat] for stat in cls._STATS)
+
+    def _invalid_stats_(self, stats: dict[str, int | Dice]) -> None:
+        """Raise AttributeError for `stats` which are not part of this StatBlock."""
+        remaining_stats = ", ".join(f"`{stat}`" for stat in stats)
+        msg = f"Invalid stat. {type(self).__name__} does not contain {remaining_stats}."
+        raise AttributeError(msg)
 
     def __add__(self, other: Self) -> Self:
         """Adds each stat, raises AttributeError if stat missing in `other`."""
-        newstats = {
-            stat: min(self[stat] + other[stat], len(self._STATS[stat])) for stat in self._STATS
-        }
-        return type(self)(**newstats)
+        added = map(add, self._GETSTATS(self), self._stats_(other))
+        return self._new_(*map(min, added, self._CAPS))
     
     def __sub__(self, other: Self) -> Self:
         """
@@ -59,15 +106,57 @@ class StatBlock(Mapping):
         
         For example, if you want to take an NPC and remove a specific career.
         """
-        newstats = {
-            stat: max(self[stat] - other[stat], 0) for stat in self._STATS
-        }
-        return type(self)(**newstats)
+        subtracted = map(sub, self._GETSTATS(self), self._stats_(other))
+        return self._new_(*map(max, subtracted, repeat(0)))
 
     def __or__(self, other: Self) -> Self:
         """Merge stats, keeping the highest."""
-        newstats = {stat: max(self[stat], other[stat]) for stat in self._STATS}
-        return type(self)(**newstats)
+        return self._new_(*map(max, self._GETSTATS(self), self._stats_(other)))
+
+    @classmethod
+    def generate(
+        cls,
+        n: int,
+        rng: Random | int | None = None,
+        *,
+        as_array: bool = False,
+    ) -> list[Self] | StatBlockArray:
+        """
+        Generate `n` random StatBlocks, rolling each stat on its `Dice`.
+
+        Arguments:
+            n: the number of StatBlocks to generate
+            rng: a `random.Random` to use, or a seed for a new one (default: a new, randomly seeded, `Random`)
+            as_array: return a `StatBlockArray` rather than a list of StatBlocks, much faster for large `n`
+
+        Example:
+            ```
+            >>> from ttrpg_dice import d, statblock
+            >>> @statblock
+            ... class Goblin:
+            ...     WS = d(100)
+            ...     W = 2 * d(4)
+            >>> goblins = Goblin.generate(3, rng=42)
+            >>> len(goblins)
+            3
+            >>> all(2 <= goblin.W <= 8 for goblin in goblins)
+            True
+            ```
+        """
+        rng = rng if isinstance(rng, Random) else Random(rng)  # noqa: S311
+        columns = {stat: cls._roll_(dice, n, rng) for stat, dice in cls._STATS.items()}
+        if as_array:
+            return StatBlockArray(cls, **columns)
+        return list(map(cls._new_, *columns.values()))
+
+    @staticmethod
+    def _roll_(dice: Dice, n: int, rng: Random) -> list[int]:
+        """Roll `dice` `n` times, all at once."""
+        cumulative = dice._cumulative  # noqa: SLF001
+        results = range(dice._offset, dice._offset + len(cumulative))  # noqa: SLF001
+        if not dice.weighted:
+            return rng.choices(results, k=n)
+        return rng.choices(results, cum_weights=cumulative, k=n)
 
     def __getitem__(self, stat: str) -> int | Dice:
         """Get a specific stat by subscripting."""
@@ -100,23 +189,353 @@ class StatBlock(Mapping):
             + ")"
         )
     
+    @instrumentation.timed("table.format")
     def as_table(self) -> str:
         """Render the StatBlock as a github markdown table."""
+        from tabulate2 import tabulate  # noqa: PLC0415 - Deferred import: only needed for formatting
+
         return tabulate([[*self.values()]], headers=self.keys(), tablefmt="github")
 
     def _repr_markdown_(self) -> str:
         """For IPython notebooks - L3 header and stat table."""
         return f"### {self}\n{self.as_table()}"
 
-def statblock(cls: type) -> StatBlock:
-    """Create a StatBlock with the given fields."""
+def statblock(cls: type | None = None, /, *, slots: bool = False) -> type[StatBlock] | Callable[[type], StatBlock]:
+    """
+    Create a StatBlock with the given fields.
+
+    Use `@statblock(slots=True)` for large numbers of StatBlocks: stats are stored in `__slots__` rather than an
+    instance `__dict__`, and `__init__`, subscripting, iteration and arithmetic are written out specifically for the
+    given stats. Any other instance attributes (e.g. set in `_pre_init_`) must then be declared in `__slots__` on the
+    decorated class. Subclasses which set default stats will have an instance `__dict__` again.
+    """
+    if cls is None:
+        return partial(statblock, slots=slots)
     stats = {statname: roll for statname, roll in vars(cls).items() if isinstance(roll, Dice)}
-    _interimclass: type = type(
-        cls.__name__,
-        (StatBlock,),
-        {attr: 0 if attr in stats else val for attr, val in vars(cls).items() if attr != "__dict__"},
-    )
+    namespace = {attr: 0 if attr in stats else val for attr, val in vars(cls).items() if attr != "__dict__"}
+    if slots:
+        extra_slots = vars(cls).get("__slots__", ())
+        extra_slots = (extra_slots,) if isinstance(extra_slots, str) else tuple(extra_slots)
+        excluded = {*stats, *extra_slots, "__weakref__"}
+        namespace = {attr: val for attr, val in namespace.items() if attr not in excluded}
+        namespace["__slots__"] = (*stats, *extra_slots)
+    _interimclass: type = type(cls.__name__, (StatBlock,), namespace)
     _interimclass.__annotations__ = dict.fromkeys(stats, int | Dice)
     _interimclass._STATS = stats  # noqa: SLF001
+    _interimclass._DEFAULTS = dict.fromkeys(stats, 0)  # noqa: SLF001
+    _interimclass._CAPS = tuple(_cap(stat, roll) for stat, roll in stats.items())  # noqa: SLF001
+    _interimclass._GETSTATS = staticmethod(_statgetter(*stats))  # noqa: SLF001
     _interimclass.__init__ = StatBlock._init_
+    if slots:
+        _specialise(_interimclass)
     return _interimclass
+
+
+def _cap(stat: str, roll: Dice) -> int:
+    """Highest possible roll for `stat`, raising ValueError if `roll` can roll `0` or less."""
+    highest = len(roll)
+    if roll._lowest < 1:  # noqa: SLF001
+        msg = f"Cannot use '{roll}' for `{stat}`, stats must be rolled with Dice which cannot roll 0 or less."
+        raise ValueError(msg)
+    return highest
+
+
+def _statgetter(*stats: str) -> Callable[[StatBlock], tuple[int | Dice, ...]]:
+    """Like `operator.attrgetter` but always returns a tuple, even for one or zero stats."""
+    if len(stats) > 1:
+        return attrgetter(*stats)
+    if stats:
+        getter = attrgetter(*stats)
+        return lambda block: (getter(block),)
+    return lambda _: ()
+
+
+def _specialise(cls: type[StatBlock]) -> None:
+    """Replace the generic StatBlock methods with ones written out for the specific stats of `cls`."""
+    stats = list(cls._STATS)
+    caps = dict(zip(stats, cls._CAPS))  # noqa: B905
+
+    def _args(expression: str) -> str:
+        return ", ".join(expression.format(stat=stat, cap=caps[stat]) for stat in stats)
+
+    init_stats = "\n".join(f"    self.{stat} = stats.pop({stat!r}, defaults[{stat!r}])" for stat in stats)
+    new_stats = "\n".join(f"    block.{stat} = {stat}" for stat in stats)
+    source = f"""
+def __init__(self, /, **stats):
+    stats = self._pre_init_(**stats)
+    defaults = type(self)._DEFAULTS
+{init_stats}
+    if stats:
+        self._invalid_stats_(stats)
+
+def __getitem__(self, stat):
+    if stat in _STATSET:
+        return getattr(self, stat)
+    msg = f"Unknown stat '{{stat}}'"
+    raise KeyError(msg)
+
+def __iter__(self):
+    return iter(_STATNAMES)
+
+def __len__(self):
+    return {len(stats)}
+
+def _new_(cls, {_args("{stat}")}):
+    if cls._pre_init_ is not _StatBlock._pre_init_:
+        return cls({_args("{stat}={stat}")})
+    block = _object_new(cls)
+{new_stats}
+    return block
+
+def __add__(self, other):
+    [{_args("other_{stat}")}] = self._stats_(other)
+    return type(self)._new_({_args("min(self.{stat} + other_{stat}, {cap})")})
+
+def __sub__(self, other):
+    [{_args("other_{stat}")}] = self._stats_(other)
+    return type(self)._new_({_args("max(self.{stat} - other_{stat}, 0)")})
+
+def __or__(self, other):
+    [{_args("other_{stat}")}] = self._stats_(other)
+    return type(self)._new_({_args("max(self.{stat}, other_{stat})")})
+"""
+    namespace = {
+        "_STATSET": frozenset(stats),
+        "_STATNAMES": tuple(stats),
+        "_StatBlock": StatBlock,
+        "_object_new": object.__new__,
+    }
+    exec(source, namespace)  # noqa: S102
+    for name in ["__init__", "_new_", "__getitem__", "__iter__", "__len__", "__add__", "__sub__", "__or__"]:
+        method = namespace[name]
+        method.__qualname__ = f"{cls.__qualname__}.{name}"
+        method.__doc__ = getattr(StatBlock, "_init_" if name == "__init__" else name).__doc__
+        setattr(cls, name, classmethod(method) if name == "_new_" else method)
+
+
+
+class StatBlockArray(Sequence):
+    """
+    A population of StatBlocks of the same type, stored as one typed integer array per stat.
+
+    Index with an `int` to get a single StatBlock, a `slice` to get a smaller StatBlockArray, or the name of a stat
+    to get the whole column. `+`, `-` and `|` work across the whole population at once, following the same rules as
+    for a single StatBlock. The other side can be another StatBlockArray of the same length, or a single StatBlock
+    which is applied to every member of the population (e.g. to add a career to a whole band of NPCs).
+
+    Example:
+        ```
+        >>> from ttrpg_dice import StatBlockArray, d, statblock
+        >>> @statblock
+        ... class Combat:
+        ...     WS = d(100)
+        ...     BS = d(100)
+        >>> goblins = StatBlockArray.from_blocks([Combat(WS=25, BS=30), Combat(WS=30, BS=25)])
+        >>> archers = goblins + Combat(BS=10)
+        >>> list(archers["BS"])
+        [40, 35]
+        >>> archers[0]["BS"]
+        40
+        ```
+    """
+
+    TYPECODE = "i"
+    """`array` typecode used to store each stat."""
+
+    def __init__(self, blocktype: type[StatBlock], /, **columns: Iterable[int]) -> None:
+        """
+        Create a population of `blocktype` from columns of stats.
+
+        Stats which are not given use the default for `blocktype` (usually `0`).
+        """
+        self.blocktype = blocktype
+        self.columns = {stat: array(self.TYPECODE, columns.pop(stat, ())) for stat in blocktype._STATS}  # noqa: SLF001
+        """Dict of stat name: array of values"""
+        if columns:
+            remaining_stats = ", ".join(f"`{stat}`" for stat in columns)
+            msg = f"Invalid stat. {blocktype.__name__} does not contain {remaining_stats}."
+            raise AttributeError(msg)
+        length = max(len(column) for column in self.columns.values())
+        for stat, column in self.columns.items():
+            if not column:
+                column.extend(repeat(blocktype._DEFAULTS[stat], length))  # noqa: SLF001
+            elif len(column) != length:
+                msg = f"All stats must have the same number of values, `{stat}` has {len(column)} not {length}."
+                raise ValueError(msg)
+        self._length = length
+
+    @classmethod
+    def from_blocks(cls, blocks: Iterable[StatBlock]) -> Self:
+        """Create a population from individual StatBlocks, which must all be of the same type."""
+        blocks = list(blocks)
+        blocktype = type(blocks[0])
+        if any(type(block) is not blocktype for block in blocks):
+            invalid = ", ".join(sorted({type(block).__name__ for block in blocks if type(block) is not blocktype}))
+            msg = f"All StatBlocks must be {blocktype.__name__}, not {invalid}."
+            raise TypeError(msg)
+        return cls(blocktype, **{stat: [block[stat] for block in blocks] for stat in blocktype._STATS})  # noqa: SLF001
+
+    @classmethod
+    def _from_columns(cls, blocktype: type[StatBlock], columns: dict[str, array | memoryview], length: int) -> Self:
+        """Trusted constructor: use `columns` as-is, without copying or validating them."""
+        population = cls.__new__(cls)
+        population.blocktype = blocktype
+        population.columns = columns
+        population._length = length  # noqa: SLF001
+        return population
+
+    _MAGIC = b"TTRPGSBA"
+    _FORMAT_VERSION = 1
+    _PREFIX = struct.Struct("<8sII")
+    """Magic bytes, format version, header length"""
+    _ALIGNMENT = 8
+
+    def to_file(self, path: str | PathLike) -> None:
+        """
+        Save the population in a compact binary format which can be loaded quickly with `StatBlockArray.from_file()`.
+
+        The file contains a short JSON header with the StatBlock type and its stats, followed by each stat as a
+        packed column of integers.
+        """
+        header = {
+            "statblock": self.blocktype.__name__,
+            "stats": {stat: str(dice) for stat, dice in self.blocktype._STATS.items()},  # noqa: SLF001
+            "length": len(self),
+            "typecode": self.TYPECODE,
+            "itemsize": array(self.TYPECODE).itemsize,
+            "byteorder": sys.byteorder,
+        }
+        headerbytes = json.dumps(header).encode()
+        with Path(path).open("wb") as file:
+            file.write(self._PREFIX.pack(self._MAGIC, self._FORMAT_VERSION, len(headerbytes)))
+            file.write(headerbytes)
+            for column in self.columns.values():
+                file.write(bytes(-file.tell() % self._ALIGNMENT))
+                file.write(array(self.TYPECODE, column))
+
+    @classmethod
+    def from_file(cls, path: str | PathLike, blocktype: type[StatBlock] | None = None) -> Self:
+        """
+        Load a population saved with `to_file()`.
+
+        The file is memory-mapped and the columns read directly from it, without copying, so loading takes the same
+        time regardless of the size of the population, and StatBlocks are only created when accessed.
+
+        If `blocktype` is given, it must have the same stats, with the same Dice, as those in the file. Otherwise a
+        new StatBlock type is created from the file.
+        """
+        with Path(path).open("rb") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(data)
+        magic, version, headerlength = cls._PREFIX.unpack_from(view)
+        if magic != cls._MAGIC or version != cls._FORMAT_VERSION:
+            msg = f"{path} is not a StatBlockArray file (version {cls._FORMAT_VERSION})"
+            raise ValueError(msg)
+        offset = cls._PREFIX.size
+        header = json.loads(bytes(view[offset : offset + headerlength]))
+        offset += headerlength
+
+        if blocktype is None:
+            stats = {stat: Dice.from_str(dice) for stat, dice in header["stats"].items()}
+            blocktype = statblock(type(header["statblock"], (), stats))
+        elif {stat: str(dice) for stat, dice in blocktype._STATS.items()} != header["stats"]:  # noqa: SLF001
+            msg = f"{path} contains {header['statblock']} with stats {header['stats']}, not {blocktype.__name__}"
+            raise TypeError(msg)
+
+        length = header["length"]
+        itemsize = header["itemsize"]
+        swap = header["byteorder"] != sys.byteorder
+        columns = {}
+        for stat in header["stats"]:
+            offset += -offset % cls._ALIGNMENT
+            column = view[offset : offset + length * itemsize].cast(header["typecode"])
+            if swap:  # Cannot use the mapped data directly
+                column = array(header["typecode"], column)
+                column.byteswap()
+            columns[stat] = column
+            offset += length * itemsize
+        return cls._from_columns(blocktype, columns, length)
+
+    def __len__(self) -> int:
+        """Number of StatBlocks."""
+        return self._length
+
+    def __getitem__(self, index: int | slice | str) -> StatBlock | Self | array:
+        """A single StatBlock, a smaller StatBlockArray or a single stat for all StatBlocks."""
+        if isinstance(index, str):
+            try:
+                return self.columns[index]
+            except KeyError:
+                msg = f"Unknown stat '{index}'"
+                raise KeyError(msg) from None
+        if isinstance(index, slice):
+            columns = {stat: column[index] for stat, column in self.columns.items()}
+            return self._from_columns(self.blocktype, columns, len(range(self._length)[index]))
+        return self.blocktype._new_(*(column[index] for column in self.columns.values()))
+
+    def _apply(self, other: Self | StatBlock, operation: Callable[[int, int], int], limits: Callable) -> Self:
+        """Apply `operation` then `limits` (stat, values) stat-by-stat to every member of the population."""
+        if isinstance(other, StatBlockArray):
+            if len(other) != len(self):
+                msg = f"Cannot combine populations of {len(self)} and {len(other)} StatBlocks."
+                raise ValueError(msg)
+            others = other.columns
+        else:
+            others = {stat: repeat(other[stat], len(self)) for stat in self.columns}
+        return type(self)(
+            self.blocktype,
+            **{stat: limits(stat, map(operation, column, others[stat])) for stat, column in self.columns.items()},
+        )
+
+    def __add__(self, other: Self | StatBlock) -> Self:
+        """Adds each stat, capped at the maximum roll for that stat, as for `StatBlock`."""
+        caps = dict(zip(self.blocktype._STATS, self.blocktype._CAPS))  # noqa: B905
+        return self._apply(other, add, lambda stat, values: map(min, values, repeat(caps[stat])))
+
+    def __sub__(self, other: Self | StatBlock) -> Self:
+        """Subtracts each stat, to a minimum of `0`, as for `StatBlock`."""
+        return self._apply(other, sub, lambda _, values: map(max, values, repeat(0)))
+
+    def __or__(self, other: Self | StatBlock) -> Self:
+        """Merge stats, keeping the highest, as for `StatBlock`."""
+        return self._apply(other, max, lambda _, values: values)
+
+    def success_matrix(self) -> dict[str, array]:
+        """
+        Chance of success for every stat of every member of the population, as one column of floats per stat.
+
+        Each stat is the target to roll equal or under on that stat's `Dice`, as shown in `repr(StatBlock)`, e.g.
+        `WS: d100 = 45` succeeds 45% of the time.
+
+        Example:
+            ```
+            >>> from ttrpg_dice import StatBlockArray, d, statblock
+            >>> @statblock
+            ... class Combat:
+            ...     WS = d(100)
+            ...     W = 2 * d(4)
+            >>> population = StatBlockArray(Combat, WS=[45, 20], W=[2, 5])
+            >>> chances = population.success_matrix()
+            >>> list(chances["WS"])
+            [0.45, 0.2]
+            >>> list(chances["W"])
+            [0.0625, 0.625]
+            ```
+        """
+        chances = {}
+        blocktype = self.blocktype
+        for (stat, column), dice, cap in zip(self.columns.items(), blocktype._STATS.values(), blocktype._CAPS):  # noqa: B905, SLF001
+            targets = map(min, map(max, column, repeat(0)), repeat(cap))
+            chances[stat] = array("d", map(dice._at_most, targets))  # noqa: SLF001
+        return chances
+
+    def __eq__(self, other: object) -> bool:
+        """Equal to another population of the same type with the same stats."""
+        if not isinstance(other, StatBlockArray):
+            return NotImplemented
+        return self.blocktype is other.blocktype and self.columns == other.columns
+
+    __hash__ = None
+
+    def __repr__(self) -> str:  # noqa: D105
+        return f"{type(self).__name__} of {len(self)} {self.blocktype.__name__}"
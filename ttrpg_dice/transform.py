@@ -0,0 +1,188 @@
+"""
+Lazy transformations of `Dice`: `map()`, `clamp()`, `given()` & `threshold()`.
+
+Each transformation returns a `TransformedDice`, which records the original `Dice` and the steps to apply, without
+calculating anything. Further transformations add steps to the same record, so that a chain such as
+`(2 * d(6) + 3).clamp(1, 12).map(damage)` is calculated in a single pass over the results of `2 * d(6) + 3`, applying
+every step to each result in turn, rather than creating an intermediate distribution for each step.
+
+A `TransformedDice` can be indexed, sliced, iterated, compared with `prob_gt()` etc. and used in a `PoolComparison`
+in the same way as a `Dice`. Arithmetic with other dice gives a `CombinedDice`, see `ttrpg_dice.expression`.
+
+Example:
+    ```
+    >>> from ttrpg_dice import d
+    >>> damage = {1: 0, 2: 0, 3: 1, 4: 1, 5: 2, 6: 2}
+    >>> wounds = (d(6) + 2).clamp(highest=6).map(damage)
+    >>> str(wounds)
+    '(d6 + 2).clamp(None, 6).map({1: 0, 2: 0, 3: 1, 4: 1, 5: 2, 6: 2})'
+    >>> wounds[:]
+    [0.3333333333333333, 0.6666666666666666]
+    ```
+"""
+
+from __future__ import annotations
+
+import operator
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING
+
+from . import instrumentation
+from .expression import DiceExpression
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+    from .dice import Dice
+
+Step = tuple[str, object]
+"""`(kind, argument)`, with any table argument stored as a tuple of `(key, value)` so that steps can be hashed"""
+
+
+class TransformedDice(DiceExpression):
+    """
+    A `Dice` with a chain of transformations applied to its results, calculated lazily.
+
+    Create these via `Dice.map()`, `Dice.clamp()`, `Dice.given()` or `Dice.threshold()` rather than directly.
+
+    Attributes:
+        base (Dice): The original `Dice`.
+        steps (tuple[Step, ...]): The transformations, in the order they are applied.
+    """
+
+    def __init__(self, base: Dice, steps: tuple[Step, ...]) -> None:
+        """Apply `steps` to the results of `base`."""
+        self.base = base
+        self.steps = tuple(_normalise(step) for step in steps)
+
+    def _transformed(self, step: Step) -> TransformedDice:
+        """Add `step` to the end of this chain, rather than transforming the result of this chain."""
+        return type(self)(self.base, (*self.steps, step))
+
+    @property
+    def _key(self) -> Hashable:
+        """Identifies the distribution in caches shared between `Dice`: the original `Dice` and all steps."""
+        return (type(self).__name__, self.base._key, self.steps)  # noqa: SLF001
+
+    def _children(self) -> tuple[Dice, ...]:
+        """`Dice` whose distributions this distribution is calculated from."""
+        return (self.base,)
+
+    @instrumentation.timed("dice.transform")
+    def _core_counts(self) -> tuple[int, list[int]]:
+        """
+        `(lowest possible result, number of ways to roll each result from there upwards)`.
+
+        All steps are applied to each possible result of the original `Dice` in turn, in one pass.
+
+        Example:
+            ```
+            >>> from ttrpg_dice import d
+            >>> (2 * d(3)).clamp(3, 5)._core_counts()
+            (3, [3, 3, 3])
+            ```
+        """
+        base = self.base
+        _ = base._core  # noqa: SLF001 # Ensure base._countcache exists
+        transform = _fuse(self.steps)
+        ways_to_roll = Counter()
+        for result, count in enumerate(base._countcache, base._offset):  # noqa: SLF001
+            if count:
+                transformed = transform(result)
+                if transformed is not None:
+                    ways_to_roll[transformed] += count
+        if not ways_to_roll:
+            msg = f"No possible result of {base} remains after {self}"
+            raise ValueError(msg)
+        lowest, highest = min(ways_to_roll), max(ways_to_roll)
+        return lowest, [ways_to_roll[result] for result in range(lowest, highest + 1)]
+
+    def __str__(self) -> str:
+        """The original `Dice` followed by each step, e.g. `(2d6 + 3).clamp(1, 12)`."""
+        return f"({self.base})" + "".join(_describe(step) for step in self.steps)
+
+    def __reduce__(self) -> tuple:
+        """Pickle the original `Dice` and steps, which requires any functions to be picklable."""
+        return type(self), (self.base, self.steps)
+
+
+def _normalise(step: Step) -> Step:
+    """Validate `step` and store any table as a tuple of items, so that it can be hashed."""
+    kind, argument = step
+    if kind in {"map", "threshold"} and isinstance(argument, Mapping):
+        kind, argument = "lookup" if kind == "map" else kind, tuple(sorted(argument.items()))
+    if kind in {"map", "given"} and not callable(argument):
+        expected = "a function or a mapping" if kind == "map" else "a function"
+        msg = f"{kind}() requires {expected}, not '{type(argument).__name__}'"
+        raise TypeError(msg)
+    if kind == "clamp":
+        lowest, highest = argument
+        if lowest is not None and highest is not None and lowest > highest:
+            msg = f"Cannot clamp between {lowest} and {highest}, lowest must not be higher than highest"
+            raise ValueError(msg)
+    if kind == "threshold" and not argument:
+        msg = "Threshold table must contain at least one threshold"
+        raise ValueError(msg)
+    if kind not in {"map", "lookup", "clamp", "given", "threshold"}:
+        msg = f"Unknown transformation: {kind}"
+        raise ValueError(msg)
+    return (kind, argument)
+
+
+def _fuse(steps: tuple[Step, ...]) -> Callable[[int], int | None]:
+    """A single function applying every step to a result, returning `None` if a `given()` step excludes it."""
+    functions = [_function(step) for step in steps]
+
+    def transform(result: int) -> int | None:
+        for function in functions:
+            result = function(result)
+            if result is None:
+                return None
+        return result
+
+    return transform
+
+
+def _function(step: Step) -> Callable[[int], int | None]:
+    """The function applying one step to a result."""
+    kind, argument = step
+    if kind == "map":
+        return lambda result: operator.index(argument(result))
+    if kind == "lookup":
+        table = dict(argument)
+
+        def lookup(result: int) -> int:
+            try:
+                return operator.index(table[result])
+            except KeyError as e:
+                msg = f"Cannot map {result}: not in table"
+                raise ValueError(msg) from e
+
+        return lookup
+    if kind == "clamp":
+        lowest, highest = argument
+        lowest = -float("inf") if lowest is None else lowest
+        highest = float("inf") if highest is None else highest
+        return lambda result: min(max(result, lowest), highest)
+    if kind == "given":
+        return lambda result: result if argument(result) else None
+    if kind == "threshold":
+        thresholds = [threshold for threshold, _ in argument]
+        values = [0] + [value for _, value in argument]
+        return lambda result: values[bisect_right(thresholds, result)]
+    msg = f"Unknown transformation: {kind}"  # Prevented by _normalise()
+    raise ValueError(msg)
+
+
+def _describe(step: Step) -> str:
+    """Step as the method call which created it, e.g. `.clamp(1, 12)`."""
+    kind, argument = step
+    if kind == "lookup":
+        return f".map({dict(argument)})"
+    if kind == "threshold":
+        return f".threshold({dict(argument)})"
+    if kind == "clamp":
+        return f".clamp({argument[0]}, {argument[1]})"
+    return f".{kind}({getattr(argument, '__name__', argument)})"